@@ -3,12 +3,18 @@ Modul, welches die Funktionen bereitstellt, welche für API-Requests benötigt w
 """
 import json
 import logging
+import numbers
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 import xmltodict
+from requests.utils import guess_json_utf
 
+from visuanalytics.analytics.apis.util import session_pool, response_cache, single_flight, json_projection, \
+    xml_projection
 from visuanalytics.analytics.control.procedures.step_data import StepData
 from visuanalytics.analytics.util.step_errors import APIError, raise_step_error, APiRequestError, TestDataError
+from visuanalytics.analytics.util.step_pattern import compile_projection
 from visuanalytics.analytics.util.type_utils import get_type_func, register_type_func
 from visuanalytics.util import resources
 
@@ -17,10 +23,44 @@ logger = logging.getLogger(__name__)
 API_TYPES = {}
 """Ein Dictionary bestehend aus allen API-Typ-Methoden.  """
 
+MAX_PARALLEL = 4
+"""Standardwert für die Anzahl der Requests, die `request_multiple` und `request_multiple_custom` gleichzeitig senden."""
+
+COALESCED_METHODS = ("GET", "HEAD")
+"""HTTP-Methoden, bei denen gleichzeitige gleiche Requests zusammengefasst werden (siehe `coalesce` in der
+Konfigurationsdatei). Andere Methoden (z.B. `POST`) können Seiteneffekte haben und werden immer gesendet."""
+
 
 @raise_step_error(APIError)
 def api(values: dict, data: StepData):
-    api_request(values["api"], data, values["name"], "_req")
+    api_values = values["api"]
+
+    if api_values.get("projection", None) is True:
+        api_values = {**api_values, "projection": _select_projection(values, "_req")}
+
+    api_request(api_values, data, values["name"], "_req")
+
+
+def _select_projection(values: dict, save_key: str):
+    # Keys below save_key that are kept by the first transform (if it is a select), the rest is removed by it anyway
+    transformations = values.get("transform", [])
+
+    if values["api"].get("type", None) != "request" or not transformations or \
+            transformations[0].get("type", None) != "select":
+        return None
+
+    keys = []
+    for key in transformations[0]["relevant_keys"]:
+        if not isinstance(key, str):
+            continue
+
+        if key.startswith(f"{save_key}|"):
+            keys.append(key[len(save_key) + 1:])
+        elif key == save_key or key.startswith("*") or key.startswith("{"):
+            # The whole response is needed
+            return None
+
+    return keys
 
 
 @raise_step_error(APIError)
@@ -67,7 +107,7 @@ def input(values: dict, data: StepData, name: str, save_key, ignore_testing=Fals
     :param save_key: Key, unter dem die Daten gespeichert werden.
     :param ignore_testing: Ob der Request durchgeführt werden soll, obwohl testing `true` ist.
     """
-    res = data.deep_format(values["data"], values=values)
+    res = data.deep_format(values["data"], values=values, copy_constants=True)
     data.insert_data(save_key, res, values)
 
 
@@ -109,14 +149,17 @@ def request_multiple(values: dict, data: StepData, name: str, save_key, ignore_t
     if data.get_config("testing", False) and not ignore_testing:
         return _load_test_data(values, data, name, save_key)
 
+    queries = []
     if data.get_data(values.get("use_loop_as_key", False), values, bool):
         data.insert_data(save_key, {}, values)
         for _, key in data.loop_array(values["steps_value"], values):
-            fetch(values, data, f"{save_key}|{key}")
+            queries.append((f"{save_key}|{key}", _create_query(values, data)))
     else:
         data.insert_data(save_key, [None] * len(values["steps_value"]), values)
         for idx, _ in data.loop_array(values["steps_value"], values):
-            fetch(values, data, f"{save_key}|{idx}", )
+            queries.append((f"{save_key}|{idx}", _create_query(values, data)))
+
+    _fetch_all(values, data, queries)
 
 
 @register_api
@@ -135,14 +178,38 @@ def request_multiple_custom(values: dict, data: StepData, name: str, save_key, i
 
     if values.get("use_loop_as_key", False):
         data.insert_data(save_key, {}, values)
-
-        for idx, key in enumerate(values["steps_value"]):
-            api_request(values["requests"][idx], data, name, f"{save_key}|{key}", ignore_testing)
+        save_keys = [f"{save_key}|{key}" for key in values["steps_value"]]
     else:
         data.insert_data(save_key, [None] * len(values["requests"]), values)
+        save_keys = [f"{save_key}|{idx}" for idx in range(len(values["requests"]))]
+
+    queries = []
+    for idx, key in enumerate(save_keys):
+        value = values["requests"][idx]
+
+        # Requests that use the results of earlier requests have to wait for them
+        if queries and _uses_key(value, save_key):
+            _fetch_all(values, data, queries)
+            queries = []
+
+        # Only plain requests are sent in parallel, all other types are executed in order
+        if value.get("type", None) == "request":
+            queries.append((key, _create_query(value, data)))
+        else:
+            api_request(value, data, name, key, ignore_testing)
+
+    _fetch_all(values, data, queries)
 
-        for idx, value in enumerate(values["requests"]):
-            api_request(value, data, name, f"{save_key}|{idx}", ignore_testing)
+
+def _uses_key(config, key: str):
+    if isinstance(config, str):
+        return key in config
+    if isinstance(config, dict):
+        return any(_uses_key(value, key) for value in config.values())
+    if isinstance(config, list):
+        return any(_uses_key(value, key) for value in config)
+
+    return False
 
 
 def _load_test_data(values: dict, data: StepData, name, save_key):
@@ -157,36 +224,92 @@ def _load_test_data(values: dict, data: StepData, name, save_key):
 def fetch(values: dict, data: StepData, save_key):
     """Abfrage einer API und Umwandlung der API-Antwort in ein angegebenes Format.
 
-    :param req_data: Dictionary, das alle Informationen für den request enthält.
-    :return: Antwort der API im angegebenen Format
+    :param values: Werte aus der JSON-Datei
+    :param data: Daten aus der API
+    :param save_key: Key, unter dem die Daten gespeichert werden.
     """
     # Build http request
     req_data = _create_query(values, data)
 
-    req = requests.Request(req_data["method"], req_data["url"], headers=req_data["headers"],
-                           json=req_data.get("json", None),
-                           data=req_data.get("other", None), params=req_data["params"])
-    # Make the http request
-    s = requests.session()
-    response = s.send(req.prepare())
+    data.insert_data(save_key, _send(req_data), values)
+
+
+def _fetch_all(values: dict, data: StepData, queries: list):
+    # Requests are only sent in parallel, the data is inserted in order by the calling thread
+    max_parallel = data.get_data(values.get("max_parallel", MAX_PARALLEL), values, int)
+
+    if max_parallel <= 1 or len(queries) <= 1:
+        results = [_send(req_data) for _, req_data in queries]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(queries))) as executor:
+            futures = [executor.submit(_send, req_data) for _, req_data in queries]
+
+        # Raises the error of the first failed request
+        results = [future.result() for future in futures]
+
+    for (save_key, _), res in zip(queries, results):
+        data.insert_data(save_key, res, values)
+
+
+def _send(req_data: dict):
+    prepared = requests.Request(req_data["method"], req_data["url"], headers=req_data["headers"],
+                                json=req_data.get("json", None),
+                                data=req_data.get("other", None), params=req_data["params"]).prepare()
+
+    if prepared.method not in COALESCED_METHODS or not session_pool.get_api_config()["coalesce"]:
+        return _send_prepared(req_data, prepared)
+
+    # Identical requests (with identical response processing) from other pipelines share one result
+    key = (response_cache.cache_key(prepared), req_data["res_format"],
+           json.dumps(req_data["xml_config"], sort_keys=True, default=str), req_data["include_headers"],
+           req_data["projection"])
+
+    return single_flight.do(key, lambda: _send_prepared(req_data, prepared))
+
+
+def _send_prepared(req_data: dict, prepared: requests.PreparedRequest):
+    # Make the http request (connections are reused per host), only responses with a ttl are stored on disk
+    if req_data["cache_ttl"] is not None:
+        response = response_cache.send(prepared, req_data["cache_ttl"])
+    else:
+        response = session_pool.send_prepared(prepared)
 
     if not response.ok:
         raise APiRequestError(response)
 
     # Get the right return format
     if req_data["res_format"].__eq__("json"):
-        res = response.json()
+        if req_data["projection"] is None:
+            res = response.json()
+        else:
+            # Only the selected keys are converted to python objects
+            res = json_projection.loads(_json_text(response), compile_projection(req_data["projection"]))
     elif req_data["res_format"].__eq__("text"):
         res = response.text
     elif req_data["res_format"].__eq__("xml"):
-        res = xmltodict.parse(response.text, **req_data["xml_config"])
+        if req_data["projection"] is None:
+            res = xmltodict.parse(response.text, **req_data["xml_config"])
+        else:
+            res = xml_projection.parse(response.text, compile_projection(req_data["projection"]),
+                                       **req_data["xml_config"])
     else:
         res = response.content
 
     if req_data["include_headers"]:
         res = {"headers": response.headers, "content": res}
 
-    data.insert_data(save_key, res, values)
+    return res
+
+
+def _json_text(response: requests.Response):
+    # Same decoding as response.json()
+    if response.encoding is None and len(response.content) > 3:
+        encoding = guess_json_utf(response.content)
+
+        if encoding is not None:
+            return response.content.decode(encoding)
+
+    return response.text
 
 
 def _create_query(values: dict, data: StepData):
@@ -221,17 +344,20 @@ def _create_query(values: dict, data: StepData):
     # TODO use Format
     req["xml_config"] = data.deep_format(values.get("xml_config", {}), values=values)
     req["include_headers"] = data.get_data(values.get("include_headers", False), values, bool)
+    req["cache_ttl"] = data.get_data(values.get("cache_ttl", None), values, (numbers.Number, type(None)))
+
+    projection = values.get("projection", None)
+    req["projection"] = tuple(projection) if isinstance(projection, list) else None
 
     return req
 
 
 def _build_params_array(values: dict, data: StepData, api_key_name: str, req: dict):
-    if req["params"] is None:
-        req["params"] = {}
+    # params may be part of the config (see deep_format), so a copy is modified
+    req["params"] = {} if req["params"] is None else dict(req["params"])
 
     for params in values["params_array"]:
         params_array = data.get_data(params["array"], values, list)
-        data.deep_format(params_array, api_key_name, values)
 
         param = "".join(
             [
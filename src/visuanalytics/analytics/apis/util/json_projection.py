@@ -0,0 +1,186 @@
+"""
+Modul zum Parsen von JSON, bei dem nur die ausgewählten Keys einer :class:`Projection` in Python-Objekte umgewandelt
+werden.
+
+Oberhalb der ersten Wildcard wird der Text schrittweise gelesen. Arrays und Dictionaries, die nicht ausgewählt sind,
+werden dabei Element für Element mit dem JSON-Decoder der Standardbibliothek gelesen und sofort verworfen. Die Elemente
+unter einer Wildcard werden ebenfalls einzeln gelesen und direkt auf die ausgewählten Keys reduziert. Es liegt also nie
+mehr als ein Element eines nicht ausgewählten Teils gleichzeitig im Speicher. Das Ergebnis entspricht
+`projection.apply(json.loads(text), ignore_errors=True)`.
+
+Gegenüber `json.loads` wird so Speicher gespart, wenn große Teile der Antwort nicht ausgewählt sind. Da alle Werte mit
+dem JSON-Decoder der Standardbibliothek gelesen werden, ist die Laufzeit dabei nicht höher als bei `json.loads` mit
+anschließender Auswahl.
+"""
+import json
+import re
+from json.decoder import scanstring
+
+from visuanalytics.analytics.util.step_pattern import Projection, WILDCARD, _MISSING, _project
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+_decoder = json.JSONDecoder()
+
+
+def loads(text: str, projection: Projection):
+    """Parst einen JSON-String und erstellt dabei nur die von `projection` ausgewählten Keys.
+
+    :param text: JSON-String
+    :param projection: Keys, die ausgewählt werden sollen.
+    :return: Dictionary mit den ausgewählten Keys.
+    :raises: json.JSONDecodeError
+    """
+    idx = _skip_whitespace(text, 0)
+    value, idx = _parse(projection.root, text, idx)
+
+    if _skip_whitespace(text, idx) != len(text):
+        raise json.JSONDecodeError("Extra data", text, idx)
+
+    return {} if value is _MISSING else value
+
+
+def _skip_whitespace(text, idx):
+    return _WHITESPACE.match(text, idx).end()
+
+
+def _expect(text, idx, char):
+    if text[idx:idx + 1] != char:
+        raise json.JSONDecodeError(f"Expecting '{char}'", text, idx)
+
+    return _skip_whitespace(text, idx + 1)
+
+
+def _parse(node, text, idx):
+    if node.whole:
+        return _decoder.raw_decode(text, idx)
+
+    char = text[idx:idx + 1]
+
+    if char == "{":
+        return _parse_object(node, text, idx)
+    if char == "[":
+        return _parse_array(node, text, idx)
+
+    # Keys can only be selected from strings (by index), which are short compared to the other values
+    value, idx = _decoder.raw_decode(text, idx)
+    return _project(node, value, True), idx
+
+
+def _parse_object(node, text, idx):
+    wildcard = node.children.get(WILDCARD, None)
+    result = {}
+
+    idx = _skip_whitespace(text, idx + 1)
+    if text[idx:idx + 1] == "}":
+        idx += 1
+    else:
+        while True:
+            if text[idx:idx + 1] != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, idx)
+
+            key, idx = scanstring(text, idx + 1)
+            idx = _expect(text, _skip_whitespace(text, idx), ":")
+
+            if wildcard is not None:
+                value, idx = _decode_element(wildcard, text, idx)
+                result[key] = value
+            else:
+                child = node.children.get(key, None)
+
+                if child is None:
+                    idx = _skip(text, idx)
+                else:
+                    value, idx = _parse(child, text, idx)
+
+                    if value is not _MISSING:
+                        result[key] = value
+
+            idx = _skip_whitespace(text, idx)
+            if text[idx:idx + 1] == "}":
+                idx += 1
+                break
+            idx = _expect(text, idx, ",")
+
+    if wildcard is None and not result:
+        return _MISSING, idx
+
+    return result, idx
+
+
+def _parse_array(node, text, idx):
+    wildcard = node.children.get(WILDCARD, None)
+    result = [] if wildcard is not None else {}
+
+    idx = _skip_whitespace(text, idx + 1)
+    if text[idx:idx + 1] == "]":
+        idx += 1
+    else:
+        pos = 0
+        while True:
+            if wildcard is not None:
+                value, idx = _decode_element(wildcard, text, idx)
+                result.append(value)
+            else:
+                child = node.children.get(pos, None)
+
+                if child is None:
+                    idx = _skip(text, idx)
+                else:
+                    value, idx = _parse(child, text, idx)
+
+                    if value is not _MISSING:
+                        result[pos] = value
+
+            idx = _skip_whitespace(text, idx)
+            if text[idx:idx + 1] == "]":
+                idx += 1
+                break
+            idx = _expect(text, idx, ",")
+            pos += 1
+
+    if wildcard is None and not result:
+        return _MISSING, idx
+
+    return result, idx
+
+
+def _decode_element(node, text, idx):
+    # Parsing every key in Python is much slower than decoding the element at once and selecting the keys afterwards
+    value, idx = _decoder.raw_decode(text, idx)
+    value = _project(node, value, True)
+
+    return {} if value is _MISSING else value, idx
+
+
+def _skip(text, idx):
+    # Only one element of the skipped value is decoded at once
+    char = text[idx:idx + 1]
+
+    if char == "[":
+        idx = _skip_whitespace(text, idx + 1)
+        if text[idx:idx + 1] == "]":
+            return idx + 1
+
+        while True:
+            idx = _skip_whitespace(text, _decoder.raw_decode(text, idx)[1])
+            if text[idx:idx + 1] == "]":
+                return idx + 1
+            idx = _expect(text, idx, ",")
+
+    if char == "{":
+        idx = _skip_whitespace(text, idx + 1)
+        if text[idx:idx + 1] == "}":
+            return idx + 1
+
+        while True:
+            if text[idx:idx + 1] != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, idx)
+
+            idx = _expect(text, _skip_whitespace(text, scanstring(text, idx + 1)[1]), ":")
+            idx = _skip_whitespace(text, _decoder.raw_decode(text, idx)[1])
+            if text[idx:idx + 1] == "}":
+                return idx + 1
+            idx = _expect(text, idx, ",")
+
+    return _decoder.raw_decode(text, idx)[1]
@@ -0,0 +1,214 @@
+"""
+Modul mit einem Cache für API-Antworten, der von allen Jobs gemeinsam genutzt wird.
+
+Die Antworten werden im Ordner `resources/cache` gespeichert. Der Name der Dateien ist ein Hash über den vollständigen
+Request (Methode, URL inklusive Parametern, Header und Body), sodass API-Keys nicht im Klartext gespeichert werden.
+Ist eine Antwort älter als die angegebene Zeit (`cache_ttl`), wird sie mit `ETag` bzw. `Last-Modified` beim Server
+erneut angefragt. Antwortet dieser mit `304 Not Modified`, wird die gespeicherte Antwort weiterverwendet.
+
+Gleiche Requests aus mehreren Prozessen werden über eine Lock-Datei nacheinander ausgeführt, wartende Prozesse
+verwenden dann die gespeicherte Antwort (siehe :mod:`single_flight`).
+
+Überschreitet der Cache die maximale Größe (`cache_size` im Abschnitt `api` der Konfigurationsdatei, in MB), werden die
+am längsten nicht verwendeten Antworten gelöscht.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from visuanalytics.analytics.apis.util import session_pool, single_flight
+from visuanalytics.util import resources
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+
+
+def cache_key(prepared: requests.PreparedRequest):
+    """Berechnet einen Hash über den vollständigen Request (Methode, URL, Header und Body).
+
+    :param prepared: Request
+    :return: Hash als Hex-String.
+    """
+    body = prepared.body.encode("utf-8") if isinstance(prepared.body, str) else prepared.body or b""
+    headers = sorted((key.lower(), value) for key, value in prepared.headers.items())
+
+    key = hashlib.sha256()
+    key.update(json.dumps([prepared.method, prepared.url, headers]).encode("utf-8"))
+    key.update(body)
+
+    return key.hexdigest()
+
+
+def _paths(key: str):
+    return resources.get_cache_path(f"{key}.json"), resources.get_cache_path(f"{key}.body")
+
+
+def _load(key: str):
+    meta_path, body_path = _paths(key)
+
+    try:
+        with open(meta_path, "r", encoding="utf-8") as fp:
+            meta = json.load(fp)
+        with open(body_path, "rb") as fp:
+            body = fp.read()
+    except (OSError, ValueError):
+        return None, None
+
+    return meta, body
+
+
+def _write(path: str, content: bytes):
+    # Write to a temporary file first, other processes may read the cache at the same time
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as fp:
+        fp.write(content)
+
+    os.replace(tmp_path, path)
+
+
+def _store(key: str, meta: dict, body: bytes = None):
+    meta_path, body_path = _paths(key)
+    os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+
+    if body is not None:
+        _write(body_path, body)
+    _write(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+def _touch(key: str):
+    # The modification time of the body is used to find the least recently used responses
+    try:
+        os.utime(_paths(key)[1])
+    except OSError:
+        pass
+
+
+def _to_response(prepared: requests.PreparedRequest, meta: dict, body: bytes):
+    response = requests.Response()
+    response.status_code = meta["status"]
+    response.headers = CaseInsensitiveDict(meta["headers"])
+    response.encoding = meta["encoding"]
+    response.url = prepared.url
+    response.request = prepared
+    response._content = body
+
+    return response
+
+
+def evict(max_size: int):
+    """Löscht die am längsten nicht verwendeten Antworten, bis die gespeicherten Antworten (ohne Metadaten) höchstens
+    `max_size` Bytes groß sind.
+
+    :param max_size: Maximale Größe des Caches in Bytes.
+    :return: Anzahl der gelöschten Antworten.
+    """
+    try:
+        entries = [entry for entry in os.scandir(resources.get_cache_path("")) if entry.name.endswith(".body")]
+    except FileNotFoundError:
+        return 0
+
+    sizes = {}
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+
+        sizes[entry.path] = (stat.st_mtime, stat.st_size)
+
+    total = sum(size for _, size in sizes.values())
+    removed = 0
+
+    for path, (_, size) in sorted(sizes.items(), key=lambda item: item[1][0]):
+        if total <= max_size:
+            break
+
+        for remove_path in (f"{path[:-len('.body')]}.json", path):
+            try:
+                os.remove(remove_path)
+            except FileNotFoundError:
+                pass
+
+        total -= size
+        removed += 1
+
+    return removed
+
+
+def send(prepared: requests.PreparedRequest, ttl):
+    """Führt einen Request aus oder gibt eine gespeicherte Antwort zurück.
+
+    Gleiche Requests aus mehreren Prozessen werden nacheinander ausgeführt (siehe :func:`single_flight.process_lock`).
+    Hat ein anderer Prozess den Request in der Zwischenzeit ausgeführt, wird dessen Antwort verwendet.
+
+    Nur erfolgreiche Antworten (Status-Code 2xx) werden gespeichert.
+
+    :param prepared: Request, der ausgeführt werden soll.
+    :param ttl: Zeit in Sekunden, für die eine gespeicherte Antwort ohne Rückfrage beim Server verwendet wird.
+    :return: Antwort des Servers bzw. aus dem Cache.
+    :rtype: requests.Response
+    """
+    key = cache_key(prepared)
+    lock_path = resources.get_cache_path(f"{key}.lock")
+    started = time.time()
+
+    meta, body = _load(key)
+
+    if meta is not None and started - meta["time"] < ttl:
+        _touch(key)
+        return _to_response(prepared, meta, body)
+
+    with single_flight.process_lock(lock_path) as waited:
+        meta, body = _load(key)
+        now = time.time()
+
+        # "time" is taken before a request is sent (for the ttl), "received" after its response arrived. A process
+        # that started waiting while the request was in flight can therefore use the response.
+        received = meta.get("received", meta["time"]) if meta is not None else None
+
+        if meta is not None and (waited and received >= started or now - meta["time"] < ttl):
+            _touch(key)
+            return _to_response(prepared, meta, body)
+
+        if meta is not None:
+            # Revalidate the stored response
+            if meta.get("etag", None) is not None:
+                prepared.headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified", None) is not None:
+                prepared.headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = session_pool.send_prepared(prepared)
+
+        if response.status_code == 304 and meta is not None:
+            logger.debug(f"Response for '{prepared.method} {key}' is still valid")
+            meta["time"] = now
+            meta["received"] = time.time()
+            _store(key, meta)
+            _touch(key)
+            return _to_response(prepared, meta, body)
+
+        if not response.ok:
+            return response
+
+        meta = {
+            "time": now,
+            "received": time.time(),
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            "encoding": response.encoding,
+            "etag": response.headers.get("ETag", None),
+            "last_modified": response.headers.get("Last-Modified", None)
+        }
+
+        with _lock:
+            _store(key, meta, response.content)
+            evict(int(session_pool.get_api_config()["cache_size"] * 1024 * 1024))
+
+    return response
@@ -0,0 +1,121 @@
+"""
+Modul, das für jeden Host eine HTTP-Session bereitstellt, die von allen API-Requests des Prozesses verwendet wird.
+
+Dadurch werden bestehende Verbindungen (inklusive TLS-Handshake) wiederverwendet. Die Einstellungen werden aus dem
+Abschnitt `api` der Konfigurationsdatei `config.json` geladen (siehe :data:`DEFAULT_CONFIG`).
+"""
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from visuanalytics.util import config_manager
+
+DEFAULT_CONFIG = {
+    "pool_size": 10,
+    "keep_alive": True,
+    "connect_timeout": 10,
+    "read_timeout": 60,
+    "max_retries": 0,
+    "cache_size": 100,
+    "coalesce": True
+}
+"""Standardwerte für den Abschnitt `api` in der Konfigurationsdatei."""
+
+_lock = threading.Lock()
+_sessions = {}
+_config = None
+
+
+def _get_config():
+    global _config
+
+    if _config is None:
+        _config = {**DEFAULT_CONFIG, **config_manager.get_config().get("api", {})}
+
+    return _config
+
+
+def get_api_config():
+    """Gibt die Einstellungen aus dem Abschnitt `api` der Konfigurationsdatei (inklusive Standardwerten) zurück.
+
+    :rtype: dict
+    """
+    with _lock:
+        return _get_config()
+
+
+def _create_session(config: dict):
+    session = requests.session()
+
+    # Every request used to get a new session, so cookies must not be shared between requests (and jobs)
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config["pool_size"], max_retries=config["max_retries"])
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
+
+def configure(config: dict = None):
+    """Setzt die Einstellungen für die Sessions und schließt alle bestehenden Sessions.
+
+    :param config: Einstellungen (wie im Abschnitt `api` der Konfigurationsdatei). Bei `None` werden die Einstellungen
+        beim nächsten Request erneut aus der Konfigurationsdatei geladen.
+    """
+    global _config
+
+    with _lock:
+        _config = None if config is None else {**DEFAULT_CONFIG, **config}
+        _close_all()
+
+
+def get_session(url: str):
+    """Gibt die Session für das Schema und den Host von `url` zurück.
+
+    :param url: URL des Requests.
+    :return: Session, die für alle Requests an diesen Host verwendet wird.
+    :rtype: requests.Session
+    """
+    parts = urlsplit(url)
+    key = (parts.scheme.lower(), parts.netloc.lower())
+
+    with _lock:
+        session = _sessions.get(key, None)
+
+        if session is None:
+            session = _sessions[key] = _create_session(_get_config())
+
+        return session
+
+
+def send_prepared(prepared: requests.PreparedRequest):
+    """Führt einen vorbereiteten Request mit der Session des jeweiligen Hosts aus.
+
+    :param prepared: Request, der ausgeführt werden soll.
+    :return: Antwort des Servers.
+    :rtype: requests.Response
+    """
+    session = get_session(prepared.url)
+    config = get_api_config()
+
+    if not config["keep_alive"]:
+        prepared.headers.setdefault("Connection", "close")
+
+    return session.send(prepared, timeout=(config["connect_timeout"], config["read_timeout"]))
+
+
+def close_sessions():
+    """Schließt alle Sessions und deren Verbindungen."""
+    with _lock:
+        _close_all()
+
+
+def _close_all():
+    for session in _sessions.values():
+        session.close()
+
+    _sessions.clear()
@@ -0,0 +1,123 @@
+"""
+Modul zum Zusammenfassen gleicher Requests, die gleichzeitig von mehreren Pipelines gesendet werden (Single-Flight).
+
+Innerhalb eines Prozesses wartet jeder weitere Aufruf mit dem gleichen Key auf den bereits laufenden Aufruf und bekommt
+eine Kopie von dessen Ergebnis, sodass die Pipelines ihre Daten unabhängig voneinander verändern können.
+
+Zwischen mehreren Prozessen wird für Requests mit `cache_ttl` über eine Lock-Datei sichergestellt, dass immer nur ein
+Prozess den Request sendet. Die Antwort wird dann über den Cache (siehe :mod:`response_cache`) an die wartenden
+Prozesse weitergegeben. Ohne das
+Modul `fcntl` (z.B. unter Windows) werden Requests nur innerhalb eines Prozesses zusammengefasst.
+"""
+import contextlib
+import os
+import threading
+from copy import deepcopy
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_lock = threading.Lock()
+_flights = {}
+
+
+class _Flight(object):
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+def do(key, func):
+    """Führt `func` aus, wenn für `key` gerade kein Aufruf läuft, ansonsten wird auf den laufenden Aufruf gewartet.
+
+    :param key: Key, der gleiche Aufrufe kennzeichnet (z.B. ein Hash über den Request).
+    :param func: Funktion ohne Parameter, deren Ergebnis zurückgegeben wird.
+    :return: Ergebnis von `func`. Wartende Aufrufe bekommen eine Kopie des Ergebnisses.
+    """
+    with _lock:
+        flight = _flights.get(key, None)
+
+        if flight is None:
+            flight = _flights[key] = _Flight()
+            leader = True
+        else:
+            flight.waiters += 1
+            leader = False
+
+    if not leader:
+        flight.event.wait()
+
+        if flight.error is not None:
+            raise flight.error
+
+        return deepcopy(flight.result)
+
+    result = None
+    try:
+        result = func()
+        return result
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _lock:
+            del _flights[key]
+
+        # The caller may change its result, so the waiting calls get a copy made before it is returned
+        if flight.waiters and flight.error is None:
+            flight.result = deepcopy(result)
+
+        flight.event.set()
+
+
+@contextlib.contextmanager
+def process_lock(path: str):
+    """Sperrt eine Lock-Datei für andere Prozesse.
+
+    Ist die Datei bereits von einem anderen Prozess gesperrt, wird gewartet, bis sie wieder freigegeben wird. Beim
+    Freigeben wird die Lock-Datei gelöscht.
+
+    :param path: Pfad der Lock-Datei
+    :return: Context-Manager, der `True` liefert, wenn auf einen anderen Prozess gewartet wurde.
+    """
+    if fcntl is None:
+        yield False
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    waited = False
+    while True:
+        fp = open(path, "a")
+
+        try:
+            fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            waited = True
+            fcntl.flock(fp, fcntl.LOCK_EX)
+
+        # The file is removed when it is unlocked, so the lock is only valid if the file still exists
+        try:
+            if os.fstat(fp.fileno()).st_ino == os.stat(path).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+
+        fp.close()
+
+    try:
+        yield waited
+    finally:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+        fcntl.flock(fp, fcntl.LOCK_UN)
+        fp.close()
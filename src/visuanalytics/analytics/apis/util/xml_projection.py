@@ -0,0 +1,216 @@
+"""
+Modul zum Parsen von XML mit `xmltodict`, bei dem nur die ausgewählten Keys einer :class:`Projection` in Python-Objekte
+umgewandelt werden.
+
+Der Parser (`expat`) liest weiterhin das ganze Dokument, an `xmltodict` werden aber nur die Elemente weitergegeben, die
+auf einem ausgewählten Key-Pfad liegen. Von allen anderen Elementen werden (ohne Inhalt) nur so viele weitergegeben,
+dass Listen und Dictionaries die gleiche Form wie beim Parsen des ganzen Dokuments haben. Das Ergebnis entspricht daher
+`projection.apply(xmltodict.parse(text, **xml_config), ignore_errors=True)`.
+
+Zahlen in den Key-Pfaden stehen für das n-te Element mit dem gleichen Namen (Index in der Liste, die `xmltodict` für
+gleichnamige Elemente erstellt).
+"""
+from xml.parsers import expat
+
+import xmltodict
+
+from visuanalytics.analytics.util.step_pattern import Projection, WILDCARD
+
+_CONTENT_HANDLERS = ("CharacterDataHandler", "CommentHandler")
+_FILTER_HANDLERS = ("StartElementHandler", "EndElementHandler", "StartNamespaceDeclHandler") + _CONTENT_HANDLERS
+
+
+def parse(text, projection: Projection, **xml_config):
+    """Parst XML-Daten mit `xmltodict` und erstellt dabei nur die von `projection` ausgewählten Keys.
+
+    :param text: XML-Daten
+    :param projection: Keys, die ausgewählt werden sollen.
+    :param xml_config: Einstellungen für `xmltodict.parse`.
+    :return: Dictionary mit den ausgewählten Keys.
+    """
+    res = xmltodict.parse(text, expat=_ExpatModule(projection), **xml_config)
+
+    return projection.apply(res, ignore_errors=True)
+
+
+class _ExpatModule(object):
+    # Replaces the expat module used by xmltodict.parse
+    def __init__(self, projection: Projection):
+        self.projection = projection
+
+    def ParserCreate(self, *args, **kwargs):
+        return _ProjectionParser(expat.ParserCreate(*args, **kwargs), _Filter(self.projection))
+
+
+def _expand(nodes):
+    # A wildcard may also stand for the index in a list of elements, so it applies to the same element as well
+    result = set()
+    pending = list(nodes)
+
+    while pending:
+        node = pending.pop()
+        if node not in result:
+            result.add(node)
+            pending.extend(child for key, child in node.children.items() if key == WILDCARD)
+
+    return result
+
+
+def _state(nodes):
+    # True: the whole element is selected, empty: the element is not selected
+    nodes = frozenset(nodes)
+
+    return True if any(node.whole for node in nodes) else nodes
+
+
+class _Frame(object):
+    __slots__ = ("state", "seen", "passed")
+
+    def __init__(self, state):
+        self.state = state
+        # Number of child elements per name that occurred / that were passed on to xmltodict
+        self.seen = {}
+        self.passed = {}
+
+
+class _ProjectionParser(object):
+    """Parser, der die Handler von `xmltodict` nur über :class:`_Filter` aufruft."""
+    __slots__ = ("_parser", "_filter")
+
+    def __init__(self, parser, element_filter):
+        object.__setattr__(self, "_parser", parser)
+        object.__setattr__(self, "_filter", element_filter)
+
+        element_filter.parser = parser
+        parser.StartElementHandler = element_filter.start
+        parser.EndElementHandler = element_filter.end
+
+    def __getattr__(self, name):
+        return getattr(self._parser, name)
+
+    def __setattr__(self, name, value):
+        if name in _FILTER_HANDLERS:
+            self._filter.handlers[name] = value
+
+            if name == "StartElementHandler":
+                # Element names are compared the same way xmltodict builds them (e.g. with shortened namespaces)
+                self._filter.build_name = getattr(getattr(value, "__self__", None), "_build_name", str)
+            elif name == "StartNamespaceDeclHandler":
+                # Declarations are passed on together with their element
+                self._parser.StartNamespaceDeclHandler = self._filter.namespace_decl
+            elif name in _CONTENT_HANDLERS:
+                setattr(self._parser, name, value)
+        else:
+            setattr(self._parser, name, value)
+
+
+class _Filter(object):
+    """Leitet die Ereignisse des Parsers nur für ausgewählte Elemente an die Handler von `xmltodict` weiter."""
+    __slots__ = ("parser", "handlers", "build_name", "transitions", "stack", "namespaces", "skip_depth",
+                 "placeholder")
+
+    def __init__(self, projection: Projection):
+        self.parser = None
+        self.handlers = {}
+        self.build_name = str
+        self.transitions = {}
+        self.stack = [_Frame(frozenset(_expand([projection.root])))]
+        self.namespaces = []
+        self.skip_depth = 0
+        self.placeholder = False
+
+    def _transition(self, state, key):
+        # Returns the state of the first element with the name key, the states of the following elements by index and
+        # the state of all other elements
+        transition = self.transitions.get((state, key), None)
+
+        if transition is None:
+            matched = [child for node in state for child_key, child in node.children.items()
+                       if child_key == key or child_key == WILDCARD]
+            items = [(child_key, child) for node in matched for child_key, child in node.children.items()]
+            by_index = {}
+            for child_key, child in items:
+                if isinstance(child_key, int):
+                    by_index.setdefault(child_key, []).append(child)
+
+            # The first element may be a single element (not a list), all following elements are part of a list
+            listed = [node for node in matched if node.whole] + \
+                     [child for child_key, child in items if child_key == WILDCARD]
+            transition = self.transitions[(state, key)] = (
+                bool(matched),
+                _state(_expand(matched + by_index.get(0, []))),
+                {idx: _state(listed + children) for idx, children in by_index.items()},
+                _state(listed),
+                max(by_index, default=-1)
+            )
+
+        return transition
+
+    def _set_content_handlers(self, enabled):
+        for name in _CONTENT_HANDLERS:
+            if name in self.handlers:
+                setattr(self.parser, name, self.handlers[name] if enabled else None)
+
+    def _pass_start(self, name, attrs):
+        if self.namespaces:
+            for prefix, uri in self.namespaces:
+                self.handlers["StartNamespaceDeclHandler"](prefix, uri)
+            self.namespaces.clear()
+
+        self.handlers["StartElementHandler"](name, attrs)
+
+    def namespace_decl(self, prefix, uri):
+        if not self.skip_depth:
+            self.namespaces.append((prefix, uri))
+
+    def start(self, name, attrs):
+        if self.skip_depth:
+            self.skip_depth += 1
+            return
+
+        frame = self.stack[-1]
+
+        if frame is True:
+            self.stack.append(True)
+            self._pass_start(name, attrs)
+            return
+
+        key = self.build_name(name)
+        idx = frame.seen.get(key, 0)
+        frame.seen[key] = idx + 1
+
+        matched, first_state, by_index, state, max_idx = self._transition(frame.state, key)
+        state = first_state if idx == 0 else by_index.get(idx, state)
+        passed = frame.passed.get(key, 0)
+
+        # Elements that are not selected are passed on without content, as long as they are needed to keep the parent
+        # a dictionary, the indices of the selected elements and the list of elements with the same name
+        forward = bool(state) or not frame.passed or matched and (idx <= max_idx or passed < 2)
+
+        if forward:
+            frame.passed[key] = passed + 1
+            self._pass_start(name, attrs if state else [])
+        else:
+            self.namespaces.clear()
+
+        if state:
+            self.stack.append(True if state is True else _Frame(state))
+        else:
+            self.skip_depth = 1
+            self.placeholder = forward
+            self._set_content_handlers(False)
+
+    def end(self, name):
+        if self.skip_depth:
+            self.skip_depth -= 1
+
+            if self.skip_depth:
+                return
+
+            self._set_content_handlers(True)
+            if not self.placeholder:
+                return
+        else:
+            self.stack.pop()
+
+        self.handlers["EndElementHandler"](name)
@@ -0,0 +1,243 @@
+"""
+Modul zum Entfernen von Daten, die nach den Steps Transform und Storing nicht mehr verwendet werden.
+
+Welche Daten noch benötigt werden, wird statisch aus der Konfiguration der folgenden Steps (Images, Thumbnail, Audios
+und Sequence) und der Job-Konfiguration (`_conf`) bestimmt. Dazu wird jeder String darin als möglicher Key-Pfad
+betrachtet (auch mit `$` am Anfang), zusätzlich werden alle Key-Pfade in `{}` (Format-Strings, auch verschachtelt)
+berücksichtigt. Für den Step Audios wird außerdem die Audio-Konfiguration aus der `config.json` durchsucht. Die Analyse
+ist damit bewusst konservativ: Ein Wert wird nur entfernt, wenn kein String auf ihn (oder einen seiner Unterschlüssel)
+verweist. Enthält ein String `{}`, lässt sich aber nicht als Format-String parsen, werden alle Daten behalten. Das gilt
+auch für Key-Pfade, deren erster Key erst zur Laufzeit bekannt ist (z.B. `{_conf|src}|temp`).
+"""
+import logging
+
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.util.step_pattern import WILDCARD, template_fields
+from visuanalytics.util.config_manager import get_config
+
+logger = logging.getLogger(__name__)
+
+LIVE_SECTIONS = ("presets", "images", "thumbnail", "audio", "sequence")
+"""Teile der Steps-Konfiguration, die nach dem Step Storing noch ausgewertet werden."""
+
+PRUNED_KEYS = ("_req",)
+"""Interne Keys, die entfernt werden können. Alle anderen Keys mit `_` am Anfang bleiben immer erhalten."""
+
+# Marks a node whose whole value is used
+_WHOLE = None
+
+
+def _is_prunable(key):
+    return isinstance(key, str) and (key in PRUNED_KEYS or not key.startswith("_"))
+
+
+def _first_key(value: str, split_key: str):
+    # Split keys inside of {} belong to the template (e.g. "{_conf|src}|temp")
+    depth = 0
+    for idx, char in enumerate(value):
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth = max(depth - 1, 0)
+        elif depth == 0 and value.startswith(split_key, idx):
+            return value[:idx], True
+
+    return value, False
+
+
+def _add_path(tree: dict, keys: list):
+    node = tree
+    for key in keys:
+        if _WHOLE in node:
+            return
+
+        if key == WILDCARD or "{" in key or "}" in key:
+            # Keys behind wildcards and templates are only known at runtime
+            break
+
+        node = node.setdefault(key, {})
+
+    node.clear()
+    node[_WHOLE] = True
+
+
+def _add_string(tree: dict, value: str, split_key: str):
+    # Strip the data prefix (see StepData.deep_format)
+    if value.startswith("$"):
+        value = value[1:]
+    elif value.startswith("~$"):
+        value = value[2:]
+
+    if "{" in value or "}" in value:
+        try:
+            fields = list(template_fields(value))
+        except ValueError:
+            # Unknown which data is read, so all data is kept
+            tree.clear()
+            tree[_WHOLE] = True
+            return
+
+        for field in fields:
+            _add_string(tree, field, split_key)
+
+    first, has_keys = _first_key(value, split_key)
+    if "{" in first or "}" in first:
+        if has_keys:
+            # The first key is only known at runtime, like a wildcard it can be any key
+            tree.clear()
+            tree[_WHOLE] = True
+        return
+
+    if _is_prunable(first):
+        _add_path(tree, value.split(split_key))
+
+
+def collect_paths(tree: dict, value, split_key="|"):
+    """Fügt alle Key-Pfade, die in `value` vorkommen können, zu einem Baum hinzu (siehe :func:`live_paths`).
+
+    :param tree: Baum, zu dem die Key-Pfade hinzugefügt werden.
+    :param value: Teil der Konfiguration (wird rekursiv durchsucht).
+    :param split_key: Trennzeichen zwischen den Keys.
+    """
+    if isinstance(value, str):
+        _add_string(tree, value, split_key)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            collect_paths(tree, key, split_key)
+            collect_paths(tree, item, split_key)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            collect_paths(tree, item, split_key)
+
+
+def live_paths(config: dict, run_config: dict, sections=LIVE_SECTIONS, split_key="|"):
+    """Bestimmt die Key-Pfade, die nach dem Step Storing noch gelesen werden können.
+
+    :param config: Steps-Konfiguration des Jobs
+    :param run_config: Job-Konfiguration (`_conf`)
+    :param sections: Teile der Steps-Konfiguration, die durchsucht werden.
+    :param split_key: Trennzeichen zwischen den Keys.
+    :return: Baum aus Dictionaries mit den Keys der benötigten Daten. Unter dem Key `None` steht `True`, wenn der
+        gesamte Wert benötigt wird.
+    :rtype: dict
+    """
+    tree = {}
+
+    for section in sections:
+        collect_paths(tree, config.get(section, None), split_key)
+
+    # The Audios step also formats the audio config from config.json (e.g. sub_pairs)
+    if "audio" in sections and config.get("audio", None) is not None:
+        collect_paths(tree, get_config().get("audio", None), split_key)
+
+    collect_paths(tree, run_config, split_key)
+
+    return tree
+
+
+def is_live(tree: dict, key: str, split_key="|"):
+    """Prüft, ob ein Key-Pfad (oder ein Teil der Daten darunter) laut `tree` gelesen wird.
+
+    Keys, die nicht entfernt werden können (z.B. `_conf`), sind immer benötigt. Wildcards und Keys mit `{}` passen
+    auf alle Keys.
+
+    :param tree: Baum aus :func:`live_paths`
+    :param key: Key-Pfad
+    :param split_key: Trennzeichen zwischen den Keys.
+    :return: `True`, wenn die Daten benötigt werden.
+    """
+    keys = key.split(split_key)
+    if not _is_prunable(keys[0]):
+        return True
+
+    return _is_live(tree, keys)
+
+
+def _is_live(node: dict, keys: list):
+    if _WHOLE in node or not keys:
+        return True
+
+    key = keys[0]
+    if key == WILDCARD or "{" in key or "}" in key:
+        return any(_is_live(child, keys[1:]) for child_key, child in node.items() if child_key is not _WHOLE)
+
+    return key in node and _is_live(node[key], keys[1:])
+
+
+def is_below_path(tree: dict, key: str, split_key="|"):
+    """Prüft, ob ein Key-Pfad in den Daten unter einem der Key-Pfade aus `tree` liegt.
+
+    :param tree: Baum aus :func:`live_paths` bzw. :func:`collect_paths`
+    :param key: Key-Pfad
+    :param split_key: Trennzeichen zwischen den Keys.
+    :return: `True`, wenn einer der Key-Pfade ein Präfix von `key` ist (aber nicht `key` selbst).
+    """
+    if _WHOLE in tree:
+        return True
+
+    node = tree
+    for child_key in key.split(split_key)[:-1]:
+        if child_key == WILDCARD or "{" in child_key or "}" in child_key:
+            return True
+
+        node = node.get(child_key, None)
+        if node is None:
+            return False
+
+        if _WHOLE in node:
+            return True
+
+    return False
+
+
+def _prune(tree: dict, data: dict, path: str, removed: list):
+    # Builds a new dictionary, the data may be referenced from other keys as well
+    result = {}
+
+    for key, value in data.items():
+        node = tree.get(str(key), None)
+        if node is None:
+            removed.append(f"{path}{key}")
+            continue
+
+        # Arrays are always kept completely
+        if _WHOLE not in node and isinstance(value, dict):
+            value = _prune(node, value, f"{path}{key}|", removed)
+
+        result[key] = value
+
+    return result
+
+
+def prune_data(values: dict, data: StepData):
+    """Entfernt alle Daten, die in den folgenden Steps nicht mehr verwendet werden.
+
+    Kann über den Konfigurationseintrag `prune_data` (Default: `true`) deaktiviert werden.
+
+    :param values: Werte aus der JSON-Datei
+    :param data: Daten aus der API
+    :return: Liste mit den entfernten Key-Pfaden.
+    """
+    if not data.get_config("prune_data", True):
+        return []
+
+    tree = live_paths(values, data.data["_conf"])
+    removed = []
+
+    if _WHOLE in tree:
+        return removed
+
+    root = data.data
+    for key in [key for key in root if _is_prunable(key)]:
+        node = tree.get(key, None)
+
+        if node is None:
+            del root[key]
+            removed.append(key)
+        elif _WHOLE not in node and isinstance(root[key], dict):
+            root[key] = _prune(node, root[key], f"{key}|", removed)
+
+    if removed:
+        logger.debug(f"Removed data that is not used after storing: {', '.join(removed)}")
+
+    return removed
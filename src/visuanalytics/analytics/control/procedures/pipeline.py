@@ -1,5 +1,4 @@
 import contextlib
-import json
 import logging
 import os
 import shutil
@@ -8,14 +7,16 @@ import traceback
 from datetime import datetime
 
 from visuanalytics.analytics.apis.api import api_request, api
+from visuanalytics.analytics.control.procedures.data_liveness import prune_data
 from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.control.procedures.steps_plan import get_plan
 from visuanalytics.analytics.precondition.precondition import precondition
 from visuanalytics.analytics.processing.audio.audio import generate_audios
 from visuanalytics.analytics.processing.image.visualization import generate_all_images
 from visuanalytics.analytics.sequence.sequence import link
 from visuanalytics.analytics.storing.storing import storing
 from visuanalytics.analytics.thumbnail.thumbnail import thumbnail
-from visuanalytics.analytics.transform.transform import transform
+from visuanalytics.analytics.transform.transform import transform_all
 from visuanalytics.analytics.util.video_delete import delete_video
 from visuanalytics.server.db.job import insert_log, update_log_finish, update_log_error
 from visuanalytics.util import resources
@@ -34,8 +35,8 @@ class Pipeline(object):
                -1: {"name": "Not Started"},
                0: {"name": "Precondition", "call": precondition},
                1: {"name": "Apis", "call": api},
-               2: {"name": "Transform", "call": transform},
-               3: {"name": "Storing", "call": storing},
+               2: {"name": "Transform", "call": transform_all},
+               3: {"name": "Storing", "call": storing, "after": prune_data},
                4: {"name": "Images", "call": generate_all_images},
                5: {"name": "Thumbnail", "call": thumbnail},
                6: {"name": "Audios", "call": generate_audios},
@@ -124,15 +125,8 @@ class Pipeline(object):
         log_id = self.__update_db(insert_log, self.__job_id, self.__log_states["running"], round(self.__start_time))
         self.__log_id = log_id
 
-        # Load json config file
-        with resources.open_resource(f"steps/{self.__step_name}.json") as fp:
-            self.__config = json.loads(fp.read())
-
-        # Load and merge global presets
-        with resources.open_resource(f"steps/global_presets.json") as fp:
-            global_presets = json.loads(fp.read())
-
-        self.__config["presets"] = {**global_presets.get("presets", {}), **self.__config.get("presets", {})}
+        # Load compiled json config (shared by all pipelines of this topic) and create the config for this run
+        self.__config = get_plan(self.__step_name).new_frame()
 
         if not self.__no_tmp_dir:
             os.mkdir(resources.get_temp_resource_path("", self.id))
@@ -250,7 +244,9 @@ class Pipeline(object):
                 logger.info(f"Next step: {self.current_step_name()}")
 
                 # Execute Step
-                self.__steps[self.__current_step].get("call", lambda: None)(self.__config, data)
+                step = self.__steps[self.__current_step]
+                step.get("call", lambda *args: None)(self.__config, data)
+                step.get("after", lambda *args: None)(self.__config, data)
 
                 logger.info(f"Step finished: {self.current_step_name()}!")
 
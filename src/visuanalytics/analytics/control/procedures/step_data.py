@@ -2,13 +2,100 @@
 Modul, das die Klasse :class:`StepData` beinhaltet.
 """
 import numbers
+import threading
+from collections import ChainMap
 from copy import copy
 
-from visuanalytics.analytics.util.step_errors import APIKeyError, PresetError
+from visuanalytics.analytics.util.step_errors import APIKeyError, PresetError, StepKeyError
 from visuanalytics.analytics.util.step_pattern import StepPatternFormatter, data_insert_pattern, data_get_pattern, \
-    data_remove_pattern
+    data_remove_pattern, data_exists_pattern, compile_key_path, WILDCARD, BoundKey
 from visuanalytics.util import config_manager
 
+CONSTANT_CACHE_SIZE = 1024
+"""Anzahl der Konfigurationen, für die gespeichert wird, welche Teile keine Platzhalter enthalten."""
+
+_constant_cache = {}
+_constant_cache_lock = threading.Lock()
+
+
+def _collect_constant_nodes(config, data_prefix: str, constant: set):
+    if config is None or isinstance(config, (numbers.Number, bool)):
+        return True
+
+    if isinstance(config, str):
+        return "{" not in config and "}" not in config and not config.startswith(data_prefix) and \
+               not config.startswith(f"~{data_prefix}")
+
+    if isinstance(config, dict):
+        children = config.values()
+    elif isinstance(config, list):
+        children = config
+    else:
+        return False
+
+    # Visit all children, so the constant parts of templated nodes are found as well
+    if all([_collect_constant_nodes(child, data_prefix, constant) for child in children]):
+        constant.add(id(config))
+        return True
+
+    return False
+
+
+def _constant_nodes(config, data_prefix: str):
+    # Ids of all dictionaries and arrays in config that contain no placeholders and no $ references
+    if not config:
+        # Empty configs are often new objects (e.g. defaults of get), caching them would only fill the cache
+        return frozenset((id(config),))
+
+    cache_key = (id(config), data_prefix)
+
+    with _constant_cache_lock:
+        cached = _constant_cache.get(cache_key, None)
+        if cached is not None and cached[0] is config:
+            return cached[1]
+
+    constant = set()
+    _collect_constant_nodes(config, data_prefix, constant)
+
+    with _constant_cache_lock:
+        if len(_constant_cache) >= CONSTANT_CACHE_SIZE:
+            _constant_cache.clear()
+
+        # The config is stored as well, so its id (and the ids of its children) can not be reused
+        _constant_cache[cache_key] = (config, frozenset(constant))
+
+    return _constant_cache[cache_key][1]
+
+
+def _copy_constant(config):
+    if isinstance(config, dict):
+        config = copy(config)
+        for key in config:
+            config[key] = _copy_constant(config[key])
+    elif isinstance(config, list):
+        config = [_copy_constant(value) for value in config]
+
+    return config
+
+
+class DataScope(ChainMap):
+    """
+    Sicht auf die Daten eines Jobs inklusive der Variablen aller aktuell durchlaufenen Schleifen.
+
+    Beim Lesen werden zuerst die Schleifen-Ebenen (innerste zuerst) und danach die eigentlichen Daten durchsucht.
+    Dabei wird nichts kopiert, sodass die Kosten eines Zugriffs nicht von der Anzahl der Keys in den Daten abhängen.
+    Schreibende Zugriffe gehen immer direkt an die eigentlichen Daten (letzte Ebene).
+    """
+
+    def __setitem__(self, key, value):
+        self.maps[-1][key] = value
+
+    def __delitem__(self, key):
+        del self.maps[-1][key]
+
+    def pop(self, key, *args):
+        return self.maps[-1].pop(key, *args)
+
 
 class StepData(object):
     """
@@ -17,6 +104,15 @@ class StepData(object):
     Die Daten werden in einem Dictionary gespeichert. Der Zugriff darauf erfolgt mit Strings, die Keys
     enthalten, welche durch ein `|` Symbol getrennt sind. Um diese umzuwandeln, werden die Funktionen
     aus dem Modul :py:mod:`step_pattern` verwendet.
+
+    Die Variablen der aktuell durchlaufenen Schleifen (`_loop`, `_idx` und `_key`) werden nicht in die Daten kopiert,
+    sondern als eigene Ebenen in einem :class:`DataScope` über die Daten gelegt.
+
+    Keys können Wildcards (`*`) enthalten, z.B. `_req|data|*|temp`. Diese werden von :func:`loop_key` aufgelöst.
+    Während des Durchlaufens werden die Wildcards in allen Keys durch die Keys des aktuellen Elements ersetzt.
+
+    Werden :func:`loop_array` bzw. :func:`loop_dict` schleifeninvariante Strings übergeben, werden diese während der
+    Schleife von :func:`get_data` und :func:`format` nur einmal ausgewertet.
     """
 
     def __init__(self, run_config, pipeline_id, job_id, presets: dict = None, data_prefix="$"):
@@ -26,9 +122,12 @@ class StepData(object):
             presets = {}
 
         self.__data = {"_conf": run_config, "_pipe_id": pipeline_id, "_job_id": job_id}
+        self.__scope = DataScope(self.__data)
         self.__formatter = StepPatternFormatter()
         self.__presets = presets
         self.__data_prefix = data_prefix
+        # (invariants, cache) of all loops that are currently running
+        self.__hoisted = []
 
     @staticmethod
     def get_api_key(api_key_name):
@@ -48,54 +147,158 @@ class StepData(object):
 
         return api_key
 
-    @staticmethod
-    def save_loop(idx, current, values: dict):
-        values["_loop_states"] = {**values.get("_loop_states", {}), **{"_idx": idx, "_loop": current}}
-        return idx, current
-
-    def save_loop_key(self, key, values: dict, ):
-        values["_loop_states"] = {**values.get("_loop_states", {}),
-                                  **{"_key": self.get_data(key, values)}}
-        return key
-
-    def loop_array(self, loop_root: list, values: dict):
+    def __push_frame(self, frame: dict):
+        # Newest frame is searched first
+        self.__scope.maps.insert(0, frame)
+
+    def __pop_frame(self, frame: dict):
+        for idx, value in enumerate(self.__scope.maps):
+            if value is frame:
+                del self.__scope.maps[idx]
+                return
+
+    def __loop(self, items, invariants):
+        frame = {}
+        self.__push_frame(frame)
+
+        hoisted = (invariants, {}) if invariants is not None and any(invariants) else None
+        if hoisted is not None:
+            self.__hoisted.append(hoisted)
+
+        try:
+            for idx, current in items:
+                frame["_idx"] = idx
+                frame["_loop"] = current
+                yield idx, current
+        finally:
+            self.__pop_frame(frame)
+
+            if hoisted is not None:
+                self.__hoisted = [value for value in self.__hoisted if value is not hoisted]
+
+    def __hoisted_cache(self, kind, key):
+        for invariants, cache in self.__hoisted:
+            if key in getattr(invariants, kind):
+                return cache
+
+        return None
+
+    def __cached(self, kind, key, func):
+        cache = self.__hoisted_cache(kind, key) if self.__hoisted and isinstance(key, str) else None
+        if cache is None:
+            return func(key)
+
+        cache_key = (kind, key)
+        if cache_key not in cache:
+            # Errors are not cached, they are raised again on the next access
+            cache[cache_key] = func(key)
+
+        return cache[cache_key]
+
+    def __loop_key(self, keys: list, expand_wildcards: bool):
+        frame = {}
+        self.__push_frame(frame)
+
+        try:
+            for idx, key in enumerate(keys):
+                if not expand_wildcards or not isinstance(key, str) or WILDCARD not in key:
+                    frame["_key"] = self.get_data(key)
+                    yield idx, key
+                    continue
+
+                key_path = compile_key_path(self.format(key))
+                for indices, value in key_path.matches(self.__scope):
+                    bound_key = BoundKey(key_path.bind(indices))
+
+                    # Bind the wildcards of all other keys (e.g. new_keys) to the current element
+                    frame["_wildcards"] = (indices, key_path.raw, bound_key)
+                    frame["_key"] = value
+                    yield idx, bound_key
+
+                frame.pop("_wildcards", None)
+        finally:
+            self.__pop_frame(frame)
+
+    def __bind_wildcards(self, key):
+        if not isinstance(key, str) or WILDCARD not in key:
+            return key
+
+        wildcards = self.get_loop_state("_wildcards")
+        if wildcards is None:
+            return key
+
+        indices, loop_key, bound_key = wildcards
+        if key == loop_key:
+            # e.g. keys without new_keys
+            return bound_key
+
+        return BoundKey(compile_key_path(key).bind(indices))
+
+    def loop_array(self, loop_root: list, values: dict = None, invariants=None):
         """ Zum Durchlaufen eines Arrays.
 
         Setzt bei jedem Durchlauf die Variablen `_loop` und `_idx`.
         `_loop` entspricht dem aktuellen Wert und `_idx` dem aktuellen Index.
+        Die Variablen sind nur während des Durchlaufens gültig.
 
         :param loop_root: Array, das durchlaufen werden soll.
         :param values: Werte aus der JSON-Datei
+        :param invariants: Keys und Format-Strings, die sich während der Schleife nicht ändern
+            (siehe :func:`loop_invariants`).
         :return: Iterator über das Array, welcher Seiteneffekte besitzt, mit (idx, value).
-        :rtype: map
+        :rtype: generator
         """
-        return map(lambda value: self.save_loop(value[0], value[1], values), enumerate(loop_root))
+        return self.__loop(enumerate(loop_root), invariants)
 
-    def loop_dict(self, loop_root: dict, values: dict):
+    def loop_dict(self, loop_root: dict, values: dict = None, invariants=None):
         """ Zum Durchlaufen eines Dictionaries.
 
         Setzt bei jedem Durchlauf die Variablen `_loop` und `_idx`.
         `_loop` entspricht dem aktuellen wert und `_idx` dem aktuelle Dictionary-Key.
+        Die Variablen sind nur während des Durchlaufens gültig.
 
         :param loop_root: Dictionary, das durchlaufen werden soll.
         :param values: Werte aus der JSON-Datei
+        :param invariants: Keys und Format-Strings, die sich während der Schleife nicht ändern
+            (siehe :func:`loop_invariants`).
         :return: Iterator über das Dictionary, welcher Seiteneffekte besitzt, mit (idx, value).
-        :rtype: map
+        :rtype: generator
         """
-        return map(lambda value: self.save_loop(value[0], value[1], values), loop_root.items())
+        return self.__loop(loop_root.items(), invariants)
 
-    def loop_key(self, keys: list, values: dict):
+    def loop_key(self, keys: list, values: dict = None, expand_wildcards=True):
         """ Zum durchlaufen eines Key-Arrays.
 
         Setzt bei jedem Durchlauf die Variable `_key`.
         `_key` entspricht dem aktuellen Wert des Arrays.
 
+        Enthält ein Key Wildcards (`*`), wird der Key für jedes passende Element einzeln zurückgegeben
+        (z.B. `_req|data|0|temp`, `_req|data|1|temp`, ...). `idx` bleibt dabei der Index des Keys in `keys`.
+        Während des Durchlaufens werden Wildcards in anderen Keys (z.B. in `new_keys`) durch die Keys
+        des aktuellen Elements ersetzt.
+
         :param keys: Array mit Keys (Strings)
         :param values: Werte aus der JSON-Datei
+        :param expand_wildcards: Wenn `False`, werden Keys mit Wildcards nicht aufgelöst, sondern
+            :func:`get_data` gibt eine Liste mit allen passenden Werten zurück.
         :return: Iterator über das Dictionary, welcher Seiteneffekte besitzt, mit (idx, key).
-        :rtype: map
+        :rtype: generator
         """
-        return map(lambda value: (value[0], self.save_loop_key(value[1], values)), enumerate(keys))
+        return self.__loop_key(keys, expand_wildcards)
+
+    def get_loop_state(self, name: str, default_value=None):
+        """
+        Gibt den Wert einer Schleifenvariable (`_loop`, `_idx` oder `_key`) der innersten Schleife zurück,
+        in der diese gesetzt ist.
+
+        :param name: Name der Schleifenvariable.
+        :param default_value: Wert, der zurückgegeben wird, wenn die Variable nicht gesetzt ist.
+        """
+        for frame in self.__scope.maps[:-1]:
+            if name in frame:
+                return frame[name]
+
+        return default_value
 
     def get_config(self, key, default_value=None):
         """
@@ -159,13 +362,36 @@ class StepData(object):
             if isinstance(key, return_on_type):
                 return key
 
-        if values is None:
-            values = {}
+        if key.__class__ is BoundKey:
+            # Keys from loop_key are already formatted and bound
+            return data_get_pattern(key, self.__scope)
+
+        return self.__cached("keys", key, self.__get_data)
+
+    def __get_data(self, key):
+        key = self.__bind_wildcards(self.__formatter.format(key, self.__scope))
 
-        data = {**self.__data, **values.get("_loop_states", {})}
-        key = self.__formatter.format(key, data)
+        return data_get_pattern(key, self.__scope)
 
-        return data_get_pattern(key, data)
+    def has_data(self, key, values: dict = None):
+        """
+        Prüft, ob unter `key` Daten vorhanden sind.
+
+        Im Gegensatz zu :func:`get_data` wird dabei kein Fehler geworfen, wenn die Daten nicht vorhanden sind.
+
+        :param key: Pfad zu den Daten in self.data.
+            Besteht aus den keys zu den Daten, getrennt mit | (Pipe) Symbolen.
+        :param values: Werte aus der JSON-Datei.
+        :return: `True`, wenn Daten unter `key` vorhanden sind, sonst `False`.
+        """
+        try:
+            if isinstance(key, str):
+                key = self.__bind_wildcards(self.__formatter.format(key, self.__scope))
+        except StepKeyError:
+            # Key references data that does not exist
+            return False
+
+        return data_exists_pattern(key, self.__scope)
 
     def format_api(self, value_string: str, api_key_name, values: dict):
         """
@@ -181,13 +407,13 @@ class StepData(object):
         """
         if api_key_name is not None:
             api_key_name = self.format(api_key_name, values)
-            data = {**self.__data, **values.get("_loop_states", {}), "_api_key": self.get_api_key(api_key_name)}
+            data = self.__scope.new_child({"_api_key": self.get_api_key(api_key_name)})
         else:
-            data = {**self.__data, **values.get("_loop_states", {})}
+            data = self.__scope
 
         return self.__formatter.format(value_string, data)
 
-    def deep_format(self, config, api_key_name=None, values: dict = None):
+    def deep_format(self, config, api_key_name=None, values: dict = None, copy_constants=False):
         """
         Ersetzt in allen Strings alle Werte, die in `{}` stehen, durch den Wert, den man aus :func:`get_data` bekommt.
 
@@ -195,28 +421,45 @@ class StepData(object):
         Hierzu wird die Funktion :func:`format_api` verwendet. Beginnt ein string mit einem $ Symbol,
         wird der restliche String als key interpretiert, hierfür wird :func:`get_data` verwendet.
 
+        Dictionaries und Arrays ohne Platzhalter und ohne $ Symbole werden nicht kopiert, sondern direkt
+        zurückgegeben (welche Teile das sind, wird pro Konfiguration nur einmal bestimmt). Die Konfiguration
+        selbst wird nie verändert.
+
         :param config: Konfigurations-Dict/Array/String/Num
         :param api_key_name: Name des API-Keys
         :param values: Werte aus der JSON-Datei
+        :param copy_constants: Wenn `True`, werden auch Dictionaries und Arrays ohne Platzhalter kopiert. Sollte
+            gesetzt werden, wenn das Ergebnis in den Daten gespeichert (und dort evtl. verändert) wird.
         :return: formatierter Input
         :raises: StepKeyError
         """
         if config is None or isinstance(config, (numbers.Number, bool)):
             return config
 
-        # Make copy to ensure that original config stays the same
-        config = copy(config)
-
         if values is None:
             values = {}
 
+        constant = _constant_nodes(config, self.__data_prefix) if isinstance(config, (dict, list)) else frozenset()
+
+        return self.__deep_format(config, api_key_name, values, constant, copy_constants)
+
+    def __deep_format(self, config, api_key_name, values: dict, constant: frozenset, copy_constants: bool):
+        if config is None or isinstance(config, (numbers.Number, bool)):
+            return config
+
+        if id(config) in constant:
+            return _copy_constant(config) if copy_constants else config
+
+        # Make copy to ensure that original config stays the same
+        config = copy(config)
+
         if isinstance(config, dict):
             for key in config:
-                config[key] = self.deep_format(config[key], api_key_name, values)
+                config[key] = self.__deep_format(config[key], api_key_name, values, constant, copy_constants)
             return config
         if isinstance(config, list):
             for idx, value in enumerate(config):
-                config[idx] = self.deep_format(value, api_key_name, values)
+                config[idx] = self.__deep_format(value, api_key_name, values, constant, copy_constants)
             return config
         if isinstance(config, str):
             if config.startswith(self.__data_prefix):
@@ -225,6 +468,8 @@ class StepData(object):
             # Remove escape char for $
             if config.startswith(f"~{self.__data_prefix}"):
                 config = config[1:]
+            elif "{" not in config and "}" not in config:
+                return config
 
             return self.format_api(config, api_key_name, values)
 
@@ -244,11 +489,16 @@ class StepData(object):
         if isinstance(value_string, numbers.Number):
             return value_string
 
-        if values is None:
-            values = {}
+        if isinstance(value_string, str):
+            if "{" in value_string:
+                return self.__cached("formats", value_string, self.__format)
+            if "}" not in value_string:
+                return value_string
 
-        data = {**self.__data, **values.get("_loop_states", {})}
-        return self.__formatter.format(value_string, data)
+        return self.__formatter.format(value_string, self.__scope)
+
+    def __format(self, value_string):
+        return self.__formatter.format(value_string, self.__scope)
 
     def insert_data(self, key_string: str, value, values: dict):
         """
@@ -262,9 +512,9 @@ class StepData(object):
         :param values: Werte aus der JSON-Datei
         :raises: StepKeyError
         """
-        key_string = self.__prepare_data_manipulation(key_string, values)
+        key_string = self.__bind_wildcards(self.format(key_string, values))
 
-        data_insert_pattern(key_string, self.__data, value)
+        data_insert_pattern(key_string, self.__scope, value)
 
         self.__clean_up_data_manipulation()
 
@@ -279,19 +529,14 @@ class StepData(object):
         :param values: Werte aus der JSON-Datei
         :raises: StepKeyError
         """
-        key_string = self.__prepare_data_manipulation(key_string, values)
+        key_string = self.__bind_wildcards(self.format(key_string, values))
 
-        data_remove_pattern(key_string, self.__data)
+        data_remove_pattern(key_string, self.__scope)
 
         self.__clean_up_data_manipulation()
 
-    def __prepare_data_manipulation(self, key_string: str, values: dict):
-        # Save loop values current into data to access them
-        self.__data = {**self.__data, **values.get("_loop_states", {})}
-        return self.format(key_string, values)
-
     def __clean_up_data_manipulation(self):
-        # Remove temporary used loop data
+        # Loop variables are only valid inside of a loop, remove them if they were written outside of a frame
         self.__data.pop("_loop", None)
         self.__data.pop("_key", None)
         self.__data.pop("_idx", None)
@@ -0,0 +1,170 @@
+"""
+Modul zum Kompilieren einer Steps-Konfiguration (`steps/<name>.json`) in einen wiederverwendbaren Ausführungsplan.
+"""
+import json
+import logging
+import os
+import threading
+from contextlib import suppress
+from copy import deepcopy
+
+from visuanalytics.analytics.util.step_pattern import compile_template
+from visuanalytics.util import resources
+from visuanalytics.util.dict_utils import merge_dict
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_PRESETS = "steps/global_presets.json"
+"""Pfad zu der Datei mit den globalen Presets, relativ zum `resources`-Ordner."""
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+class StepsPlan(object):
+    """Kompilierte Steps-Konfiguration eines Themas.
+
+    Presets sind bereits aufgelöst und alle Format-Strings vorkompiliert. Die Konfiguration wird von allen Pipelines
+    eines Themas geteilt und darf deshalb nicht verändert werden. Für jeden Durchlauf muss mit :func:`new_frame`
+    eine eigene Konfiguration erstellt werden.
+
+    :param config: Kompilierte Steps-Konfiguration.
+    :param mtimes: Änderungszeitpunkte der Dateien, aus denen der Plan erstellt wurde.
+    """
+    __slots__ = ("config", "mtimes")
+
+    def __init__(self, config: dict, mtimes: tuple):
+        self.config = config
+        self.mtimes = mtimes
+
+    @property
+    def presets(self):
+        """dict: Alle Presets (inklusive der globalen Presets)."""
+        return self.config.get("presets", {})
+
+    def new_frame(self):
+        """Erstellt die Konfiguration für einen Durchlauf.
+
+        Es werden nur die Teile kopiert, die während eines Durchlaufs ersetzt werden (Einträge der obersten Ebene,
+        die Bilder und die Audiodateien). Alle anderen Einträge werden mit dem Plan geteilt.
+
+        :return: Konfiguration für einen Durchlauf.
+        :rtype: dict
+        """
+        frame = dict(self.config)
+
+        if isinstance(frame.get("images", None), dict):
+            frame["images"] = dict(frame["images"])
+
+        audio = frame.get("audio", None)
+        if isinstance(audio, dict):
+            frame["audio"] = dict(audio)
+            if isinstance(audio.get("audios", None), dict):
+                frame["audio"]["audios"] = dict(audio["audios"])
+
+        return frame
+
+
+def _resolve_presets(values, presets: dict):
+    if isinstance(values, list):
+        for value in values:
+            _resolve_presets(value, presets)
+        return
+
+    if not isinstance(values, dict):
+        return
+
+    # Only type configurations merge presets (see register_type_func), unknown presets are left for the step to fail
+    if "type" in values and isinstance(values.get("preset", None), str) and values["preset"] in presets:
+        preset = deepcopy(presets[values.pop("preset")])
+        merge_dict(values, preset)
+        values.pop("preset", None)
+
+    for value in values.values():
+        _resolve_presets(value, presets)
+
+
+def _compile_templates(values):
+    if isinstance(values, str):
+        if "{" in values:
+            # Invalid templates raise their error when they are formatted
+            with suppress(ValueError):
+                compile_template(values, "|")
+    elif isinstance(values, dict):
+        for value in values.values():
+            _compile_templates(value)
+    elif isinstance(values, list):
+        for value in values:
+            _compile_templates(value)
+
+
+def compile_steps(config: dict, global_presets: dict = None):
+    """Kompiliert eine Steps-Konfiguration.
+
+    Die globalen Presets werden mit den Presets der Konfiguration zusammengeführt und in allen Typ-Konfigurationen
+    aufgelöst. Zusätzlich werden alle Format-Strings vorkompiliert (siehe :func:`compile_template`).
+
+    :param config: Steps-Konfiguration (wird verändert).
+    :param global_presets: Inhalt der Datei mit den globalen Presets.
+    :return: Kompilierte Steps-Konfiguration.
+    :rtype: dict
+    """
+    if global_presets is None:
+        global_presets = {}
+
+    presets = {**global_presets.get("presets", {}), **config.get("presets", {})}
+    config["presets"] = presets
+
+    for key, value in config.items():
+        if key != "presets":
+            _resolve_presets(value, presets)
+
+    _compile_templates(config)
+
+    return config
+
+
+def _get_mtimes(step_name: str):
+    return tuple(os.path.getmtime(resources.get_resource_path(path))
+                 for path in (f"steps/{step_name}.json", GLOBAL_PRESETS))
+
+
+def _load_plan(step_name: str, mtimes: tuple):
+    with resources.open_resource(f"steps/{step_name}.json") as fp:
+        config = json.loads(fp.read())
+
+    with resources.open_resource(GLOBAL_PRESETS) as fp:
+        global_presets = json.loads(fp.read())
+
+    logger.info(f"Compiled steps plan for '{step_name}'")
+
+    return StepsPlan(compile_steps(config, global_presets), mtimes)
+
+
+def get_plan(step_name: str):
+    """Gibt den Ausführungsplan zu einer Steps-Konfiguration zurück.
+
+    Der Plan wird pro Datei zwischengespeichert und nur neu kompiliert, wenn sich die Steps-Konfiguration oder die
+    globalen Presets geändert haben.
+
+    :param step_name: Name der Steps-Konfiguration (ohne `.json`).
+    :return: Ausführungsplan
+    :rtype: StepsPlan
+    :raises: OSError, json.JSONDecodeError
+    """
+    mtimes = _get_mtimes(step_name)
+
+    with _plans_lock:
+        plan = _plans.get(step_name, None)
+
+        if plan is None or plan.mtimes != mtimes:
+            plan = _load_plan(step_name, mtimes)
+            _plans[step_name] = plan
+
+        return plan
+
+
+def clear_plans():
+    """Entfernt alle zwischengespeicherten Ausführungspläne."""
+    with _plans_lock:
+        _plans.clear()
@@ -8,6 +8,7 @@ import numpy as np
 from wordcloud import WordCloud
 
 from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.util.stopwords import get_stopwords
 from visuanalytics.util import resources
 
 WORDCLOUD_DEFAULT_PARAMETER = {
@@ -126,18 +127,8 @@ def wordcloud(values: dict, step_data: StepData, prev_paths):
             wordcloud_parameter["mask"] = mask
 
     if values.get("use_stopwords", None) is not None:
-        try:
-            file = resources.get_resource_path("stopwords/stopwords.txt")
-            with open(file, "r", encoding='utf-8') as f:
-                list_stopwords = f.read().splitlines()
-        except IOError:
-            list_stopwords = []
-
         dont_use = step_data.get_data(values.get("stopwords", []), {}, list)
-        for each in list_stopwords:
-            if each not in dont_use:
-                dont_use.append(each)
-        wordcloud_parameter["stopwords"] = set(dont_use)
+        wordcloud_parameter["stopwords"] = set(dont_use) | get_stopwords()
     else:
         dont_use = step_data.get_data(values.get("stopwords", []), {}, list)
         wordcloud_parameter["stopwords"] = set(dont_use)
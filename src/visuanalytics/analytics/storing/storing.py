@@ -6,6 +6,7 @@ import copy
 import json
 
 from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.util.columnar import to_json
 from visuanalytics.analytics.util.step_errors import raise_step_error, StoringError, StepKeyError
 from visuanalytics.analytics.util.step_pattern import data_remove_pattern
 from visuanalytics.analytics.util.video_delete import delete_memory_files
@@ -36,7 +37,7 @@ def storing(values: dict, data: StepData):
                     pass
             with open(resources.new_memory_resource_path(data.get_config("job_name"), name),
                       'w') as fp:
-                json.dump(new_data, fp)
+                json.dump(new_data, fp, default=to_json)
             delete_memory_files(data.get_config("job_name"),
                                 value["name"], data.get_data(value.get("count", 10), values, int))
 
@@ -8,12 +8,72 @@ import operator
 import numpy as np
 
 from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.transform.util.expression import evaluate
 from visuanalytics.analytics.transform.util.key_utils import get_new_keys
+from visuanalytics.analytics.util.step_pattern import WILDCARD
 
 CALCULATE_ACTIONS = {}
 """Ein Dictionary bestehend aus allen Calculate-Actions-Methoden."""
 
 
+def _round(value, decimal=None):
+    # Python rounding is used for arrays as well to keep the results identical to single values
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+
+    if isinstance(value, list):
+        return [_round(v, decimal) for v in value]
+
+    return round(value) if decimal is None else round(value, decimal)
+
+
+def _arg_extreme(value, arg_func):
+    # Index of the min/max value if value is a numeric array, otherwise None
+    if not isinstance(value, list):
+        return None
+
+    array = np.asarray(value)
+    if array.ndim != 1 or array.dtype.kind not in "biuf":
+        return None
+
+    return int(arg_func(array))
+
+
+def _aggregate_key(values: dict, idx):
+    # mean, max, min and mode return one value for all values of a wildcard key, so it can not be stored per element
+    new_key = get_new_keys(values, idx)
+    if isinstance(new_key, str) and WILDCARD in new_key.split("|"):
+        raise ValueError(f"The result of '{values.get('action', None)}' can not be stored under a key with "
+                         f"wildcards ('{new_key}'), use new_keys without wildcards")
+
+    return new_key
+
+
+def _numeric_array(value):
+    # Arrays of numbers are calculated elementwise, ints as Python ints so they can not overflow
+    if isinstance(value, numbers.Number):
+        return value
+
+    if not isinstance(value, list) or not all(isinstance(v, numbers.Number) for v in value):
+        return None
+
+    if all(isinstance(v, numbers.Integral) for v in value):
+        return np.array(value, dtype=object)
+
+    return np.asarray(value, dtype=float)
+
+
+def _array_op(op, left, right):
+    left_array, right_array = _numeric_array(left), _numeric_array(right)
+
+    if left_array is None or right_array is None:
+        # Other arrays keep the Python semantics (e.g. + appends the arrays, * repeats them)
+        return op(left, right)
+
+    with np.errstate(divide="raise", invalid="raise"):
+        return op(left_array, right_array)
+
+
 def register_calculate(func):
     """Registriert die übergebene Funktion und versieht sie mit einem `"try/except"`-Block.
     Fügt eine Action-Funktion dem Dictionary CALCULATE_ACTIONS hinzu.
@@ -28,14 +88,15 @@ def register_calculate(func):
 @register_calculate
 def calculate_mean(values: dict, data: StepData):
     """Berechnet den Mittelwert von Werten, die in einem Array stehen.
+    Enthält ein Key Wildcards (z.B. `_req|data|*|temp`), werden alle passenden Werte verwendet.
 
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     :return:
     """
-    for idx, key in data.loop_key(values["keys"], values):
+    for idx, key in data.loop_key(values["keys"], values, expand_wildcards=False):
         value = data.get_data(key, values)
-        new_key = get_new_keys(values, idx)
+        new_key = _aggregate_key(values, idx)
         mean_value = float(np.mean(value))
         if values.get("decimal", None):
             new_value = round(mean_value, data.get_data(values["decimal"], values, numbers.Number))
@@ -47,65 +108,72 @@ def calculate_mean(values: dict, data: StepData):
 @register_calculate
 def calculate_max(values: dict, data: StepData):
     """Findet den Maximalwert von Werten, die in einem Array stehen.
+    Enthält ein Key Wildcards (z.B. `_req|data|*|temp`), werden alle passenden Werte verwendet.
 
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
-    for idx, key in data.loop_key(values["keys"], values):
+    for idx, key in data.loop_key(values["keys"], values, expand_wildcards=False):
         value = data.get_data(key, values)
-        new_key = get_new_keys(values, idx)
-        new_value = max(value)
+        new_key = _aggregate_key(values, idx)
+        pos = _arg_extreme(value, np.argmax)
+        new_value = max(value) if pos is None else value[pos]
         data.insert_data(new_key, new_value, values)
 
         if values.get("save_idx_to", None):
-            data.insert_data(values["save_idx_to"][idx], value.index(new_value), values)
+            data.insert_data(values["save_idx_to"][idx], value.index(new_value) if pos is None else pos, values)
 
 
 @register_calculate
 def calculate_min(values: dict, data: StepData):
     """Findet den Minimalwert von Werten, die in einem Array stehen.
+    Enthält ein Key Wildcards (z.B. `_req|data|*|temp`), werden alle passenden Werte verwendet.
 
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
-    for idx, key in data.loop_key(values["keys"], values):
+    for idx, key in data.loop_key(values["keys"], values, expand_wildcards=False):
         value = data.get_data(key, values)
-        new_key = get_new_keys(values, idx)
-        new_value = min(value)
+        new_key = _aggregate_key(values, idx)
+        pos = _arg_extreme(value, np.argmin)
+        new_value = min(value) if pos is None else value[pos]
         data.insert_data(new_key, new_value, values)
 
         if values.get("save_idx_to", None):
-            data.insert_data(values["save_idx_to"][idx], value.index(new_value), values)
+            data.insert_data(values["save_idx_to"][idx], value.index(new_value) if pos is None else pos, values)
 
 
 @register_calculate
 def calculate_round(values: dict, data: StepData):
     """Rundet gegebene Werte auf eine gewünschte Nachkommastelle.
 
+    Ist der Wert ein Array (oder enthält der Key Wildcards), werden alle Werte gerundet.
+
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
-    for idx, key in data.loop_key(values["keys"], values):
+    for idx, key in data.loop_key(values["keys"], values, expand_wildcards=False):
         value = data.get_data(key, values)
         new_key = get_new_keys(values, idx)
 
         if values.get("decimal", None):
-            new_value = round(value, data.get_data(values["decimal"], values, numbers.Number))
+            new_value = _round(value, data.get_data(values["decimal"], values, numbers.Number))
         else:
-            new_value = round(value)
+            new_value = _round(value)
         data.insert_data(new_key, new_value, values)
 
 
 @register_calculate
 def calculate_mode(values: dict, data: StepData):
     """Bestimmt den am häufigsten in einem Array vorkommenden Wert.
+    Enthält ein Key Wildcards (z.B. `_req|data|*|temp`), werden alle passenden Werte verwendet.
 
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
-    for idx, key in data.loop_key(values["keys"], values):
+    for idx, key in data.loop_key(values["keys"], values, expand_wildcards=False):
         value = data.get_data(key, values)
-        new_key = get_new_keys(values, idx)
+        new_key = _aggregate_key(values, idx)
         new_value = collections.Counter(value).most_common()[0][0]
         data.insert_data(new_key, new_value, values)
 
@@ -118,27 +186,32 @@ def _bi_calculate(values: dict, data: StepData, op):
     decimal = values.get("decimal", None)
 
     # TODO (max) May solve loop two key arrays better to support key, key1
-    for idx, key in data.loop_key(values["keys"], values):
+    for idx, key in data.loop_key(values["keys"], values, expand_wildcards=False):
         key = data.get_data(key, values)
         new_key = get_new_keys(values, idx)
 
         if keys_right is not None:
             # If keys_right is present use that key
-            right = data.get_data(keys_right[idx], values)
-            res = op(key, right)
+            left, right = key, data.get_data(keys_right[idx], values)
         elif value_right is not None:
             # If value_right is present use that value
-            right = data.get_data(value_right, values, numbers.Number)
-            res = op(key, right)
+            left, right = key, data.get_data(value_right, values, numbers.Number)
         else:
             # If value_left is present use that value
-            left = data.get_data(value_left, values, numbers.Number)
-            res = op(left, key)
+            left, right = data.get_data(value_left, values, numbers.Number), key
+
+        if isinstance(left, list) or isinstance(right, list):
+            # Calculate all values of arrays of numbers at once
+            res = _array_op(op, left, right)
+        else:
+            res = op(left, right)
 
         if decimal is not None:
             # If decimal is present round
             decimal = data.get_data(decimal, values, numbers.Number)
-            res = round(res, decimal)
+            res = _round(res, decimal)
+        elif isinstance(res, np.ndarray):
+            res = res.tolist()
 
         data.insert_data(new_key, res, values)
 
@@ -148,6 +221,8 @@ def calculate_multiply(values: dict, data: StepData):
     """Multipliziert gegebene Werte mit Werten, die in multiply_by stehen und rundet auf die gewünschte Nachkommastelle,
     die unter decimal angegeben wird.
 
+    Sind die Werte Arrays (oder enthalten die Keys Wildcards), werden alle Werte auf einmal berechnet.
+
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
@@ -159,6 +234,8 @@ def calculate_divide(values: dict, data: StepData):
     """Dividiert gegebene Werte durch Werte, die in divide_by stehen und rundet auf die gewünschte Nachkommastelle,
     die unter decimal angegeben wird.
 
+    Sind die Werte Arrays (oder enthalten die Keys Wildcards), werden alle Werte auf einmal berechnet.
+
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
@@ -169,6 +246,8 @@ def calculate_divide(values: dict, data: StepData):
 def calculate_subtract(values: dict, data: StepData):
     """Die jeweiligen Werte, die in subtract stehen, werden von den Werten, die in key stehen, subtrahiert.
 
+    Sind die Werte Arrays (oder enthalten die Keys Wildcards), werden alle Werte auf einmal berechnet.
+
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
@@ -179,7 +258,28 @@ def calculate_subtract(values: dict, data: StepData):
 def calculate_add(values: dict, data: StepData):
     """Die jeweiligen Werte, die in add stehen, werden zu den Werten, die in key stehen, hinzuaddiert.
 
+    Sind die Werte Arrays (oder enthalten die Keys Wildcards), werden alle Werte auf einmal berechnet.
+
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
     _bi_calculate(values, data, operator.add)
+
+
+@register_calculate
+def calculate_expression(values: dict, data: StepData):
+    """Berechnet einen Ausdruck (`expr`), z.B. `{_req|cases} * 100000 / {_req|population}`.
+
+    Erlaubt sind Rechenoperationen, Vergleiche und die Funktionen `min`, `max`, `round` und `abs`.
+    Werte in `{}` werden als Key-Pfade interpretiert. Ist einer der Werte ein Array (oder enthält der Key Wildcards),
+    wird der Ausdruck für alle Werte auf einmal berechnet.
+
+    :param values: Werte aus der JSON-Datei
+    :param data: Daten aus der API
+    """
+    new_value = evaluate(values["expr"], data, values)
+
+    if values.get("decimal", None) is not None:
+        new_value = _round(new_value, data.get_data(values["decimal"], values, numbers.Number))
+
+    data.insert_data(values["new_key"], new_value, values)
@@ -1,6 +1,8 @@
 """
 Modul mit Funktionen zur Berechnung und Umwandlung von Daten.
 """
+import heapq
+import logging
 import numbers
 import re
 from collections import Counter
@@ -10,17 +12,35 @@ from random import randint
 
 from visuanalytics.analytics.control.procedures.step_data import StepData
 from visuanalytics.analytics.transform.calculate import CALCULATE_ACTIONS
+from visuanalytics.analytics.transform.util import dates
+from visuanalytics.analytics.transform.util.dead_transforms import find_dead_transforms
+from visuanalytics.analytics.transform.util.expression import evaluate_elements
+from visuanalytics.analytics.transform.util.frequency_memory import update_frequency_memory
 from visuanalytics.analytics.transform.util.key_utils import get_new_keys, get_new_key
-from visuanalytics.analytics.util.step_errors import TransformError, \
-    raise_step_error, StepKeyError
-from visuanalytics.analytics.util.step_pattern import data_insert_pattern, data_get_pattern
+from visuanalytics.analytics.transform.util.loop_invariants import loop_invariants
+from visuanalytics.analytics.util.columnar import ColumnarRecords, to_columnar, sort_columnar
+from visuanalytics.analytics.util.step_errors import TransformError, raise_step_error
+from visuanalytics.analytics.util.step_pattern import compile_key_path, compile_projection
 from visuanalytics.analytics.util.step_utils import execute_type_option, execute_type_compare
+from visuanalytics.analytics.util.stopwords import get_stopwords
 from visuanalytics.analytics.util.type_utils import get_type_func, register_type_func
-from visuanalytics.util import resources
+
+logger = logging.getLogger(__name__)
 
 TRANSFORM_TYPES = {}
 """Ein Dictionary bestehend aus allen Transform-Typ-Methoden.  """
 
+GROUP_AGGREGATIONS = {
+    "sum": sum,
+    "mean": lambda group: sum(group) / len(group),
+    "min": min,
+    "max": max,
+    "count": len,
+    "first": lambda group: group[0],
+    "list": list
+}
+"""Ein Dictionary bestehend aus allen Aggregationen, die bei `group_by` verwendet werden können."""
+
 
 @raise_step_error(TransformError)
 def transform(values: dict, data: StepData):
@@ -31,13 +51,40 @@ def transform(values: dict, data: StepData):
     :return:
     """
     for transformation in values["transform"]:
-        transformation["_loop_states"] = values.get("_loop_states", {})
-
         trans_func = get_type_func(transformation, TRANSFORM_TYPES)
 
         trans_func(transformation, data)
 
 
+@raise_step_error(TransformError)
+def transform_all(values: dict, data: StepData):
+    """Führt alle transform-Typen eines Jobs aus (Step Transform).
+
+    transform-Typen, deren Ergebnis in keinem späteren Schritt verwendet wird (siehe :func:`find_dead_transforms`),
+    werden übersprungen. Das kann über den Konfigurationseintrag `skip_unused_transforms` deaktiviert werden.
+
+    :param values: Werte aus der JSON-Datei
+    :param data: Daten aus der API
+    :return: Liste mit den übersprungenen transform-Typen.
+    """
+    transformations = values.get("transform", [])
+    dead = []
+
+    if data.get_config("skip_unused_transforms", True):
+        dead = find_dead_transforms(values, data.data["_conf"])
+
+    if dead:
+        logger.info("Skipped unused transforms: " +
+                    ", ".join(f"{d['index']} ({d['type']} -> {', '.join(d['keys'])})" for d in dead))
+
+        skip = {d["index"] for d in dead}
+        transformations = [t for idx, t in enumerate(transformations) if idx not in skip]
+
+    transform({"transform": transformations}, data)
+
+    return dead
+
+
 def register_transform(func):
     """Registriert die übergebene Funktion und versieht sie mit einem `"try/except"`-Block.
     Fügt eine Typ-Funktion dem Dictionary TRANSFORM_TYPES hinzu.
@@ -48,6 +95,17 @@ def register_transform(func):
     return register_type_func(TRANSFORM_TYPES, TransformError, func)
 
 
+def register_transform_as(name: str):
+    """Registriert die übergebene Funktion wie :func:`register_transform`, aber unter dem Typ `name`.
+
+    Wird verwendet, wenn der Typ wie eine Built-in-Funktion heißt.
+
+    :param name: Name des Typs
+    :return: Decorator, der die Funktion registriert
+    """
+    return lambda func: register_type_func(TRANSFORM_TYPES, TransformError, func, name)
+
+
 @register_transform
 def transform_array(values: dict, data: StepData):
     """Führt alle angegebenen `"transform"`-Funktionen für alle Werte eines Arrays aus.
@@ -55,7 +113,9 @@ def transform_array(values: dict, data: StepData):
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
-    for _ in data.loop_array(data.get_data(values["array_key"], values), values):
+    loop_root = data.get_data(values["array_key"], values)
+
+    for _ in data.loop_array(loop_root, values, loop_invariants(values)):
         transform(values, data)
 
 
@@ -66,7 +126,9 @@ def transform_dict(values: dict, data: StepData):
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
-    for _ in data.loop_dict(data.get_data(values["dict_key"], values), values):
+    loop_root = data.get_data(values["dict_key"], values)
+
+    for _ in data.loop_dict(loop_root, values, loop_invariants(values)):
         transform(values, data)
 
 
@@ -86,26 +148,27 @@ def calculate(values: dict, data: StepData):
 def select(values: dict, data: StepData):
     """Entfernt alle Keys, die nicht in `"relevant_keys"` stehen aus dem Dictionary.
 
+    Die Keys werden mit :class:`Projection` in einem Durchlauf ausgewählt, die Werte selbst werden nicht kopiert.
+
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
-    root = values.get("_loop_states", {}).get("_loop", None)
+    projection = compile_projection(tuple(values["relevant_keys"]))
+    ignore_errors = values.get("ignore_errors", False) is not False
+    root = data.get_loop_state("_loop")
 
     if root is None:
         # If root is data root
-        old_root = dict(data.data)
+        selected = projection.apply(data.data, ignore_errors)
         data.clear_data()
-        root = data.data
+
+        # _conf, _pipe_id and _job_id are kept completely
+        for key, value in selected.items():
+            data.data.setdefault(key, value)
     else:
-        old_root = dict(root)
+        selected = projection.apply(root, ignore_errors)
         root.clear()
-
-    for key in values["relevant_keys"]:
-        try:
-            data_insert_pattern(key, root, data_get_pattern(key, old_root))
-        except:
-            if values.get("ignore_errors", False) is False:
-                raise
+        root.update(selected)
 
 
 @register_transform
@@ -149,15 +212,13 @@ def append(values: dict, data: StepData):
             new_key = values["new_keys"][0]
         new_key_format = data.format(values.get("append_type", "list"))
 
-        try:
-            result = data.get_data(new_key, values)
-        except StepKeyError:
+        if not data.has_data(new_key, values):
             if new_key_format == "string":
                 data.insert_data(new_key, "", values)
             else:
                 data.insert_data(new_key, [], values)
 
-            result = data.get_data(new_key, values)
+        result = data.get_data(new_key, values)
 
         if new_key_format == "string":
             result = result + data.format(values.get("delimiter", " ")) + value
@@ -270,27 +331,35 @@ def regex(values: dict, data: StepData):
         data.insert_data(new_key, new_value, values)
 
 
+def _convert_dates(values: dict, data: StepData, convert):
+    # Lists (e.g. from wildcards) are converted at once
+    for idx, key in data.loop_key(values["keys"], values, expand_wildcards=False):
+        value = data.get_data(key, values)
+        new_key = get_new_keys(values, idx)
+
+        if isinstance(value, list):
+            new_value = convert(value)
+        else:
+            new_value = convert([value])[0]
+        data.insert_data(new_key, new_value, values)
+
+
 @register_transform
 def date_format(values: dict, data: StepData):
     """Ändert das Format des Datums und der Uhrzeit.
 
     Ändert das Format des Datums und der Uhrzeit, welches unter `"given_format"` angegeben wird, in ein gewünschtes
-    anderes Format, welches unter `"format"` angegeben wird.
+    anderes Format, welches unter `"format"` angegeben wird. Ist der Wert ein Array, werden alle Werte umgewandelt.
 
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
-    for idx, key in data.loop_key(values["keys"], values):
-        value = data.get_data(key, values)
-        given_format = data.format(values["given_format"], values)
-        date = datetime.strptime(value, given_format).date()
-        new_key = get_new_keys(values, idx)
-        zeropaded_off = data.get_data(values.get("zeropaded_off", False), values, bool)
-        if zeropaded_off:
-            new_value = date.strftime(data.format(values["format"], values)).lstrip("0").replace(" 0", " ")
-        else:
-            new_value = date.strftime(data.format(values["format"], values))
-        data.insert_data(new_key, new_value, values)
+    given_format = data.format(values["given_format"], values)
+    date_format = data.format(values["format"], values)
+    zeropaded_off = data.get_data(values.get("zeropaded_off", False), values, bool)
+
+    _convert_dates(values, data, lambda v: dates.format_dates(dates.parse_dates(v, given_format), date_format,
+                                                              zeropaded_off))
 
 
 @register_transform
@@ -298,21 +367,15 @@ def timestamp(values: dict, data: StepData):
     """Wandelt einen UNIX-Zeitstempel in ein anderes Format um.
 
     Wandelt einen UNIX-Zeitstempel in ein anderes Format um, welches unter `"format"` angegeben wird. Ist zeropaded_off
-    true, so wird aus z.B. 05 eine 5.
+    true, so wird aus z.B. 05 eine 5. Ist der Wert ein Array, werden alle Werte umgewandelt.
 
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
-    for idx, key in data.loop_key(values["keys"], values):
-        value = data.get_data(key, values)
-        date = datetime.fromtimestamp(value)
-        new_key = get_new_keys(values, idx)
-        zeropaded_off = data.get_data(values.get("zeropaded_off", False), values, bool)
-        if zeropaded_off:
-            new_value = date.strftime(data.format(values["format"], values)).lstrip("0").replace(" 0", " ")
-        else:
-            new_value = date.strftime(data.format(values["format"], values))
-        data.insert_data(new_key, new_value, values)
+    date_format = data.format(values["format"], values)
+    zeropaded_off = data.get_data(values.get("zeropaded_off", False), values, bool)
+
+    _convert_dates(values, data, lambda v: dates.format_timestamps(v, date_format, zeropaded_off))
 
 
 @register_transform
@@ -320,27 +383,14 @@ def date_weekday(values: dict, data: StepData):
     """Wandelt das angegebene Datum in den jeweiligen Wochentag um.
 
     Wandelt das angegebene Datum, im unter `"given_format"` angegebenen Format, in den jeweiligen Wochentag um.
+    Ist der Wert ein Array, werden alle Werte umgewandelt.
 
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
-    day_weekday = {
-        0: "Montag",
-        1: "Dienstag",
-        2: "Mittwoch",
-        3: "Donnerstag",
-        4: "Freitag",
-        5: "Samstag",
-        6: "Sonntag"
-    }
-    for idx, key in data.loop_key(values["keys"], values):
-        value = data.get_data(values["keys"][idx], values)
-        given_format = data.format(values["given_format"], values)
-        date = datetime.strptime(value, given_format).date()
-        new_key = get_new_keys(values, idx)
+    given_format = data.format(values["given_format"], values)
 
-        new_value = day_weekday[date.weekday()]
-        data.insert_data(new_key, new_value, values)
+    _convert_dates(values, data, lambda v: dates.weekdays(v, given_format))
 
 
 @register_transform
@@ -393,7 +443,7 @@ def loop(values: dict, data: StepData):
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     """
-    loop_values = data.deep_format(values.get("values", None), values=values)
+    loop_values = data.deep_format(values.get("values", None), values=values, copy_constants=True)
 
     # if values is none use range
     if loop_values is None:
@@ -401,7 +451,7 @@ def loop(values: dict, data: StepData):
         stop = data.get_data(values["range_stop"], values, int)
         loop_values = range(start, stop)
 
-    for _ in data.loop_array(loop_values, values):
+    for _ in data.loop_array(loop_values, values, loop_invariants(values)):
         transform(values, data)
 
 
@@ -415,7 +465,7 @@ def add_data(values: dict, data: StepData):
     :param data: Daten aus der API
     """
     for new_key in values["new_keys"]:
-        value = data.deep_format(values["data"], values=values)
+        value = data.deep_format(values["data"], values=values, copy_constants=True)
         data.insert_data(new_key, value, values)
 
 
@@ -444,9 +494,7 @@ def option(values: dict, data: StepData):
      :param values: Werte aus der JSON-Datei
      :param data: Daten aus der API
      """
-    values["transform"] = execute_type_option(values, data)
-
-    transform(values, data)
+    transform({"transform": execute_type_option(values, data)}, data)
 
 
 @register_transform
@@ -462,9 +510,7 @@ def compare(values: dict, data: StepData):
     :param data: Daten aus der API
     :return:
     """
-    values["transform"] = execute_type_compare(values, data)
-
-    transform(values, data)
+    transform({"transform": execute_type_compare(values, data)}, data)
 
 
 @register_transform
@@ -510,6 +556,18 @@ def convert(values: dict, data: StepData):
         data.insert_data(new_key, value, values)
 
 
+def _get_limit(values: dict, data: StepData):
+    # Floats like 3.0 (e.g. from calculations) are accepted if they are whole numbers
+    limit = values.get("limit", None)
+    if limit is None:
+        return None
+
+    limit = data.get_data(limit, values, numbers.Number)
+    if limit != int(limit) or limit < 0:
+        raise ValueError(f"limit must be a non-negative integer, got '{limit}'")
+    return int(limit)
+
+
 @register_transform
 def sort(values: dict, data: StepData):
     """Sortiert Wörter nach dem Alphabet oder Zahlen aufsteigend.
@@ -520,16 +578,32 @@ def sort(values: dict, data: StepData):
     "USA" ist vor "United Kingdom", weil bei "USA" der zweite Buchstabe auch groß geschrieben ist.
     Würde dort "Usa" statt "USA" stehen, wäre "United Kingdom" vor "USA".
 
+    Mit `sort_key` können z.B. Dictionaries nach dem Wert unter diesem Key-Pfad sortiert werden.
+    Ist `limit` angegeben, werden nur die ersten `limit` Elemente bestimmt (ohne das ganze Array zu sortieren).
+    Spaltenweise gespeicherte Arrays (siehe `columnar`) werden direkt über die Spalte unter `sort_key` sortiert.
+
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     :return:
     """
+    sort_key = values.get("sort_key", None)
+    sort_key = compile_key_path(data.format(sort_key, values)) if sort_key is not None else None
+    key_func = sort_key.get if sort_key is not None else None
+
     for idx, key in data.loop_key(values["keys"], values):
         new_key = get_new_keys(values, idx)
         value = data.get_data(key, values)
         reverse = data.get_data(values.get("reverse", False), values, bool)
-
-        new_value = sorted(value, reverse=reverse)
+        limit = _get_limit(values, data)
+
+        if isinstance(value, ColumnarRecords) and sort_key is not None and len(sort_key.segments) == 1:
+            new_value = value.take(sort_columnar(value, sort_key.segments[0], reverse)[:limit])
+        elif limit is None:
+            new_value = sorted(value, key=key_func, reverse=reverse)
+        elif reverse:
+            new_value = heapq.nlargest(limit, value, key=key_func)
+        else:
+            new_value = heapq.nsmallest(limit, value, key=key_func)
 
         data.insert_data(new_key, new_value, values)
 
@@ -538,15 +612,19 @@ def sort(values: dict, data: StepData):
 def most_common(values: dict, data: StepData):
     """Sortiert die Wörter nach der Häufigkeit, optional mit Häufigkeit.
 
+    Ist `limit` angegeben, werden nur die `limit` häufigsten Wörter bestimmt.
+
     :param values: Werte aus der JSON-Datei
     :param data: Daten aus der API
     :return:
     """
+    limit = _get_limit(values, data)
+
     for idx, key in data.loop_key(values["keys"], values):
         value = data.get_data(key, values)
         new_key = get_new_keys(values, idx)
 
-        most_c_list = Counter(value).most_common()
+        most_c_list = Counter(value).most_common(limit)
 
         if data.get_data(values.get("include_count", False), values, bool):
             new_value = most_c_list
@@ -625,6 +703,17 @@ def length(values: dict, data: StepData):
         data.insert_data(new_key, len(value), values)
 
 
+def _get_words_to_remove(values: dict, data: StepData):
+    ignore_case = data.get_data(values.get("ignore_case", False), values, bool)
+    to_remove = data.get_data(values.get("to_remove", []), values, list)
+    to_remove = {r.lower() for r in to_remove} if ignore_case else set(to_remove)
+
+    if data.get_data(values.get("use_stopwords", False), values, bool):
+        to_remove |= get_stopwords(ignore_case)
+
+    return to_remove
+
+
 @register_transform
 def remove_from_list(values: dict, data: StepData):
     """Bekommt Stopwords und wandelt die jeweiligen Wörter so um, dass Groß- und Kleinschreibung unwichtig ist.
@@ -639,20 +728,9 @@ def remove_from_list(values: dict, data: StepData):
     for idx, key in data.loop_key(values["keys"], values):
         value = data.get_data(key, values)
         new_key = get_new_keys(values, idx)
-        to_remove = data.get_data(values.get("to_remove", []), values, list)
-
-        if data.get_data(values.get("use_stopwords", False), values, bool):
-            try:
-                file = resources.get_resource_path("stopwords/stopwords.txt")
-                with open(file, "r", encoding='utf-8') as f:
-                    list_stopwords = f.read().splitlines()
-
-                to_remove = to_remove + list_stopwords
-            except IOError:
-                pass
+        to_remove = _get_words_to_remove(values, data)
 
         if data.get_data(values.get("ignore_case", False), values, bool):
-            to_remove = [r.lower() for r in to_remove]
             new_value = [v for v in value if v.lower() not in to_remove]
         else:
             new_value = [v for v in value if v not in to_remove]
@@ -708,6 +786,21 @@ def capitalize(values: dict, data: StepData):
         data.insert_data(new_key, new_value, values)
 
 
+def _normalize_words(words):
+    already_there = set()
+
+    for each in words:
+        if each.upper() in already_there:
+            yield each.upper()
+        elif each.lower() in already_there:
+            yield each.lower()
+        elif each.capitalize() in already_there:
+            yield each.capitalize()
+        else:
+            already_there.add(each)
+            yield each
+
+
 @register_transform
 def normalize_words(values: dict, data: StepData):
     """Wörter, die öfter vorkommen und unterschiedliche cases besitzen, werden normalisiert.
@@ -723,18 +816,7 @@ def normalize_words(values: dict, data: StepData):
     for idx, key in data.loop_key(values["keys"], values):
         value = data.get_data(key, values)
         new_key = get_new_keys(values, idx)
-        already_there = []
-        new_value = []
-        for each in value:
-            if each.upper() in already_there:
-                new_value.append(each.upper())
-            elif each.lower() in already_there:
-                new_value.append(each.lower())
-            elif each.capitalize() in already_there:
-                new_value.append(each.capitalize())
-            else:
-                already_there.append(each)
-                new_value.append(each)
+        new_value = list(_normalize_words(value))
 
         data.insert_data(new_key, new_value, values)
 
@@ -770,14 +852,193 @@ def check_key(values: dict, data: StepData):
     :return:
     """
     for idx, key in enumerate(values["keys"]):
-        try:
-            data.get_data(key, values)
-            value = True
-        except StepKeyError:
-            if "init_with" in values:
-                init = data.deep_format(values["init_with"], values=values)
-                data.insert_data(key, init, values)
-
-            value = False
+        value = data.has_data(key, values)
+
+        if not value and "init_with" in values:
+            init = data.deep_format(values["init_with"], values=values, copy_constants=True)
+            data.insert_data(key, init, values)
+
         if "new_keys" in values:
             data.insert_data(values["new_keys"][idx], value, values)
+
+
+@register_transform
+def group_by(values: dict, data: StepData):
+    """Gruppiert die Elemente eines Arrays nach dem Wert unter `group_key` und berechnet für jede Gruppe
+    die angegebenen Aggregationen (siehe :data:`GROUP_AGGREGATIONS`).
+
+    Das Array wird dabei nur einmal durchlaufen. Die Gruppen werden in der Reihenfolge ihres ersten Auftretens
+    als Dictionary (Wert von `group_key` als Key) oder bei `as_list` als Array gespeichert.
+
+    :param values: Werte aus der JSON-Datei
+    :param data: Daten aus der API
+    :return:
+    """
+    array = data.get_data(values["array_key"], values)
+    group_key = compile_key_path(data.format(values["group_key"], values))
+
+    aggregations = []
+    for name, aggregation in values["aggregations"].items():
+        func = GROUP_AGGREGATIONS.get(aggregation["action"], None)
+        if func is None:
+            raise ValueError(f"Unknown aggregation '{aggregation['action']}'")
+
+        key = aggregation.get("key", None)
+        key = compile_key_path(data.format(key, values)) if key is not None else None
+        decimal = aggregation.get("decimal", None)
+        decimal = data.get_data(decimal, values, numbers.Number) if decimal is not None else None
+        aggregations.append((name, func, key, decimal))
+
+    groups = {}
+    for element in array:
+        group = groups.setdefault(group_key.get(element), [[] for _ in aggregations])
+
+        for (_, _, key, _), group_values in zip(aggregations, group):
+            group_values.append(element if key is None else key.get(element))
+
+    new_value = {}
+    for group, group_values in groups.items():
+        result = {}
+        for (name, func, _, decimal), agg_values in zip(aggregations, group_values):
+            result[name] = func(agg_values) if decimal is None else round(func(agg_values), decimal)
+        new_value[group] = result
+
+    if data.get_data(values.get("as_list", False), values, bool):
+        group_name = data.format(values.get("group_name", "group"), values)
+        new_value = [{group_name: group, **result} for group, result in new_value.items()]
+
+    data.insert_data(values["new_key"], new_value, values)
+
+
+@register_transform_as("filter")
+def filter_array(values: dict, data: StepData):
+    """Entfernt alle Elemente eines Arrays, für die die Bedingung unter `condition` nicht erfüllt ist.
+
+    Die Bedingung ist ein Ausdruck (siehe `expression`), in dem sich `_loop` auf das jeweilige Element bezieht,
+    z.B. `{_loop|cases} > 100 and {_loop|state} == 'NRW'`. Die Bedingung wird, wenn möglich, für alle Elemente
+    auf einmal berechnet. Ist `indices` auf `true` gesetzt, werden statt der Elemente deren Indizes gespeichert.
+
+    :param values: Werte aus der JSON-Datei
+    :param data: Daten aus der API
+    :return:
+    """
+    array = data.get_data(values["array_key"], values)
+    mask = evaluate_elements(values["condition"], array, data, values)
+
+    if data.get_data(values.get("indices", False), values, bool):
+        new_value = [idx for idx, keep in enumerate(mask) if keep]
+    elif isinstance(array, ColumnarRecords):
+        new_value = array.take([idx for idx, keep in enumerate(mask) if keep])
+    else:
+        new_value = [element for element, keep in zip(array, mask) if keep]
+
+    data.insert_data(values.get("new_key", values["array_key"]), new_value, values)
+
+
+@register_transform
+def text_pipeline(values: dict, data: StepData):
+    """Zerlegt einen Text in Wörter, entfernt Stopwords und zählt die Häufigkeit der Wörter in einem Durchlauf.
+
+    Fasst die Typen `split_string`, `lower_case`, `remove_from_list`, `normalize_words` und `most_common` zusammen,
+    ohne für jeden Schritt eine neue Liste zu erstellen. Der Wert unter `keys` kann ein String oder eine Liste mit
+    Wörtern sein. Das Ergebnis hat das gleiche Format wie bei `most_common` bzw. bei `to_dict` ein Dictionary,
+    welches direkt für eine Wordcloud (`dict`) verwendet werden kann.
+
+    :param values: Werte aus der JSON-Datei
+    :param data: Daten aus der API
+    :return:
+    """
+    for idx, key in data.loop_key(values["keys"], values):
+        value = data.get_data(key, values)
+        new_key = get_new_keys(values, idx)
+
+        if isinstance(value, str):
+            if "delimiter" in values:
+                value = re.split(data.format(values["delimiter"], values), value)
+            else:
+                value = value.split()
+
+        ignore_case = data.get_data(values.get("ignore_case", False), values, bool)
+        to_remove = _get_words_to_remove(values, data)
+
+        words = iter(value)
+
+        if data.get_data(values.get("lower_case", False), values, bool):
+            words = (word.lower() for word in words)
+
+        if ignore_case:
+            words = (word for word in words if word.lower() not in to_remove)
+        else:
+            words = (word for word in words if word not in to_remove)
+
+        if data.get_data(values.get("normalize_words", False), values, bool):
+            words = _normalize_words(words)
+
+        new_value = _frequencies_value(Counter(words), values, data)
+
+        data.insert_data(new_key, new_value, values)
+
+
+def _frequencies_value(counter: Counter, values: dict, data: StepData):
+    most_c_list = counter.most_common(_get_limit(values, data))
+
+    if data.get_data(values.get("to_dict", False), values, bool):
+        return dict(most_c_list)
+    if data.get_data(values.get("include_count", False), values, bool):
+        return most_c_list
+    return [elm[0] for elm in most_c_list]
+
+
+@register_transform
+def frequency_memory(values: dict, data: StepData):
+    """Zählt die Wörter der Elemente eines Arrays (z.B. Tweets) inkrementell über mehrere Durchläufe.
+
+    Die Häufigkeiten werden pro Job im Memory-Ordner gespeichert (siehe :class:`FrequencyMemory`). Bei jedem
+    Durchlauf werden nur Elemente gezählt, deren id (`id_key`) noch nicht bekannt ist. Elemente, die älter als
+    `hours` Stunden sind, werden wieder abgezogen. Die Stopwords werden erst bei der Ausgabe entfernt.
+    Das Ergebnis hat das gleiche Format wie bei `text_pipeline`.
+
+    :param values: Werte aus der JSON-Datei
+    :param data: Daten aus der API
+    :return:
+    """
+    array = data.get_data(values["array_key"], values)
+    id_key = compile_key_path(data.format(values["id_key"], values))
+    words_key = compile_key_path(data.format(values["words_key"], values))
+    window = data.get_data(values.get("hours", 24), values, numbers.Number) * 3600
+
+    items = []
+    for element in array:
+        words = words_key.get(element)
+        items.append((id_key.get(element), words.split() if isinstance(words, str) else words))
+
+    counts = update_frequency_memory(data.get_config("job_name"), data.format(values["name"], values), items, window)
+
+    to_remove = _get_words_to_remove(values, data)
+    if data.get_data(values.get("ignore_case", False), values, bool):
+        counts = Counter({word: count for word, count in counts.items() if word.lower() not in to_remove})
+    else:
+        counts = Counter({word: count for word, count in counts.items() if word not in to_remove})
+
+    data.insert_data(values["new_key"], _frequencies_value(counts, values, data), values)
+
+
+@register_transform
+def columnar(values: dict, data: StepData):
+    """Wandelt Arrays aus Dictionaries in eine spaltenweise Darstellung (:class:`ColumnarRecords`) um.
+
+    Auf die Daten kann danach weiterhin wie auf ein Array zugegriffen werden. Spalten aus Zahlen werden als NumPy-Array
+    gespeichert, wodurch weniger Speicher benötigt wird und z.B. `sort` (mit `sort_key`), `filter` und Keys mit
+    Wildcards (z.B. `_req|data|*|temp`) direkt auf den Spalten arbeiten. Werte, die keine Arrays aus Dictionaries sind,
+    bleiben unverändert.
+
+    :param values: Werte aus der JSON-Datei
+    :param data: Daten aus der API
+    :return:
+    """
+    for idx, key in data.loop_key(values["keys"], values):
+        value = data.get_data(key, values)
+        new_key = get_new_keys(values, idx)
+
+        new_value = to_columnar(value)
+        data.insert_data(new_key, value if new_value is None else new_value, values)
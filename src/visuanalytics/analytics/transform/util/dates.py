@@ -0,0 +1,101 @@
+"""
+Modul mit Funktionen zum Umwandeln von mehreren Datumsangaben bzw. Zeitstempeln auf einmal.
+
+Datumsangaben im ISO-Format (z.B. `%Y-%m-%d`) werden mit NumPy (`datetime64`) für alle Werte auf einmal eingelesen.
+Alle anderen Formate werden mit :func:`datetime.strptime` eingelesen.
+"""
+import re
+from datetime import datetime
+
+import numpy as np
+
+WEEKDAYS = ("Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag")
+"""Namen der Wochentage (Index wie bei :func:`datetime.weekday`)."""
+
+# Formats that can be parsed by NumPy, numpy is less strict than strptime so the values are checked first
+_NUMPY_FORMATS = {
+    "%Y-%m-%d": re.compile(r"\d{4}-\d{2}-\d{2}"),
+    "%Y-%m-%dT%H:%M": re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}"),
+    "%Y-%m-%d %H:%M": re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}"),
+    "%Y-%m-%dT%H:%M:%S": re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}"),
+    "%Y-%m-%d %H:%M:%S": re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}"),
+}
+
+
+def _to_datetime64(values: list, given_format: str):
+    regex = _NUMPY_FORMATS.get(given_format, None)
+    if regex is None or not all(isinstance(v, str) and regex.fullmatch(v) for v in values):
+        return None
+
+    try:
+        return np.array(values, dtype="datetime64[D]")
+    except ValueError:
+        # e.g. invalid dates, strptime raises the matching error
+        return None
+
+
+def parse_dates(values: list, given_format: str):
+    """Liest Datumsangaben ein.
+
+    :param values: Liste mit Datumsangaben als String.
+    :param given_format: Format der Datumsangaben (wie bei :func:`datetime.strptime`).
+    :return: Liste mit den Datumsangaben als :class:`datetime.date`.
+    :raises: ValueError
+    """
+    dates = _to_datetime64(values, given_format)
+    if dates is not None:
+        return dates.astype(object).tolist()
+
+    return [datetime.strptime(value, given_format).date() for value in values]
+
+
+def weekdays(values: list, given_format: str):
+    """Gibt die Namen der Wochentage von Datumsangaben zurück.
+
+    :param values: Liste mit Datumsangaben als String.
+    :param given_format: Format der Datumsangaben (wie bei :func:`datetime.strptime`).
+    :return: Liste mit den Namen der Wochentage.
+    :raises: ValueError
+    """
+    dates = _to_datetime64(values, given_format)
+    if dates is not None:
+        # 1970-01-01 was a Thursday
+        return [WEEKDAYS[day] for day in ((dates.astype("int64") + 3) % 7).tolist()]
+
+    return [WEEKDAYS[datetime.strptime(value, given_format).weekday()] for value in values]
+
+
+def format_dates(dates: list, date_format: str, zeropaded_off=False):
+    """Formatiert Datumsangaben.
+
+    Gleiche Datumsangaben werden nur einmal formatiert.
+
+    :param dates: Liste mit Datumsangaben (:class:`datetime.date` oder :class:`datetime.datetime`).
+    :param date_format: Format (wie bei :func:`datetime.strftime`).
+    :param zeropaded_off: Wenn `True`, werden führende Nullen entfernt (z.B. wird aus 05 eine 5).
+    :return: Liste mit den formatierten Datumsangaben.
+    """
+    formatted = {}
+
+    def _format(date):
+        value = formatted.get(date, None)
+        if value is None:
+            value = date.strftime(date_format)
+            if zeropaded_off:
+                value = value.lstrip("0").replace(" 0", " ")
+            formatted[date] = value
+        return value
+
+    return [_format(date) for date in dates]
+
+
+def format_timestamps(values: list, date_format: str, zeropaded_off=False):
+    """Formatiert UNIX-Zeitstempel (in lokaler Zeit).
+
+    :param values: Liste mit UNIX-Zeitstempeln.
+    :param date_format: Format (wie bei :func:`datetime.strftime`).
+    :param zeropaded_off: Wenn `True`, werden führende Nullen entfernt (z.B. wird aus 05 eine 5).
+    :return: Liste mit den formatierten Zeitstempeln.
+    """
+    # Local time depends on the daylight saving time of every single timestamp, so no NumPy here
+    return format_dates([datetime.fromtimestamp(value) for value in values], date_format, zeropaded_off)
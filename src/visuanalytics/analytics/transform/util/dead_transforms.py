@@ -0,0 +1,126 @@
+"""
+Modul zum Finden von transform-Typen, deren Ergebnis in keinem späteren Schritt verwendet wird.
+
+Die Analyse betrachtet nur die transform-Typen der obersten Ebene und geht diese von hinten nach vorne durch. Ein
+transform-Typ wird übersprungen, wenn er nur in die Keys unter :data:`TRANSFORM_WRITES` schreibt und keiner dieser
+Keys später gelesen wird (siehe :mod:`data_liveness`). Alle anderen transform-Typen werden immer ausgeführt, deren
+Strings zählen dabei als gelesene Key-Pfade.
+"""
+import threading
+from copy import deepcopy
+
+from visuanalytics.analytics.control.procedures.data_liveness import live_paths, collect_paths, is_live, \
+    is_below_path
+
+DOWNSTREAM_SECTIONS = ("storing", "presets", "images", "thumbnail", "audio", "sequence")
+"""Teile der Steps-Konfiguration, die nach dem Step Transform ausgewertet werden."""
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+_CACHE_SIZE = 256
+
+
+def _as_list(value):
+    if value is None:
+        return []
+
+    return value if isinstance(value, list) else [value]
+
+
+def _new_keys(values: dict):
+    # Same keys as get_new_keys and get_new_key
+    return _as_list(values.get("new_keys", None) or values.get("keys", None)) + \
+           _as_list(values.get("new_key", None) or values.get("key", None))
+
+
+def _calculate_keys(values: dict):
+    return _new_keys(values) + _as_list(values.get("save_idx_to", None))
+
+
+def _array_keys(values: dict):
+    return _as_list(values.get("new_key", None) or values.get("array_key", None))
+
+
+def _check_keys(values: dict):
+    return _as_list(values.get("keys", None)) + _as_list(values.get("new_keys", None))
+
+
+def _sub_list_keys(values: dict):
+    return [key for sub_list in values.get("sub_lists", []) for key in _new_keys(sub_list)]
+
+
+TRANSFORM_WRITES = {
+    **{name: _new_keys for name in (
+        "add_symbol", "replace", "seperator", "translate", "regex", "date_format", "timestamp", "date_weekday",
+        "date_now", "wind_direction", "add_data", "copy", "convert", "sort", "most_common", "to_dict", "join",
+        "length", "remove_from_list", "lower_case", "upper_case", "capitalize", "normalize_words", "split_string",
+        "text_pipeline", "columnar"
+    )},
+    "calculate": _calculate_keys,
+    "group_by": _array_keys,
+    "filter": _array_keys,
+    "check_key": _check_keys,
+    "sub_lists": _sub_list_keys
+}
+"""transform-Typen ohne Seiteneffekte mit einer Funktion, die die Keys zurückgibt, in die der Typ schreibt."""
+
+
+def find_dead_transforms(config: dict, run_config: dict, split_key="|"):
+    """Bestimmt die transform-Typen der obersten Ebene, deren Ergebnis nicht verwendet wird.
+
+    Schreibt ein transform-Typ in einen Key, der unter einem von einem anderen transform-Typ gelesenen Key liegt
+    (z.B. in `_req|data|0|temp`, wenn `_req|data` kopiert wird), wird er immer ausgeführt, da die Daten an mehreren
+    Stellen referenziert sein können.
+
+    Die Ergebnisse werden pro transform-Liste (diese wird mit dem Ausführungsplan geteilt, siehe :class:`StepsPlan`)
+    und Job-Konfiguration zwischengespeichert. Die Steps-Konfiguration darf deshalb nicht verändert werden.
+
+    :param config: Steps-Konfiguration des Jobs
+    :param run_config: Job-Konfiguration (`_conf`)
+    :param split_key: Trennzeichen zwischen den Keys.
+    :return: Liste mit einem Dictionary (`index`, `type` und `keys`) pro transform-Typ, der übersprungen werden kann.
+        Die Liste wird zwischengespeichert und darf nicht verändert werden.
+    """
+    transformations = config.get("transform", [])
+    cache_key = (id(transformations), split_key)
+
+    with _cache_lock:
+        cached = _cache.get(cache_key, None)
+        if cached is not None and cached[0] is transformations and cached[1] == run_config:
+            return cached[2]
+
+    dead = _find_dead_transforms(config, transformations, run_config, split_key)
+
+    with _cache_lock:
+        if len(_cache) >= _CACHE_SIZE:
+            _cache.clear()
+
+        # The transformations are stored as well, so their id can not be reused while they are cached
+        _cache[cache_key] = (transformations, deepcopy(run_config), dead)
+
+    return dead
+
+
+def _find_dead_transforms(config: dict, transformations: list, run_config: dict, split_key: str):
+    live = live_paths(config, run_config, DOWNSTREAM_SECTIONS, split_key)
+
+    # Data read by any transform may be shared with other keys
+    shared = {}
+    collect_paths(shared, transformations, split_key)
+
+    dead = []
+    for idx in reversed(range(len(transformations))):
+        transformation = transformations[idx]
+        get_keys = TRANSFORM_WRITES.get(transformation.get("type", None), None)
+        keys = get_keys(transformation) if get_keys is not None else None
+
+        if keys and all(isinstance(key, str) and not is_live(live, key, split_key) and
+                        not is_below_path(shared, key, split_key) for key in keys):
+            dead.append({"index": idx, "type": transformation["type"], "keys": keys})
+            continue
+
+        collect_paths(live, transformation, split_key)
+
+    dead.reverse()
+    return dead
@@ -0,0 +1,299 @@
+"""
+Modul zum Auswerten von einfachen Ausdrücken (z.B. `{_req|cases} * 100000 / {_req|population}`).
+
+Ausdrücke werden einmalig in einen eingeschränkten Python-AST übersetzt und geprüft. Erlaubt sind nur Zahlen,
+Strings, Rechenoperationen, Vergleiche, logische Verknüpfungen und die Funktionen `min`, `max`, `round` und `abs`.
+Bei Potenzen ganzer Zahlen darf das Ergebnis höchstens `MAX_POWER_BITS` Bits groß werden.
+Werte in `{}` werden als Key-Pfade interpretiert. Ist einer der Werte ein Array, wird der Ausdruck mit NumPy
+für alle Werte auf einmal berechnet.
+"""
+import ast
+import numbers
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.util.columnar import ColumnarRecords
+from visuanalytics.analytics.util.step_pattern import compile_key_path
+
+EXPRESSION_CACHE_SIZE = 1024
+"""Maximale Anzahl an kompilierten Ausdrücken, die zwischengespeichert werden."""
+
+MAX_POWER_BITS = 4096
+"""Maximale Größe (in Bits) des Ergebnisses einer Potenz von ganzen Zahlen."""
+
+_KEY_REGEX = re.compile(r"{([^{}]+)}")
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.BoolOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.USub, ast.UAdd, ast.Not,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.And, ast.Or
+)
+
+
+def _is_array(value):
+    return isinstance(value, np.ndarray)
+
+
+def _min(*args):
+    if len(args) == 1:
+        return np.min(args[0]) if _is_array(args[0]) else min(args[0])
+
+    if any(map(_is_array, args)):
+        return np.minimum.reduce(np.broadcast_arrays(*args))
+
+    return min(args)
+
+
+def _max(*args):
+    if len(args) == 1:
+        return np.max(args[0]) if _is_array(args[0]) else max(args[0])
+
+    if any(map(_is_array, args)):
+        return np.maximum.reduce(np.broadcast_arrays(*args))
+
+    return max(args)
+
+
+def _round(value, decimal=None):
+    if _is_array(value):
+        # Python rounding is used for arrays as well to keep the results identical to single values
+        return np.array([_round(v, decimal) for v in value.tolist()])
+
+    return round(value) if decimal is None else round(value, decimal)
+
+
+def _abs(value):
+    return np.abs(value) if _is_array(value) else abs(value)
+
+
+def _and(*values):
+    if any(map(_is_array, values)):
+        return np.logical_and.reduce(np.broadcast_arrays(*values))
+
+    result = values[0]
+    for value in values[1:]:
+        result = result and value
+    return result
+
+
+def _or(*values):
+    if any(map(_is_array, values)):
+        return np.logical_or.reduce(np.broadcast_arrays(*values))
+
+    result = values[0]
+    for value in values[1:]:
+        result = result or value
+    return result
+
+
+def _not(value):
+    return np.logical_not(value) if _is_array(value) else not value
+
+
+def _pow(base, exponent):
+    if any(_is_array(v) and v.dtype.kind == "O" for v in (base, exponent)):
+        # Arrays of Python ints can get arbitrarily large as well, check every element
+        return np.frompyfunc(_pow, 2, 1)(base, exponent)
+
+    if isinstance(base, numbers.Integral) and isinstance(exponent, numbers.Integral) and exponent > 1 \
+            and int(abs(base)).bit_length() * exponent > MAX_POWER_BITS:
+        raise ValueError(f"Result of the power with exponent {exponent} is too large")
+
+    return base ** exponent
+
+
+FUNCTIONS = {"min": _min, "max": _max, "round": _round, "abs": _abs}
+"""Funktionen, die in Ausdrücken verwendet werden können."""
+
+
+class _Rewriter(ast.NodeTransformer):
+    # Replaces and/or/not with functions so they also work with arrays
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        func = "_and" if isinstance(node.op, ast.And) else "_or"
+        return ast.copy_location(ast.Call(ast.Name(func, ast.Load()), node.values, []), node)
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            # Python ints do not overflow, so the size of the result has to be limited (e.g. 9 ** 9 ** 9)
+            return ast.copy_location(ast.Call(ast.Name("_pow", ast.Load()), [node.left, node.right], []), node)
+        return node
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.copy_location(ast.Call(ast.Name("_not", ast.Load()), [node.operand], []), node)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+
+        # a < b < c -> _and(a < b, b < c)
+        left = node.left
+        parts = []
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(ast.Compare(left, [op], [right]))
+            left = right
+        return ast.copy_location(ast.Call(ast.Name("_and", ast.Load()), parts, []), node)
+
+
+class Expression(object):
+    """Kompilierter Ausdruck.
+
+    Instanzen sollten über :func:`compile_expression` erzeugt werden, damit gleiche Ausdrücke nur einmal
+    kompiliert werden.
+
+    :param expr: Ausdruck, Werte in `{}` werden als Key-Pfade interpretiert.
+    :raises: ValueError
+    """
+    __slots__ = ("expr", "keys", "__code")
+
+    def __init__(self, expr: str):
+        self.expr = expr
+        self.keys = []
+
+        def replace_key(match):
+            self.keys.append(match.group(1))
+            return f" _v{len(self.keys) - 1} "
+
+        try:
+            tree = ast.parse(_KEY_REGEX.sub(replace_key, expr).strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression '{expr}': {e.msg}") from e
+
+        variables = {f"_v{idx}" for idx in range(len(self.keys))}
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise ValueError(f"Invalid expression '{expr}': '{type(node).__name__}' is not allowed")
+
+            if isinstance(node, ast.Name) and node.id not in variables and node.id not in FUNCTIONS:
+                raise ValueError(f"Invalid expression '{expr}': unknown name '{node.id}'")
+
+            if isinstance(node, ast.Call) and (not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS):
+                raise ValueError(f"Invalid expression '{expr}': only {', '.join(FUNCTIONS)} can be called")
+
+            if isinstance(node, ast.Call) and node.keywords:
+                raise ValueError(f"Invalid expression '{expr}': keyword arguments are not allowed")
+
+        tree = ast.fix_missing_locations(_Rewriter().visit(tree))
+        self.__code = compile(tree, "<expression>", "eval")
+
+    def __repr__(self):
+        return f"Expression({self.expr!r})"
+
+    def evaluate(self, values: list, vectorize=True):
+        """Wertet den Ausdruck aus.
+
+        :param values: Werte für die Key-Pfade (in der Reihenfolge von `keys`).
+        :param vectorize: Wenn `False`, werden Arrays nicht elementweise berechnet, sondern als Wert verwendet.
+        :return: Ergebnis des Ausdrucks. Ist einer der Werte ein Array, ist das Ergebnis eine Liste.
+        """
+        env = {
+            "_and": _and, "_or": _or, "_not": _not, "_pow": _pow, **FUNCTIONS,
+            **{f"_v{idx}": np.asarray(value) if vectorize and isinstance(value, list) else value
+               for idx, value in enumerate(values)}
+        }
+
+        with np.errstate(divide="raise", invalid="raise"):
+            result = eval(self.__code, {"__builtins__": {}}, env)
+
+        if isinstance(result, np.ndarray):
+            return result.tolist()
+        if isinstance(result, np.generic):
+            return result.item()
+        return result
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(expr: str):
+    """Gibt den kompilierten :class:`Expression` zu `expr` zurück.
+
+    :param expr: Ausdruck, Werte in `{}` werden als Key-Pfade interpretiert.
+    :return: Kompilierter Ausdruck
+    :rtype: Expression
+    :raises: ValueError
+    """
+    return Expression(expr)
+
+
+def evaluate(expr: str, data: StepData, values: dict):
+    """Wertet einen Ausdruck mit den Daten eines Jobs aus.
+
+    :param expr: Ausdruck, Werte in `{}` werden als Key-Pfade interpretiert.
+    :param data: Daten aus der API
+    :param values: Werte aus der JSON-Datei
+    :return: Ergebnis des Ausdrucks.
+    :raises: ValueError, StepKeyError
+    """
+    expression = compile_expression(expr)
+
+    return expression.evaluate([data.get_data(key, values) for key in expression.keys])
+
+
+def _column(values: list):
+    # Array with one value per element, mixed types must not be converted (e.g. numbers to strings)
+    array = np.asarray(values)
+
+    if array.ndim != 1 or (array.dtype.kind in "US" and not all(isinstance(v, str) for v in values)):
+        raise ValueError("Values can not be used as a column")
+
+    return array
+
+
+def _element_values(key_path, array):
+    if isinstance(array, ColumnarRecords) and len(key_path.segments) == 1:
+        try:
+            return array.column(key_path.segments[0])
+        except KeyError:
+            # Not every element has the key, raise the error for the first element without it
+            pass
+
+    return [key_path.get(element) for element in array]
+
+
+def evaluate_elements(expr: str, array: list, data: StepData, values: dict):
+    """Wertet einen Ausdruck für alle Elemente eines Arrays aus.
+
+    Keys, die mit `_loop` beginnen, beziehen sich (wie bei `transform_array`) auf das jeweilige Element.
+    Alle anderen Keys werden einmalig mit :func:`StepData.get_data` geladen. Die Werte der Elemente werden
+    spaltenweise zusammengefasst, sodass der Ausdruck mit NumPy für alle Elemente auf einmal berechnet wird.
+    Bei :class:`ColumnarRecords` werden die Spalten direkt verwendet.
+    Ist das nicht möglich, wird der Ausdruck für jedes Element einzeln ausgewertet.
+
+    :param expr: Ausdruck, Werte in `{}` werden als Key-Pfade interpretiert.
+    :param array: Array, für dessen Elemente der Ausdruck ausgewertet werden soll.
+    :param data: Daten aus der API
+    :param values: Werte aus der JSON-Datei
+    :return: Liste mit einem Ergebnis pro Element.
+    :raises: ValueError, StepKeyError
+    """
+    expression = compile_expression(expr)
+
+    columns = []
+    for key in expression.keys:
+        if key == "_loop":
+            columns.append((True, list(array)))
+        elif key.startswith("_loop|"):
+            key_path = compile_key_path(key[len("_loop|"):])
+            columns.append((True, _element_values(key_path, array)))
+        else:
+            columns.append((False, data.get_data(key, values)))
+
+    try:
+        result = expression.evaluate([_column(value) if per_element else value for per_element, value in columns])
+
+        if not isinstance(result, list) or len(result) != len(array):
+            raise ValueError("Expression could not be evaluated for all elements at once")
+
+        return result
+    except (ValueError, TypeError, ArithmeticError):
+        # Evaluate every element on its own (e.g. for nested or mixed values)
+        return [expression.evaluate([value[idx] if per_element else value for per_element, value in columns], False)
+                for idx in range(len(array))]
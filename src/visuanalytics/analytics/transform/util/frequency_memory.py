@@ -0,0 +1,113 @@
+"""
+Modul mit einem persistenten Speicher für Worthäufigkeiten, der über mehrere Durchläufe eines Jobs
+inkrementell aktualisiert wird.
+"""
+import json
+import os
+import time
+from collections import Counter
+
+from visuanalytics.util import resources
+
+FREQUENCY_MEMORY_FILE = "frequencies.json"
+"""Name der Datei, in der die Worthäufigkeiten im Memory-Ordner gespeichert werden."""
+
+
+class FrequencyMemory(object):
+    """Worthäufigkeiten einer Menge von Einträgen (z.B. Tweets) über ein gleitendes Zeitfenster.
+
+    Für jeden Eintrag werden (über seine id) die Häufigkeiten seiner Wörter und der Zeitpunkt gespeichert, an dem der
+    Eintrag zum ersten Mal hinzugefügt wurde. Die Gesamthäufigkeiten werden beim Hinzufügen bzw. Entfernen eines
+    Eintrags angepasst, sodass der Aufwand pro Durchlauf nur von der Anzahl der neuen und abgelaufenen Einträge
+    abhängt.
+
+    :param job_name: Name des Jobs
+    :param name: Name des Speichers (Unterordner im Memory-Ordner des Jobs).
+    """
+
+    def __init__(self, job_name: str, name: str):
+        self.__path = resources.get_memory_path(FREQUENCY_MEMORY_FILE, name, job_name)
+        self.items = {}
+        self.counts = Counter()
+
+    def load(self):
+        """Lädt den Speicher aus dem Memory-Ordner. Ist noch kein Speicher vorhanden, bleibt dieser leer."""
+        try:
+            with open(self.__path, "r", encoding="utf-8") as fp:
+                stored = json.load(fp)
+        except FileNotFoundError:
+            return
+
+        self.items = stored.get("items", {})
+        self.counts = Counter(stored.get("counts", {}))
+
+    def save(self):
+        """Speichert den Speicher im Memory-Ordner."""
+        os.makedirs(os.path.dirname(self.__path), exist_ok=True)
+
+        # Write to a temporary file first so an interrupted run can not corrupt the memory
+        tmp_path = f"{self.__path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fp:
+            json.dump({"items": self.items, "counts": self.counts}, fp)
+
+        os.replace(tmp_path, self.__path)
+
+    def add(self, item_id, words: list, timestamp: float):
+        """Fügt einen Eintrag hinzu. Ist der Eintrag bereits vorhanden, wird er nicht erneut gezählt.
+
+        :param item_id: id des Eintrags
+        :param words: Wörter des Eintrags
+        :param timestamp: Zeitpunkt, zu dem der Eintrag hinzugefügt wurde.
+        :return: `True`, wenn der Eintrag neu war, sonst `False`.
+        """
+        item_id = str(item_id)
+        if item_id in self.items:
+            return False
+
+        item_counts = Counter(words)
+        self.items[item_id] = {"time": timestamp, "words": item_counts}
+        self.counts.update(item_counts)
+        return True
+
+    def expire(self, oldest: float):
+        """Entfernt alle Einträge, die vor `oldest` hinzugefügt wurden, und zieht ihre Wörter von den Häufigkeiten ab.
+
+        :param oldest: Zeitpunkt, ab dem die Einträge behalten werden.
+        :return: Anzahl der entfernten Einträge.
+        """
+        expired = [item_id for item_id, item in self.items.items() if item["time"] < oldest]
+
+        for item_id in expired:
+            # subtract removes words that are no longer counted
+            self.counts.subtract(self.items.pop(item_id)["words"])
+
+        if expired:
+            self.counts = +self.counts
+
+        return len(expired)
+
+
+def update_frequency_memory(job_name: str, name: str, items: list, window: float, now: float = None):
+    """Aktualisiert den Speicher eines Jobs mit neuen Einträgen und entfernt abgelaufene Einträge.
+
+    :param job_name: Name des Jobs
+    :param name: Name des Speichers
+    :param items: Liste mit Tupeln aus id und Wörtern der aktuellen Einträge.
+    :param window: Länge des Zeitfensters in Sekunden.
+    :param now: Aktueller Zeitpunkt (Default: :func:`time.time`).
+    :return: Gesamthäufigkeiten aller Wörter im Zeitfenster.
+    :rtype: Counter
+    """
+    if now is None:
+        now = time.time()
+
+    memory = FrequencyMemory(job_name, name)
+    memory.load()
+    memory.expire(now - window)
+
+    for item_id, words in items:
+        memory.add(item_id, words, now)
+
+    memory.save()
+
+    return memory.counts
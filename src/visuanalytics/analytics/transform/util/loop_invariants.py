@@ -0,0 +1,213 @@
+"""
+Modul zum Bestimmen von Keys und Format-Strings, die sich während einer Schleife (`transform_array`,
+`transform_dict` und `loop`) nicht ändern.
+
+Ein String ist schleifeninvariant, wenn er weder die Schleifen-Variablen (`_loop`, `_idx`, `_key`) noch Wildcards
+verwendet und keiner der transform-Typen in der Schleife in einen der Key-Pfade schreibt, auf die der String
+verweist. Solche Strings werden von :class:`StepData` nur einmal pro Schleife ausgewertet.
+
+Da Arrays und Dictionaries (z.B. durch `copy`) unter mehreren Keys stehen können, gilt ein Key-Pfad, der nicht in
+:data:`CONSTANT_KEYS` liegt, nur dann als invariant, wenn die Schleife ausschließlich Keys der obersten Ebene schreibt.
+"""
+import threading
+from collections import namedtuple
+
+from visuanalytics.analytics.transform.util.dead_transforms import TRANSFORM_WRITES, _as_list
+from visuanalytics.analytics.util.step_pattern import WILDCARD, template_fields
+
+LOOP_VARIABLES = ("_loop", "_idx", "_key")
+"""Variablen, die sich bei jedem Schleifendurchlauf ändern."""
+
+CONSTANT_KEYS = ("_conf", "_pipe_id", "_job_id")
+"""Keys, deren Daten nicht unter anderen Keys referenziert werden."""
+
+LoopInvariants = namedtuple("LoopInvariants", ["keys", "formats"])
+"""Schleifeninvariante Strings: `keys` für :func:`StepData.get_data`, `formats` für :func:`StepData.format`."""
+
+LOOP_WRITES = {
+    **TRANSFORM_WRITES,
+    "delete": lambda values: _as_list(values.get("keys", None)),
+    "alias": lambda values: _as_list(values.get("keys", None)) + _as_list(values.get("new_keys", None)),
+    "select_range": lambda values: _as_list(values.get("array_key", None)),
+    "append": lambda values: _as_list(values.get("new_keys", None)),
+    "random_value": lambda values: _as_list(values.get("new_keys", None)),
+    "frequency_memory": lambda values: _as_list(values.get("new_key", None)),
+    # select replaces the current loop element (or the whole data)
+    "select": lambda values: ["_loop"]
+}
+"""transform-Typen mit einer Funktion, die die Keys zurückgibt, in die der Typ schreibt (ohne verschachtelte Typen)."""
+
+LOOP_TYPES = {"transform_array": "array_key", "transform_dict": "dict_key", "loop": None}
+"""transform-Typen, die eine Schleife durchlaufen, mit dem Key, unter dem das durchlaufene Array steht."""
+
+# Paths written by a transform whose keys can not be determined
+_UNKNOWN = object()
+
+_cache = {}
+_cache_lock = threading.Lock()
+_CACHE_SIZE = 1024
+
+
+def _segments(path: str):
+    # Keys up to the first key that is only known at runtime
+    segments = []
+    for key in path.split("|"):
+        if key == WILDCARD or "{" in key or "}" in key:
+            break
+        segments.append(key)
+    return segments
+
+
+def _loop_root(key, root):
+    if not isinstance(key, str) or "{" in key or WILDCARD in key:
+        return _UNKNOWN
+
+    if key == "_loop" or key.startswith("_loop|"):
+        return root
+
+    return key
+
+
+def _collect_writes(transformations, root, writes: list):
+    # root: path of the data behind _loop (None if the loop does not run over data)
+    for transformation in transformations if isinstance(transformations, list) else []:
+        if not isinstance(transformation, dict):
+            continue
+
+        trans_type = transformation.get("type", None)
+
+        if trans_type in LOOP_TYPES:
+            if trans_type == "loop":
+                # Values of a loop may reference data (e.g. "$_req|data")
+                child_root = None if transformation.get("values", None) is None else _UNKNOWN
+            else:
+                child_root = _loop_root(transformation.get(LOOP_TYPES[trans_type], None), root)
+
+            if not _collect_writes(transformation.get("transform", []), child_root, writes):
+                return False
+            continue
+
+        if trans_type in ("option", "compare"):
+            for key, value in transformation.items():
+                if key.startswith("on_") and not _collect_writes(value, root, writes):
+                    return False
+            continue
+
+        get_keys = LOOP_WRITES.get(trans_type, None)
+        if get_keys is None:
+            return False
+
+        for key in get_keys(transformation):
+            if not isinstance(key, str) or "{" in key:
+                return False
+
+            if key == "_loop" or key.startswith("_loop|"):
+                if root is _UNKNOWN:
+                    return False
+                if root is not None:
+                    writes.append(_segments(root))
+            elif not key.startswith(LOOP_VARIABLES):
+                writes.append(_segments(key))
+
+    return True
+
+
+def _collect_strings(value, strings: set):
+    if isinstance(value, str):
+        strings.add(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_strings(item, strings)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_strings(item, strings)
+
+
+def _references(value: str, references: list, as_key: bool):
+    if "{" in value or "}" in value:
+        for field in template_fields(value):
+            _references(field, references, True)
+
+    if as_key:
+        references.append(value)
+
+
+def _overlaps(left: list, right: list):
+    length = min(len(left), len(right))
+    return left[:length] == right[:length]
+
+
+def _is_invariant(value: str, writes: list, nested_writes: bool, as_key: bool):
+    if WILDCARD in value:
+        return False
+
+    references = []
+    try:
+        _references(value, references, as_key)
+    except ValueError:
+        # Invalid format strings raise their error when they are formatted
+        return False
+
+    for reference in references:
+        first_key = reference.split("|", 1)[0]
+        if first_key in LOOP_VARIABLES:
+            return False
+
+        # Data written inside of an array or dictionary may be shared with the referenced data
+        if nested_writes and first_key not in CONSTANT_KEYS and "|" in reference:
+            return False
+
+        segments = _segments(reference)
+        if any(_overlaps(segments, write) for write in writes):
+            return False
+
+    return True
+
+
+def _find_invariants(values: dict, root):
+    writes = []
+    if not _collect_writes(values.get("transform", []), root, writes):
+        return LoopInvariants(frozenset(), frozenset())
+
+    strings = set()
+    _collect_strings(values.get("transform", []), strings)
+
+    nested_writes = any(len(write) != 1 for write in writes)
+
+    return LoopInvariants(
+        frozenset(s for s in strings if _is_invariant(s, writes, nested_writes, True)),
+        frozenset(s for s in strings if "{" in s and _is_invariant(s, writes, nested_writes, False))
+    )
+
+
+def loop_invariants(values: dict):
+    """Gibt die Strings (Keys und Format-Strings) aus den transform-Typen einer Schleife zurück, die sich während
+    der Schleife nicht ändern.
+
+    Die Ergebnisse werden pro Konfiguration zwischengespeichert.
+
+    :param values: Werte aus der JSON-Datei (Konfiguration von `transform_array`, `transform_dict` bzw. `loop`).
+    :return: Schleifeninvariante Keys und Format-Strings.
+    :rtype: LoopInvariants
+    """
+    with _cache_lock:
+        cached = _cache.get(id(values), None)
+        if cached is not None and cached[0] is values:
+            return cached[1]
+
+    key = LOOP_TYPES.get(values.get("type", None), None)
+    if values.get("type", None) == "loop":
+        root = None if values.get("values", None) is None else _UNKNOWN
+    else:
+        root = _loop_root(values.get(key, None), _UNKNOWN)
+
+    invariants = _find_invariants(values, root)
+
+    with _cache_lock:
+        if len(_cache) >= _CACHE_SIZE:
+            _cache.clear()
+
+        # The config is stored as well, so its id can not be reused while it is cached
+        _cache[id(values)] = (values, invariants)
+
+    return invariants
@@ -0,0 +1,266 @@
+"""
+Modul mit einer spaltenweisen Darstellung für Arrays aus Dictionaries (z.B. `[{"temp": 12, "day": "Mo"}, ...]`).
+
+Die Werte eines Keys werden in einer Spalte gespeichert. Spalten, die nur aus `int`-, `float`- oder `bool`-Werten
+bestehen, werden als NumPy-Array gespeichert, alle anderen als Liste. Über :class:`ColumnarRecords` kann weiterhin
+wie auf eine Liste aus Dictionaries zugegriffen werden (z.B. `_req|data|3|max_temp`).
+"""
+from collections.abc import Sequence, MutableMapping
+from copy import deepcopy
+
+import numpy as np
+
+_MISSING = object()
+
+_NUMPY_TYPES = {int: np.int64, float: np.float64, bool: np.bool_}
+_KIND_TYPES = {"i": int, "f": float, "b": bool}
+
+
+def _to_column(values: list):
+    value_type = type(values[0]) if values else None
+
+    if value_type in _NUMPY_TYPES and all(type(v) is value_type for v in values):
+        try:
+            return np.array(values, dtype=_NUMPY_TYPES[value_type])
+        except OverflowError:
+            pass
+
+    return list(values)
+
+
+class Record(MutableMapping):
+    """Sicht auf ein Element von :class:`ColumnarRecords`, verhält sich wie ein Dictionary.
+
+    Änderungen werden direkt in die Spalten geschrieben.
+    """
+    __slots__ = ("__records", "__idx")
+
+    def __init__(self, records, idx: int):
+        self.__records = records
+        self.__idx = idx
+
+    def __getitem__(self, key):
+        value = self.__records.columns[key][self.__idx]
+
+        if value is _MISSING:
+            raise KeyError(key)
+
+        return value.item() if isinstance(value, np.generic) else value
+
+    def __setitem__(self, key, value):
+        self.__records.set_value(self.__idx, key, value)
+
+    def __delitem__(self, key):
+        self[key]
+        self.__records.set_value(self.__idx, key, _MISSING)
+
+    def __iter__(self):
+        for key, column in self.__records.columns.items():
+            if column[self.__idx] is not _MISSING:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def __deepcopy__(self, memo):
+        return deepcopy(dict(self), memo)
+
+
+class ColumnarRecords(Sequence):
+    """Array aus Dictionaries, das spaltenweise gespeichert wird.
+
+    Die Elemente sind :class:`Record`-Objekte, die sich wie Dictionaries verhalten. Instanzen sollten über
+    :func:`to_columnar` erzeugt werden.
+
+    :param columns: Dictionary mit den Spalten (NumPy-Arrays oder Listen gleicher Länge).
+    :param length: Anzahl der Elemente.
+    """
+
+    def __init__(self, columns: dict, length: int):
+        self.columns = columns
+        self.__length = length
+
+    def __len__(self):
+        return self.__length
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return self.take(range(*idx.indices(self.__length)))
+
+        if not isinstance(idx, int) or isinstance(idx, bool):
+            raise TypeError(f"indices must be integers or slices, not {type(idx).__name__}")
+
+        if idx < 0:
+            idx += self.__length
+
+        if not 0 <= idx < self.__length:
+            raise IndexError("index out of range")
+
+        return Record(self, idx)
+
+    def __eq__(self, other):
+        if isinstance(other, (ColumnarRecords, list)):
+            return self.to_records() == list(other)
+
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ColumnarRecords({self.to_records()!r})"
+
+    def __deepcopy__(self, memo):
+        return ColumnarRecords(deepcopy(self.columns, memo), self.__length)
+
+    def column(self, key):
+        """Gibt die Spalte zu `key` zurück.
+
+        :param key: Key der Spalte
+        :return: NumPy-Array oder Liste mit den Werten aller Elemente.
+        :raises: KeyError
+        """
+        column = self.columns[key]
+
+        if isinstance(column, list) and any(value is _MISSING for value in column):
+            raise KeyError(key)
+
+        return column
+
+    def column_values(self, key):
+        """Gibt die Werte einer Spalte als Liste zurück (wie bei `_req|data|*|key`).
+
+        :param key: Key der Spalte
+        :return: Liste mit den Werten aller Elemente.
+        :raises: KeyError
+        """
+        column = self.column(key)
+
+        return column.tolist() if isinstance(column, np.ndarray) else list(column)
+
+    def set_value(self, idx: int, key, value):
+        """Setzt den Wert eines Elements. Passt der Wert nicht zum Typ der Spalte, wird die Spalte zu einer Liste.
+
+        :param idx: Index des Elements
+        :param key: Key der Spalte
+        :param value: Neuer Wert
+        """
+        if isinstance(value, np.generic):
+            value = value.item()
+
+        column = self.columns.get(key, None)
+
+        if column is None:
+            column = self.columns[key] = [_MISSING] * self.__length
+
+        if isinstance(column, np.ndarray):
+            if type(value) is _KIND_TYPES[column.dtype.kind]:
+                try:
+                    column[idx] = value
+                    return
+                except OverflowError:
+                    pass
+
+            column = self.columns[key] = column.tolist()
+
+        column[idx] = value
+
+    def set_column(self, key, values: list):
+        """Setzt die Werte einer Spalte für alle Elemente.
+
+        :param key: Key der Spalte
+        :param values: Liste mit einem Wert pro Element.
+        :raises: ValueError
+        """
+        if len(values) != self.__length:
+            raise ValueError(f"Expected {self.__length} values for column {key}")
+
+        self.columns[key] = _to_column(values)
+
+    def take(self, indices):
+        """Gibt ein neues :class:`ColumnarRecords` mit den Elementen an den angegebenen Indizes zurück.
+
+        :param indices: Indizes der Elemente (in der gewünschten Reihenfolge).
+        :rtype: ColumnarRecords
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        columns = {}
+
+        for key, column in self.columns.items():
+            if isinstance(column, np.ndarray):
+                columns[key] = column[indices]
+            else:
+                columns[key] = [column[idx] for idx in indices.tolist()]
+
+        return ColumnarRecords(columns, len(indices))
+
+    def to_records(self):
+        """Wandelt die Daten zurück in eine Liste aus Dictionaries.
+
+        :return: Liste aus Dictionaries
+        """
+        columns = [(key, column.tolist() if isinstance(column, np.ndarray) else column)
+                   for key, column in self.columns.items()]
+
+        return [{key: column[idx] for key, column in columns if column[idx] is not _MISSING}
+                for idx in range(self.__length)]
+
+
+def to_columnar(records):
+    """Wandelt eine Liste aus Dictionaries in :class:`ColumnarRecords` um.
+
+    :param records: Liste aus Dictionaries
+    :return: Die umgewandelten Daten oder `None`, wenn nicht alle Elemente Dictionaries sind.
+    :rtype: ColumnarRecords
+    """
+    if isinstance(records, ColumnarRecords):
+        return records
+
+    if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+        return None
+
+    keys = {}
+    for record in records:
+        keys.update(dict.fromkeys(record))
+
+    columns = {key: _to_column([record.get(key, _MISSING) for record in records]) for key in keys}
+
+    return ColumnarRecords(columns, len(records))
+
+
+def sort_columnar(records: ColumnarRecords, key, reverse=False):
+    """Gibt die Indizes der Elemente sortiert nach den Werten einer Spalte zurück.
+
+    Die Sortierung ist (wie :func:`sorted`) stabil, auch wenn `reverse` gesetzt ist.
+
+    :param records: Daten, die sortiert werden sollen.
+    :param key: Key der Spalte, nach der sortiert werden soll.
+    :param reverse: Wenn `True`, wird absteigend sortiert.
+    :return: Liste mit den Indizes.
+    :raises: KeyError, TypeError
+    """
+    column = records.column(key)
+
+    if isinstance(column, np.ndarray) and column.dtype.kind in "if":
+        # Negating keeps equal values in their original order
+        return np.argsort(-column if reverse else column, kind="stable").tolist()
+
+    return sorted(range(len(column)), key=column.__getitem__, reverse=reverse)
+
+
+def to_json(value):
+    """Kann als `default` bei :func:`json.dump` verwendet werden, um spaltenweise Daten zu speichern.
+
+    :param value: Wert, der nicht von :mod:`json` umgewandelt werden kann.
+    :raises: TypeError
+    """
+    if isinstance(value, ColumnarRecords):
+        return value.to_records()
+
+    if isinstance(value, Record):
+        return dict(value)
+
+    if isinstance(value, np.generic):
+        return value.item()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
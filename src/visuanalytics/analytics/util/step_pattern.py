@@ -1,14 +1,34 @@
 """
-
+Modul mit Funktionen für den Zugriff auf Daten über Key-Pfade (z.B. `_req|data|0|temp`).
 """
-import operator
-from functools import reduce
+import itertools
+from collections.abc import Mapping
+from functools import lru_cache
 from string import Formatter
 
+from visuanalytics.analytics.util.columnar import ColumnarRecords
 from visuanalytics.analytics.util.step_errors import StepKeyError
 
+KEY_PATH_CACHE_SIZE = 4096
+"""Maximale Anzahl an vorkompilierten Key-Pfaden, die zwischengespeichert werden."""
+
+TEMPLATE_CACHE_SIZE = 4096
+"""Maximale Anzahl an vorkompilierten Format-Strings, die zwischengespeichert werden."""
+
+PROJECTION_CACHE_SIZE = 1024
+"""Maximale Anzahl an vorkompilierten Projektionen, die zwischengespeichert werden."""
+
+WILDCARD = "*"
+"""Key, der in einem Key-Pfad für alle Elemente eines Arrays bzw. Dictionaries steht (z.B. `_req|data|*|temp`)."""
+
 
 class StepPatternFormatter(Formatter):
+    """Formatter, der die Werte in `{}` als Key-Pfade interpretiert.
+
+    Format-Strings werden beim ersten Aufruf mit :func:`compile_template` vorkompiliert. Strings ohne `{` und `}`
+    werden unverändert zurückgegeben.
+    """
+
     def __init__(self, split_key="|"):
         super().__init__()
         self.__split_key = split_key
@@ -16,6 +36,34 @@ class StepPatternFormatter(Formatter):
     def get_value(self, key, args, kwargs):
         return data_get_pattern(key, args[0], self.__split_key)
 
+    def vformat(self, format_string, args, kwargs):
+        if isinstance(format_string, str) and "{" not in format_string and "}" not in format_string:
+            return format_string
+
+        template = compile_template(format_string, self.__split_key) if isinstance(format_string, str) else None
+
+        if template is None:
+            return super().vformat(format_string, args, kwargs)
+
+        result = []
+        for part in template:
+            if part.__class__ is str:
+                result.append(part)
+                continue
+
+            try:
+                obj = part.key_path.get(args[0])
+            except BaseException as e:
+                raise StepKeyError("get_data", part.key_path.raw) from e
+
+            for is_attr, i in part.rest:
+                obj = getattr(obj, i) if is_attr else obj[i]
+
+            obj = self.convert_field(obj, part.conversion)
+            result.append(self.format_field(obj, part.format_spec))
+
+        return "".join(result)
+
 
 def _to_int(x):
     return int(x) if x.isnumeric() else x
@@ -23,46 +71,524 @@ def _to_int(x):
 
 def _get_or_create(d, k):
     # TODO (max) may handle to large array idx (add elm)
-    if not isinstance(d, list) and not operator.contains(d, k):
-        operator.setitem(d, k, {})
+    try:
+        return d[k]
+    except KeyError:
+        if isinstance(d, (list, ColumnarRecords)):
+            raise
+
+    d[k] = {}
+    return d[k]
+
+
+def _expand(data, segments, indices=()):
+    # Yields the indices chosen for the wildcards together with the data behind segments
+    for pos, key in enumerate(segments):
+        if key != WILDCARD:
+            data = data[key]
+            continue
+
+        items = enumerate(data) if isinstance(data, (list, ColumnarRecords)) else data.items()
+        for idx, value in list(items):
+            yield from _expand(value, segments[pos + 1:], indices + (idx,))
+        return
+
+    yield indices, data
+
+
+class KeyPath(object):
+    """Vorkompilierter Key-Pfad.
+
+    Der Pfad wird einmalig an `split_key` aufgeteilt und die einzelnen Keys werden in ihren Typ umgewandelt
+    (numerische Keys werden zu `int`). Instanzen sollten über :func:`compile_key_path` erzeugt werden,
+    damit gleiche Pfade nur einmal kompiliert werden.
+
+    Ein Key `*` (:data:`WILDCARD`) steht für alle Elemente eines Arrays bzw. Dictionaries. Mit :func:`bind` können
+    die Wildcards durch konkrete Keys ersetzt werden. Ungebundene Wildcards werden von :func:`get` zu einer Liste
+    aller passenden Werte aufgelöst, :func:`insert` verteilt eine Liste auf alle passenden Stellen und :func:`remove`
+    entfernt alle passenden Werte.
+
+    :param keys: Key-Pfad, bestehend aus den Keys getrennt durch `split_key`.
+    :param split_key: Trennzeichen zwischen den Keys.
+    """
+    __slots__ = ("raw", "segments", "wildcards", "__split_key", "__parent", "__last", "__column", "__positions")
+
+    def __init__(self, keys, split_key="|", segments: tuple = None):
+        self.raw = keys
+        self.__split_key = split_key
+
+        if segments is not None:
+            # Already split keys (see bind), dictionary keys keep their type
+            self.segments = segments
+        elif isinstance(keys, str):
+            self.segments = tuple(map(_to_int, keys.split(split_key)))
+        else:
+            self.segments = (keys,)
+
+        self.wildcards = self.segments.count(WILDCARD) if isinstance(keys, str) else 0
+        self.__positions = tuple(pos for pos, key in enumerate(self.segments) if key == WILDCARD) \
+            if self.wildcards else ()
+
+        # e.g. _req|data|*|temp, can be read and written at once for ColumnarRecords
+        self.__column = self.wildcards == 1 and len(self.segments) >= 2 and self.segments[-2] == WILDCARD
+
+        # insert and remove only split keys containing a pipe symbol
+        if isinstance(keys, str) and len(self.segments) > 1:
+            self.__parent = self.segments[:-1]
+            self.__last = self.segments[-1]
+        else:
+            self.__parent = ()
+            self.__last = keys
+
+    def __repr__(self):
+        return f"KeyPath({self.raw!r})"
+
+    def bind(self, indices: tuple):
+        """Ersetzt die ersten Wildcards des Key-Pfads durch die übergebenen Keys.
+
+        Der Key-Pfad wird nicht über :func:`compile_key_path` zwischengespeichert, da es für jedes Element einen
+        eigenen gebundenen Key-Pfad gibt.
+
+        :param indices: Keys, die für die Wildcards eingesetzt werden sollen (in der Reihenfolge der Wildcards).
+        :return: Key-Pfad mit den eingesetzten Keys.
+        :rtype: KeyPath
+        """
+        if not self.wildcards or not indices:
+            return self
+
+        segments = list(self.segments)
+        for pos, index in zip(self.__positions, indices):
+            segments[pos] = index
+        segments = tuple(segments)
+
+        return KeyPath(self.__split_key.join(map(str, segments)), self.__split_key, segments)
+
+    def expand(self, data):
+        """Gibt für alle Stellen, auf die der Key-Pfad passt, die Keys der Wildcards zurück.
+
+        :param data: Daten, in denen gesucht werden soll.
+        :return: Liste mit einem Tupel aus Keys pro passender Stelle.
+        :raises: KeyError, IndexError, TypeError
+        """
+        return [indices for indices, _ in _expand(data, self.segments)]
+
+    def matches(self, data):
+        """Durchläuft alle Stellen, auf die der Key-Pfad passt.
+
+        Die Daten werden dabei nur einmal durchlaufen, die Werte werden erst beim Erreichen der Stelle gelesen.
+
+        :param data: Daten, in denen gesucht werden soll.
+        :return: Generator mit den Keys der Wildcards und dem Wert pro passender Stelle.
+        :raises: KeyError, IndexError, TypeError
+        """
+        return _expand(data, self.segments)
+
+    def get(self, data):
+        """Gibt die Daten hinter dem Key-Pfad zurück.
+
+        Enthält der Key-Pfad Wildcards, wird eine Liste mit allen passenden Werten zurückgegeben.
+
+        :param data: Daten, in denen gesucht werden soll.
+        :raises: KeyError, IndexError, TypeError
+        """
+        if self.wildcards:
+            if self.__column:
+                records = self.__get_records(data)
+                if records is not None:
+                    return records.column_values(self.__last)
+
+            return [value for _, value in _expand(data, self.segments)]
+
+        for key in self.segments:
+            data = data[key]
+
+        return data
+
+    def exists(self, data):
+        """Prüft, ob unter dem Key-Pfad Daten vorhanden sind, ohne einen Fehler zu werfen.
+
+        :param data: Daten, in denen gesucht werden soll.
+        :return: `True`, wenn die Daten vorhanden sind, sonst `False`.
+        """
+        if self.wildcards:
+            try:
+                self.get(data)
+                return True
+            except (LookupError, TypeError, AttributeError):
+                return False
+
+        for key in self.segments:
+            if isinstance(data, Mapping):
+                if key not in data:
+                    return False
+                data = data[key]
+            else:
+                try:
+                    data = data[key]
+                except (LookupError, TypeError):
+                    return False
+
+        return True
+
+    def insert(self, data, value):
+        """Speichert `value` unter dem Key-Pfad. Fehlende Dictionaries werden dabei erstellt.
+
+        :param data: Daten, in die eingefügt werden soll.
+        :param value: Wert, der eingefügt werden soll.
+        :raises: KeyError, IndexError, TypeError
+        """
+        if self.wildcards:
+            self.__insert_all(data, value)
+            return
+
+        for key in self.__parent:
+            data = _get_or_create(data, key)
+
+        data[self.__last] = value
+
+    def __get_records(self, data):
+        for key in self.segments[:-2]:
+            data = data[key]
+
+        return data if isinstance(data, ColumnarRecords) else None
+
+    def __insert_all(self, data, values):
+        if self.__last == WILDCARD:
+            raise TypeError("The last key of a path to insert into can not be a wildcard")
+
+        if self.__column:
+            records = self.__get_records(data)
+            if records is not None:
+                if not isinstance(values, list) or len(values) != len(records):
+                    raise TypeError(f"Expected a list with {len(records)} values to insert for {self.raw}")
+
+                records.set_column(self.__last, values)
+                return
+
+        parents = [parent for _, parent in _expand(data, self.__parent)]
+
+        if not isinstance(values, list) or len(values) != len(parents):
+            raise TypeError(f"Expected a list with {len(parents)} values to insert for {self.raw}")
+
+        for parent, value in zip(parents, values):
+            parent[self.__last] = value
+
+    def remove(self, data):
+        """Entfernt die Daten unter dem Key-Pfad. Ist der letzte Key nicht vorhanden, wird das ignoriert.
+
+        :param data: Daten, aus denen entfernt werden soll.
+        :raises: KeyError, IndexError, TypeError
+        """
+        if self.wildcards:
+            if self.__last == WILDCARD:
+                raise TypeError("The last key of a path to remove can not be a wildcard")
+
+            for _, parent in _expand(data, self.__parent):
+                parent.pop(self.__last, None)
+            return
+
+        for key in self.__parent:
+            data = data[key]
+
+        data.pop(self.__last, None)
+
+
+class BoundKey(str):
+    """Key-Pfad (String) mit dem zugehörigen :class:`KeyPath`, dessen Wildcards bereits gebunden sind.
+
+    Wird von :func:`StepData.loop_key` für die einzelnen Elemente eines Keys mit Wildcards verwendet.
+    :func:`compile_key_path` gibt dafür direkt `key_path` zurück, ohne den Key-Pfad zwischenzuspeichern.
+
+    :param key_path: Gebundener Key-Pfad (siehe :func:`KeyPath.bind`).
+    """
 
-    return operator.getitem(d, k)
+    def __new__(cls, key_path: KeyPath):
+        key = super().__new__(cls, key_path.raw)
+        key.key_path = key_path
+        return key
+
+
+@lru_cache(maxsize=KEY_PATH_CACHE_SIZE)
+def _compile_key_path(keys, split_key):
+    return KeyPath(keys, split_key)
+
+
+def compile_key_path(keys, split_key="|"):
+    """Gibt den vorkompilierten :class:`KeyPath` zu `keys` zurück.
+
+    Die Ergebnisse werden zwischengespeichert, sodass gleiche Key-Pfade nur einmal aufgeteilt werden. Für einen
+    :class:`BoundKey` wird dessen Key-Pfad zurückgegeben.
+
+    :param keys: Key-Pfad, bestehend aus den Keys getrennt durch `split_key`.
+    :param split_key: Trennzeichen zwischen den Keys.
+    :return: Vorkompilierter Key-Pfad
+    :rtype: KeyPath
+    """
+    if keys.__class__ is BoundKey:
+        return keys.key_path
+
+    return _compile_key_path(keys, split_key)
+
+
+_MISSING = object()
+
+
+class _ProjectionNode(object):
+    __slots__ = ("key", "children", "whole")
+
+    def __init__(self, key):
+        # key: first key path running through this node (used for error messages)
+        self.key = key
+        self.children = {}
+        self.whole = False
+
+
+def _split_alternatives(keys, split_key):
+    # "data|*|{a,b}" -> ("data", "*", "a"), ("data", "*", "b")
+    if not isinstance(keys, str):
+        return [(keys,)]
+
+    options = []
+    for key in keys.split(split_key):
+        if len(key) > 2 and key[0] == "{" and key[-1] == "}":
+            options.append([_to_int(k.strip()) for k in key[1:-1].split(",")])
+        else:
+            options.append([_to_int(key)])
+
+    return itertools.product(*options)
+
+
+def _project(node, data, ignore_errors):
+    if node.whole:
+        return data
+
+    if WILDCARD in node.children:
+        child = node.children[WILDCARD]
+
+        if isinstance(data, (list, ColumnarRecords)):
+            result = [_project(child, value, ignore_errors) for value in data]
+            return [{} if value is _MISSING else value for value in result]
+
+        try:
+            items = data.items()
+        except AttributeError as e:
+            if ignore_errors:
+                return _MISSING
+            raise StepKeyError("get_data", child.key) from e
+
+        result = {key: _project(child, value, ignore_errors) for key, value in items}
+        return {key: {} if value is _MISSING else value for key, value in result.items()}
+
+    result = {}
+    for key, child in node.children.items():
+        try:
+            value = data[key]
+        except (LookupError, TypeError) as e:
+            if ignore_errors:
+                continue
+            raise StepKeyError("get_data", child.key) from e
+
+        value = _project(child, value, ignore_errors)
+        if value is not _MISSING:
+            result[key] = value
+
+    # Only happens if all keys below this node are missing
+    return result if result else _MISSING
+
+
+class Projection(object):
+    """Vorkompilierte Auswahl mehrerer Key-Pfade (z.B. für den transform-Typ `select`).
+
+    Die Key-Pfade werden einmalig in einen Baum (Trie) übersetzt. Mit :func:`apply` wird daraus in einem Durchlauf ein
+    neues Dictionary erstellt, das nur die ausgewählten Keys enthält. Die Werte unter den Key-Pfaden werden nicht
+    kopiert, sondern übernommen. Fehlende Dictionaries auf dem Weg werden (wie bei :func:`KeyPath.insert`) als
+    Dictionary erstellt.
+
+    Ein Key `*` (:data:`WILDCARD`) wählt die Keys für alle Elemente eines Arrays bzw. Dictionaries aus, mehrere Keys
+    können mit `{}` zusammengefasst werden (z.B. `_req|data|*|{a,b,c}`).
+
+    :param keys: Key-Pfade, die ausgewählt werden sollen.
+    :param split_key: Trennzeichen zwischen den Keys.
+    :raises: ValueError
+    """
+    __slots__ = ("keys", "__root")
+
+    def __init__(self, keys: tuple, split_key="|"):
+        self.keys = keys
+        self.__root = _ProjectionNode(None)
+
+        for raw in keys:
+            for segments in _split_alternatives(raw, split_key):
+                node = self.__root
+                for key in segments:
+                    if node.whole:
+                        break
+
+                    if node.children and (key == WILDCARD) != (WILDCARD in node.children):
+                        raise ValueError(f"'{raw}': a wildcard can not be combined with other keys on the same level")
+
+                    node = node.children.setdefault(key, _ProjectionNode(raw))
+                else:
+                    # Select the whole value, keys below are already part of it
+                    node.whole = True
+                    node.children.clear()
+
+    def __repr__(self):
+        return f"Projection({self.keys!r})"
+
+    @property
+    def root(self):
+        """Wurzel des Baums, aus dem die Projektion besteht (z.B. zum Parsen von JSON mit :mod:`json_projection`)."""
+        return self.__root
+
+    def apply(self, data, ignore_errors=False):
+        """Erstellt ein neues Dictionary, das nur die ausgewählten Keys aus `data` enthält.
+
+        :param data: Daten, aus denen ausgewählt werden soll.
+        :param ignore_errors: Wenn `True`, werden fehlende Keys ignoriert.
+        :return: Dictionary mit den ausgewählten Keys.
+        :raises: StepKeyError
+        """
+        result = _project(self.__root, data, ignore_errors)
+
+        return {} if result is _MISSING else result
+
+
+@lru_cache(maxsize=PROJECTION_CACHE_SIZE)
+def compile_projection(keys: tuple, split_key="|"):
+    """Gibt die vorkompilierte :class:`Projection` zu `keys` zurück.
+
+    :param keys: Key-Pfade, die ausgewählt werden sollen.
+    :param split_key: Trennzeichen zwischen den Keys.
+    :return: Vorkompilierte Projektion
+    :rtype: Projection
+    :raises: ValueError
+    """
+    return Projection(keys, split_key)
+
+
+class TemplateField(object):
+    """Feld (Wert in `{}`) eines vorkompilierten Format-Strings."""
+    __slots__ = ("key_path", "rest", "conversion", "format_spec")
+
+    def __init__(self, key_path: KeyPath, rest: tuple, conversion, format_spec: str):
+        self.key_path = key_path
+        self.rest = rest
+        self.conversion = conversion
+        self.format_spec = format_spec
+
+
+def _split_field_name(field_name: str):
+    # Same as Formatter.get_field: the key path up to the first . or [ and the attribute and index accesses after it
+    end = len(field_name)
+    for char in ".[":
+        pos = field_name.find(char)
+        if pos != -1:
+            end = min(end, pos)
+
+    first, pos, rest = field_name[:end], end, []
+    while pos < len(field_name):
+        if field_name[pos] == ".":
+            end = len(field_name)
+            for char in ".[":
+                next_pos = field_name.find(char, pos + 1)
+                if next_pos != -1:
+                    end = min(end, next_pos)
+
+            if end == pos + 1:
+                raise ValueError("Empty attribute in format string")
+
+            rest.append((True, field_name[pos + 1:end]))
+        elif field_name[pos] == "[":
+            end = field_name.find("]", pos + 1)
+            if end == -1:
+                raise ValueError("Missing ']' in format string")
+
+            key = field_name[pos + 1:end]
+            if not key:
+                raise ValueError("Empty attribute in format string")
+
+            rest.append((False, int(key) if key.isdigit() else key))
+            end += 1
+
+            if end < len(field_name) and field_name[end] not in ".[":
+                raise ValueError("Only '.' or '[' may follow ']' in format field specifier")
+        pos = end
+
+    return first, rest
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(format_string: str, split_key="|"):
+    """Kompiliert einen Format-String in eine Liste aus Text-Abschnitten und :class:`TemplateField`-Objekten.
+
+    Die Ergebnisse werden zwischengespeichert, sodass gleiche Format-Strings nur einmal geparst werden.
+    Format-Strings mit automatischer Nummerierung (`{}`) oder verschachtelten Feldern in der Formatangabe
+    werden nicht kompiliert, für diese wird `None` zurückgegeben.
+
+    :param format_string: Format-String
+    :param split_key: Trennzeichen zwischen den Keys.
+    :return: Tupel aus Strings und :class:`TemplateField`-Objekten oder `None`.
+    :raises: ValueError
+    """
+    template = []
+
+    for literal, field_name, format_spec, conversion in Formatter().parse(format_string):
+        if literal:
+            template.append(literal)
+
+        if field_name is None:
+            continue
+
+        if field_name == "" or "{" in format_spec:
+            return None
+
+        first, rest = _split_field_name(field_name)
+        template.append(TemplateField(compile_key_path(first, split_key), tuple(rest), conversion, format_spec))
+
+    return tuple(template)
+
+
+def template_fields(format_string: str):
+    """Gibt die Key-Pfade aller Felder eines Format-Strings zurück, auch die der Felder in der Formatangabe
+    (z.B. `_req|a` und `_conf|w` bei `{_req|a:>{_conf|w}}`).
+
+    :param format_string: Format-String
+    :return: Generator mit den Key-Pfaden (ohne Index- und Attributzugriffe).
+    :raises: ValueError
+    """
+    for _, field_name, format_spec, _ in Formatter().parse(format_string):
+        if field_name:
+            yield _split_field_name(field_name)[0]
+
+        if format_spec:
+            yield from template_fields(format_spec)
 
 
 def data_get_pattern(keys, data, split_key="|"):
     try:
-        if isinstance(keys, str):
-            keys_map = map(_to_int, keys.split(split_key))
-            return reduce(operator.getitem, keys_map, data)
-
-        return data[keys]
+        return compile_key_path(keys, split_key).get(data)
     except BaseException as e:
         raise StepKeyError("get_data", keys) from e
 
 
-def data_insert_pattern(keys, data, value, split_key="|"):
+def data_exists_pattern(keys, data, split_key="|"):
     try:
-        if isinstance(keys, str) and '|' in keys:
-            key_array = keys.split(split_key)
-            keys_map = map(_to_int, key_array[:-1])
-            last = _to_int(key_array[-1])
+        return compile_key_path(keys, split_key).exists(data)
+    except TypeError:
+        # Unhashable keys can not be part of the data
+        return False
 
-            reduce(_get_or_create, keys_map, data)[last] = value
-        else:
-            data[keys] = value
+
+def data_insert_pattern(keys, data, value, split_key="|"):
+    try:
+        compile_key_path(keys, split_key).insert(data, value)
     except BaseException as e:
         raise StepKeyError("insert_data", keys) from e
 
 
 def data_remove_pattern(keys, data, split_key="|"):
     try:
-        if isinstance(keys, str) and '|' in keys:
-            key_array = keys.split(split_key)
-            keys_map = map(_to_int, key_array[:-1])
-            last = _to_int(key_array[-1])
-
-            reduce(operator.getitem, keys_map, data).pop(last, None)
-        else:
-            data.pop(keys, None)
+        compile_key_path(keys, split_key).remove(data)
     except BaseException as e:
         raise StepKeyError("remove_data", keys) from e
@@ -0,0 +1,47 @@
+"""
+Modul zum Laden der globalen Stopwords (`resources/stopwords/stopwords.txt`).
+"""
+import os
+import threading
+
+from visuanalytics.util import resources
+
+STOPWORDS_PATH = "stopwords/stopwords.txt"
+"""Pfad zu der Datei mit den globalen Stopwords, relativ zum `resources`-Ordner."""
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def get_stopwords(lower_case=False):
+    """Gibt die globalen Stopwords zurück.
+
+    Die Datei wird nur einmal pro Prozess gelesen und erst neu geladen, wenn sie sich geändert hat.
+    Ist die Datei nicht vorhanden, wird ein leeres Set zurückgegeben.
+
+    :param lower_case: Wenn `True`, werden alle Stopwords in Kleinbuchstaben zurückgegeben.
+    :return: Set mit allen Stopwords.
+    :rtype: frozenset
+    """
+    path = resources.get_resource_path(STOPWORDS_PATH)
+
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return frozenset()
+
+    with _cache_lock:
+        cached = _cache.get(lower_case, None)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                stopwords = f.read().splitlines()
+        except IOError:
+            return frozenset()
+
+        stopwords = frozenset(s.lower() for s in stopwords) if lower_case else frozenset(stopwords)
+        _cache[lower_case] = (mtime, stopwords)
+
+        return stopwords
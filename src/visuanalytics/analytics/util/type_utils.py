@@ -6,13 +6,14 @@ from visuanalytics.analytics.util.step_errors import StepTypeError, raise_step_e
 from visuanalytics.util.dict_utils import merge_dict
 
 
-def register_type_func(types: dict, error: Type[StepError], func):
+def register_type_func(types: dict, error: Type[StepError], func, name: str = None):
     """ Registriert die übergebene Funktion
     und versieht sie mit einem try-except-Block.
 
     :param types: Dictionary, in dem der Typ registriert werden soll.
     :param error: Fehler, der geworfen werden soll.
     :param func: Zu registrierende Funktion.
+    :param name: Name des Typs, falls er nicht dem Funktionsnamen entspricht.
     :return: Funktion mit try-catch-Block.
     """
     func = raise_step_error(error)(func)
@@ -26,7 +27,7 @@ def register_type_func(types: dict, error: Type[StepError], func):
 
         return func(values, data, *args, **kwargs)
 
-    types[func.__name__] = type_func
+    types[name or func.__name__] = type_func
     return type_func
 
 
@@ -0,0 +1,97 @@
+import json
+import shutil
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from visuanalytics.analytics.apis.util import session_pool
+from visuanalytics.util import resources
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(self.path)
+
+        status, headers, body = self.server.respond(self)
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        # The body has to be read, so the connection can be reused
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestServer(object):
+    """Lokaler HTTP-Server für Tests der API-Typen.
+
+    :param respond: Funktion, die für einen Request (Handler) ein Tupel (Status, Header, Body) zurückgibt.
+    """
+
+    def __init__(self, respond=None):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.connections = 0
+        self.server.requests = []
+        self.server.respond = respond or (lambda handler: (200, {}, {"path": handler.path}))
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @property
+    def connections(self):
+        return self.server.connections
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class CacheTestCase(unittest.TestCase):
+    """TestCase für Tests, die den Cache für API-Antworten verwenden.
+
+    Der Cache liegt während eines Tests im Ordner `cache_location` und wird danach gelöscht. Der Session-Pool wird
+    ohne die Einstellungen aus der `config.json` verwendet.
+    """
+    cache_location = "test_cache"
+
+    def setUp(self):
+        self.__cache_location = resources.CACHE_LOCATION
+        resources.CACHE_LOCATION = self.cache_location
+        session_pool.configure({})
+
+    def tearDown(self):
+        shutil.rmtree(resources.get_cache_path(""), ignore_errors=True)
+        resources.CACHE_LOCATION = self.__cache_location
+        session_pool.configure()
@@ -0,0 +1,80 @@
+import json
+
+from visuanalytics.analytics.apis.api import api, api_request
+from visuanalytics.analytics.apis.util import json_projection
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.util.step_pattern import Projection
+from visuanalytics.tests.analytics.apis.api_test_helper import TestServer, CacheTestCase
+
+DOCUMENT = {
+    "fields": [{"name": "cases", "type": "int"}, {"name": "deaths", "type": "int"}],
+    "features": [
+        {"attributes": {"name": "A [1]", "cases": 10, "deaths": 1, "shape": [[1.5, 2], {"x": "}"}]}},
+        {"attributes": {"name": "B \"2\"", "cases": 20, "deaths": 2, "shape": []}},
+        {"other": 1}
+    ],
+    "count": 3
+}
+
+
+def _respond(handler):
+    return 200, {"Content-Type": "application/json"}, DOCUMENT
+
+
+class TestJsonProjection(CacheTestCase):
+    cache_location = "test_json_projection"
+
+    def _assert_same_as_apply(self, keys, document=DOCUMENT):
+        projection = Projection(tuple(keys))
+        text = json.dumps(document, indent=2)
+
+        self.assertEqual(projection.apply(json.loads(text), True), json_projection.loads(text, projection))
+
+    def test_loads(self):
+        self._assert_same_as_apply(["count"])
+        self._assert_same_as_apply(["features|*|attributes|{name,cases}", "missing"])
+        self._assert_same_as_apply(["features|1|attributes", "fields|0|name", "count|x"])
+        self._assert_same_as_apply(["*|0"])
+        self._assert_same_as_apply(["0|*"], [[1, 2], {"a": "b"}, "text", 3])
+
+    def test_loads_skips_unselected_values(self):
+        projection = Projection(("features|*|attributes|cases",))
+
+        result = json_projection.loads(json.dumps(DOCUMENT), projection)
+
+        self.assertEqual({"features": [{"attributes": {"cases": 10}}, {"attributes": {"cases": 20}}, {}]}, result)
+
+    def test_loads_invalid(self):
+        projection = Projection(("count",))
+
+        for text in ('{"fields": [1, 2', '{"count": 3} 4', '{"count" 3}', '{"fields": "a}', '{"fields": [1 2]}',
+                     '{"fields": {"a" 1}}', '{"fields": {1: 2}}'):
+            with self.assertRaises(json.JSONDecodeError):
+                json_projection.loads(text, projection)
+
+    def test_explicit_projection(self):
+        data = StepData({}, "0", 0)
+
+        with TestServer(_respond) as server:
+            api_request({"type": "request", "url_pattern": server.url, "projection": ["count", "fields|*|name"]},
+                        data, "", "_req", True)
+
+        self.assertEqual({"count": 3, "fields": [{"name": "cases"}, {"name": "deaths"}]}, data.get_data("_req"))
+
+    def test_projection_from_select(self):
+        data = StepData({}, "0", 0)
+
+        with TestServer(_respond) as server:
+            api({"name": "", "api": {"type": "request", "url_pattern": server.url, "projection": True},
+                 "transform": [{"type": "select", "relevant_keys": ["_req|count", "_conf|x"]}]}, data)
+
+        self.assertEqual({"count": 3}, data.get_data("_req"))
+
+    def test_no_projection_without_select(self):
+        data = StepData({}, "0", 0)
+
+        with TestServer(_respond) as server:
+            api({"name": "", "api": {"type": "request", "url_pattern": server.url, "projection": True},
+                 "transform": [{"type": "delete", "keys": ["_req|count"]}]}, data)
+
+        self.assertEqual(DOCUMENT, data.get_data("_req"))
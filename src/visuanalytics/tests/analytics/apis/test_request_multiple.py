@@ -0,0 +1,86 @@
+import re
+import threading
+import time
+import unittest
+
+from visuanalytics.analytics.apis.api import api_request
+from visuanalytics.analytics.apis.util import session_pool
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.util.step_errors import APIError
+from visuanalytics.tests.analytics.apis.api_test_helper import TestServer
+
+
+class TestRequestMultiple(unittest.TestCase):
+    def setUp(self):
+        session_pool.configure({})
+        self.data = StepData({}, "0", 0)
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        session_pool.configure()
+
+    def _respond(self, handler):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+        # Later requests are answered first
+        time.sleep(0.05 * (5 - int(re.sub(r"\D", "", handler.path) or 0)))
+
+        with self.lock:
+            self.running -= 1
+
+        if handler.path.endswith("/4"):
+            return 404, {}, "not found"
+
+        return 200, {}, {"path": handler.path}
+
+    def test_results_are_in_order(self):
+        with TestServer(self._respond) as server:
+            values = {"type": "request_multiple", "url_pattern": server.url + "/{_idx}", "steps_value": [0, 1, 2, 3],
+                      "max_parallel": 2}
+            api_request(values, self.data, "", "_req", True)
+
+        self.assertEqual([{"path": f"/{idx}"} for idx in range(4)], self.data.get_data("_req"))
+        self.assertEqual(2, self.max_running)
+
+    def test_use_loop_as_key(self):
+        with TestServer(self._respond) as server:
+            values = {"type": "request_multiple", "url_pattern": server.url + "/{_loop}", "steps_value": ["a1", "a2"],
+                      "use_loop_as_key": True}
+            api_request(values, self.data, "", "_req", True)
+
+        self.assertEqual({"a1": {"path": "/a1"}, "a2": {"path": "/a2"}}, self.data.get_data("_req"))
+
+    def test_serial(self):
+        with TestServer(self._respond) as server:
+            values = {"type": "request_multiple", "url_pattern": server.url + "/{_loop}", "steps_value": [1, 2, 3],
+                      "max_parallel": 1}
+            api_request(values, self.data, "", "_req", True)
+
+        self.assertEqual(1, self.max_running)
+
+    def test_error(self):
+        with TestServer(self._respond) as server:
+            values = {"type": "request_multiple", "url_pattern": server.url + "/{_loop}", "steps_value": [3, 4]}
+
+            with self.assertRaises(APIError):
+                api_request(values, self.data, "", "_req", True)
+
+    def test_request_multiple_custom(self):
+        with TestServer(self._respond) as server:
+            values = {
+                "type": "request_multiple_custom",
+                "requests": [
+                    {"type": "request", "url_pattern": server.url + "/1"},
+                    {"type": "input", "data": {"value": 2}},
+                    {"type": "request", "url_pattern": server.url + "/3"},
+                    {"type": "request", "url_pattern": server.url + "{_req|2|path}"}
+                ]
+            }
+            api_request(values, self.data, "", "_req", True)
+
+        self.assertEqual([{"path": "/1"}, {"value": 2}, {"path": "/3"}, {"path": "/3"}], self.data.get_data("_req"))
+        self.assertEqual(["/1", "/3", "/3"], sorted(server.requests))
@@ -0,0 +1,78 @@
+import os
+import time
+
+import requests
+
+from visuanalytics.analytics.apis.api import api_request
+from visuanalytics.analytics.apis.util import response_cache
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.tests.analytics.apis.api_test_helper import TestServer, CacheTestCase
+from visuanalytics.util import resources
+
+
+class TestResponseCache(CacheTestCase):
+    cache_location = "test_cache"
+
+    def setUp(self):
+        super().setUp()
+        self.version = 1
+
+    def _respond(self, handler):
+        etag = f'"{self.version}"'
+        if handler.headers.get("If-None-Match", None) == etag:
+            return 304, {"ETag": etag}, ""
+
+        return 200, {"ETag": etag}, {"version": self.version, "path": handler.path}
+
+    def _request(self, server, ttl, path="/a"):
+        data = StepData({}, "0", 0)
+        values = {"type": "request", "url_pattern": server.url + path, "params": {"key": "secret"},
+                  "cache_ttl": ttl}
+        api_request(values, data, "", "_req", True)
+
+        return data.get_data("_req")
+
+    def test_fresh_response_is_cached(self):
+        with TestServer(self._respond) as server:
+            self.assertEqual({"version": 1, "path": "/a?key=secret"}, self._request(server, 60))
+            self.version = 2
+            self.assertEqual({"version": 1, "path": "/a?key=secret"}, self._request(server, 60))
+            self.assertEqual(2, self._request(server, 60, "/b")["version"])
+
+        self.assertEqual(["/a?key=secret", "/b?key=secret"], server.requests)
+
+        # The api key is not part of the file names
+        self.assertFalse(any("secret" in name for name in os.listdir(resources.get_cache_path(""))))
+
+    def test_revalidation(self):
+        with TestServer(self._respond) as server:
+            self._request(server, 0)
+            self.assertEqual(1, self._request(server, 0)["version"])
+
+            self.version = 2
+            self.assertEqual(2, self._request(server, 0)["version"])
+
+        self.assertEqual(3, len(server.requests))
+
+    def test_errors_are_not_cached(self):
+        with TestServer(lambda handler: (500, {}, "error")) as server:
+            self.assertEqual(500, response_cache.send(requests.Request("get", server.url).prepare(), 60).status_code)
+            self.assertEqual(500, response_cache.send(requests.Request("get", server.url).prepare(), 60).status_code)
+
+        self.assertEqual(2, len(server.requests))
+
+    def test_evict(self):
+        with TestServer() as server:
+            for path in ("/a", "/b", "/c"):
+                response_cache.send(requests.Request("get", server.url + path).prepare(), 60)
+                time.sleep(0.01)
+
+            # Use /a, so /b is the least recently used response
+            response_cache.send(requests.Request("get", server.url + "/a").prepare(), 60)
+
+            self.assertEqual(1, response_cache.evict(2 * len('{"path": "/a"}')))
+
+            response_cache.send(requests.Request("get", server.url + "/a").prepare(), 60)
+            response_cache.send(requests.Request("get", server.url + "/b").prepare(), 60)
+
+        self.assertEqual(["/a", "/b", "/c", "/b"], server.requests)
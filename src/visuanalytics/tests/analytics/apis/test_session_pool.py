@@ -0,0 +1,50 @@
+import unittest
+
+import requests
+
+from visuanalytics.analytics.apis.api import api_request
+from visuanalytics.analytics.apis.util import session_pool
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.tests.analytics.apis.api_test_helper import TestServer
+
+
+class TestSessionPool(unittest.TestCase):
+    def setUp(self):
+        session_pool.configure({})
+
+    def tearDown(self):
+        session_pool.configure()
+
+    def test_connections_are_reused(self):
+        data = StepData({}, "0", 0)
+
+        with TestServer() as server:
+            values = {"type": "request_multiple", "url_pattern": server.url + "/{_loop}", "steps_value": ["a", "b", "c"],
+                      "max_parallel": 1}
+            api_request(values, data, "", "_req", True)
+
+        self.assertEqual([{"path": "/a"}, {"path": "/b"}, {"path": "/c"}], data.get_data("_req"))
+        self.assertEqual(1, server.connections)
+
+    def test_keep_alive_off(self):
+        session_pool.configure({"keep_alive": False})
+        data = StepData({}, "0", 0)
+
+        with TestServer() as server:
+            values = {"type": "request_multiple", "url_pattern": server.url + "/{_loop}", "steps_value": ["a", "b"]}
+            api_request(values, data, "", "_req", True)
+
+        self.assertEqual(2, server.connections)
+
+    def test_session_per_host(self):
+        session = session_pool.get_session("https://api.example.com/a")
+
+        self.assertIs(session, session_pool.get_session("HTTPS://API.example.com/b?c=d"))
+        self.assertIsNot(session, session_pool.get_session("http://api.example.com/a"))
+        self.assertIsNot(session, session_pool.get_session("https://example.com/a"))
+
+    def test_cookies_are_not_shared(self):
+        with TestServer(lambda handler: (200, {"Set-Cookie": "id=1; Path=/"}, {})) as server:
+            session_pool.send_prepared(requests.Request("get", server.url).prepare())
+
+            self.assertEqual(0, len(session_pool.get_session(server.url).cookies))
@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+
+import requests
+
+from visuanalytics.analytics.apis.api import api_request
+from visuanalytics.analytics.apis.util import session_pool, response_cache, single_flight
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.util import resources
+from visuanalytics.tests.analytics.apis.api_test_helper import TestServer, CacheTestCase
+
+
+def _slow(handler):
+    time.sleep(0.2)
+    return 200, {}, {"path": handler.path, "values": [1, 2]}
+
+
+class TestSingleFlight(CacheTestCase):
+    cache_location = "test_single_flight"
+
+    def _run_parallel(self, func, count=2):
+        results = [None] * count
+
+        def run(idx):
+            results[idx] = func()
+
+        threads = [threading.Thread(target=run, args=(idx,)) for idx in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def test_do(self):
+        calls = []
+
+        def func():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"values": [1, 2]}
+
+        results = self._run_parallel(lambda: single_flight.do("key", func), 3)
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual([{"values": [1, 2]}] * 3, results)
+        self.assertIsNot(results[0]["values"], results[1]["values"])
+
+    def test_do_error(self):
+        def func():
+            time.sleep(0.1)
+            raise ValueError("error")
+
+        def call():
+            try:
+                single_flight.do("key", func)
+            except ValueError as e:
+                return str(e)
+
+        self.assertEqual(["error", "error"], self._run_parallel(call))
+
+    def test_pipelines_share_requests(self):
+        with TestServer(_slow) as server:
+            def run():
+                data = StepData({}, "0", 0)
+                api_request({"type": "request", "url_pattern": server.url + "/a"}, data, "", "_req", True)
+                data.insert_data("_req|values|0", 3, {})
+                return data.get_data("_req")
+
+            results = self._run_parallel(run)
+
+        self.assertEqual(["/a"], server.requests)
+        self.assertEqual([{"path": "/a", "values": [3, 2]}] * 2, results)
+
+    def test_coalesce_off(self):
+        session_pool.configure({"coalesce": False})
+
+        with TestServer(_slow) as server:
+            self._run_parallel(
+                lambda: api_request({"type": "request", "url_pattern": server.url + "/a"}, StepData({}, "0", 0), "",
+                                    "_req", True))
+
+        self.assertEqual(2, len(server.requests))
+
+    def test_post_is_not_coalesced(self):
+        with TestServer(_slow) as server:
+            self._run_parallel(
+                lambda: api_request({"type": "request", "url_pattern": server.url + "/a", "method": "post"},
+                                    StepData({}, "0", 0), "", "_req", True))
+
+        self.assertEqual(2, len(server.requests))
+
+    def test_no_files_without_ttl(self):
+        with TestServer(_slow) as server:
+            self._run_parallel(
+                lambda: api_request({"type": "request", "url_pattern": server.url + "/a"}, StepData({}, "0", 0), "",
+                                    "_req", True))
+
+        self.assertEqual(["/a"], server.requests)
+        self.assertFalse(os.path.exists(resources.get_cache_path("")))
+
+    def test_process_lock(self):
+        # Separate opens of the lock file behave like separate processes
+        with TestServer(_slow) as server:
+            results = self._run_parallel(
+                lambda: response_cache.send(requests.Request("get", server.url + "/a").prepare(), 0).json())
+
+        self.assertEqual(["/a"], server.requests)
+        self.assertEqual([{"path": "/a", "values": [1, 2]}] * 2, results)
+
+    def test_process_lock_late_waiter(self):
+        # The second request starts while the first one is in flight
+        def run(delay):
+            time.sleep(delay)
+            return response_cache.send(requests.Request("get", server.url + "/a").prepare(), 0).json()
+
+        delays = iter([0, 0.1])
+        with TestServer(_slow) as server:
+            results = self._run_parallel(lambda: run(next(delays)))
+
+        self.assertEqual(["/a"], server.requests)
+        self.assertEqual([{"path": "/a", "values": [1, 2]}] * 2, results)
@@ -0,0 +1,85 @@
+import xmltodict
+
+from visuanalytics.analytics.apis.api import api_request
+from visuanalytics.analytics.apis.util import xml_projection
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.util.step_pattern import Projection
+from visuanalytics.tests.analytics.apis.api_test_helper import TestServer, CacheTestCase
+
+DOCUMENT = """<?xml version="1.0" encoding="utf-8"?>
+<soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope">
+  <soap:Body>
+    <GetMatchResponse xmlns="http://msiggi.de/Sportsdata/Webservices">
+      <Result>
+        <Team1 id="1"><TeamName>A</TeamName></Team1>
+        <Team2 id="2"><TeamName>B</TeamName><ShortName>b</ShortName></Team2>
+        <Goals>
+          <Goal><GoalID>1</GoalID><Minute>12</Minute><!-- first --></Goal>
+          <Goal><GoalID>2</GoalID><Minute>80</Minute><Player xmlns:p="urn:p"><p:Name>X</p:Name></Player></Goal>
+          <Goal><GoalID>3</GoalID><Minute>90</Minute></Goal>
+        </Goals>
+        <Location>Stadion</Location>
+      </Result>
+    </GetMatchResponse>
+  </soap:Body>
+</soap:Envelope>"""
+
+XML_CONFIG = {
+    "process_namespaces": True,
+    "namespaces": {
+        "http://www.w3.org/2003/05/soap-envelope": None,
+        "http://msiggi.de/Sportsdata/Webservices": None
+    }
+}
+
+RESULT = "Envelope|Body|GetMatchResponse|Result"
+
+
+class TestXmlProjection(CacheTestCase):
+    cache_location = "test_xml_projection"
+
+    def _assert_same_as_apply(self, keys, **xml_config):
+        projection = Projection(tuple(keys))
+
+        self.assertEqual(projection.apply(xmltodict.parse(DOCUMENT, **xml_config), True),
+                         xml_projection.parse(DOCUMENT, projection, **xml_config))
+
+    def test_parse(self):
+        xml_configs = [{}, XML_CONFIG, {**XML_CONFIG, "force_list": ["Goal", "TeamName"]},
+                       {**XML_CONFIG, "xml_attribs": False}]
+
+        # process_comments is only supported by newer versions of xmltodict (not 0.12.0)
+        try:
+            xmltodict.parse("<a/>", process_comments=True)
+            xml_configs.append({**XML_CONFIG, "process_comments": True})
+        except TypeError:
+            pass
+
+        for xml_config in xml_configs:
+            with self.subTest(xml_config=xml_config):
+                self._assert_same_as_apply([f"{RESULT}|Team1", f"{RESULT}|Goals|Goal|1|Minute"], **xml_config)
+                self._assert_same_as_apply([f"{RESULT}|Goals|Goal|*|{{Minute,Player}}", f"{RESULT}|Team2|@id"],
+                                           **xml_config)
+                self._assert_same_as_apply([f"{RESULT}|*|TeamName", "Envelope|missing"], **xml_config)
+                self._assert_same_as_apply([f"{RESULT}|Location|0", f"{RESULT}|Team2|TeamName|0"], **xml_config)
+                self._assert_same_as_apply([f"{RESULT}|Goals|Goal|2", f"{RESULT}|Goals|Goal|1|Player|@xmlns"],
+                                           **xml_config)
+
+    def test_parse_skips_unselected_elements(self):
+        projection = Projection((f"{RESULT}|Goals|Goal|2|Minute",))
+
+        result = xml_projection.parse(DOCUMENT, projection, **XML_CONFIG)
+
+        self.assertEqual({"Envelope": {"Body": {"GetMatchResponse": {"Result": {"Goals": {"Goal": {2: {
+            "Minute": "90"}}}}}}}}, result)
+
+    def test_projection(self):
+        data = StepData({}, "0", 0)
+
+        with TestServer(lambda handler: (200, {"Content-Type": "application/xml"}, DOCUMENT)) as server:
+            api_request({"type": "request", "url_pattern": server.url, "response_format": "xml",
+                         "xml_config": XML_CONFIG, "projection": [f"{RESULT}|Team1|TeamName"]}, data, "", "_req",
+                        True)
+
+        self.assertEqual({"Envelope": {"Body": {"GetMatchResponse": {"Result": {"Team1": {"TeamName": "A"}}}}}},
+                         data.get_data("_req"))
@@ -0,0 +1,108 @@
+import unittest
+from unittest import mock
+
+from visuanalytics.analytics.control.procedures.data_liveness import prune_data, live_paths, collect_paths
+from visuanalytics.analytics.control.procedures.step_data import StepData
+
+
+class TestDataLiveness(unittest.TestCase):
+    def setUp(self):
+        self.config = {
+            "transform": [{"type": "calculate", "keys": ["_req|unused"]}],
+            "images": {
+                "test": {
+                    "type": "pillow",
+                    "overlay": [
+                        {"type": "text", "pattern": "{_req|city|temp:.1f} Grad in {_conf|city}"},
+                        {"type": "image", "path": "_req|icons|{_conf|icon}"}
+                    ]
+                }
+            },
+            "audio": {"audios": {"a": {"parts": [{"type": "text", "pattern": "{_req|days|0|text}"}]}}}
+        }
+
+        self.days = [{"text": "a", "other": 1}]
+        self.shared = {"temp": 20, "min": 10}
+        self.data = StepData({"city": "Gießen", "icon": "sun"}, "0", 0)
+        self.data.insert_data("_req", {
+            "city": self.shared,
+            "copy": self.shared,
+            "days": self.days,
+            "unused": {"a": 1},
+            "icons": {"sun": "sun.png"}
+        }, {})
+        self.data.insert_data("result", 1, {})
+        self.data.insert_data("_audio", {}, {})
+
+    def test_live_paths(self):
+        tree = live_paths(self.config, {"key": "_req|conf_key"})
+
+        self.assertEqual({"city", "days", "icons", "conf_key"}, set(tree["_req"]))
+        self.assertEqual({None: True}, tree["_req"]["city"]["temp"])
+        self.assertNotIn("Grad in ", tree)
+
+    def test_live_paths_data_prefix(self):
+        tree = live_paths({"images": {"a": {"path": "$_req|a"}, "b": {"path": "~$_req|b"}}}, {})
+
+        self.assertEqual({"a": {None: True}, "b": {None: True}}, tree["_req"])
+
+    def test_live_paths_nested_fields(self):
+        tree = live_paths({"images": {"a": {"pattern": "{_req|a:>{_conf|w}}"}}}, {})
+
+        self.assertEqual({"a": {None: True}}, tree["_req"])
+
+    def test_live_paths_invalid_format_string(self):
+        tree = live_paths({"images": {"a": {"pattern": "{_req|a"}}}, {})
+
+        self.assertEqual({None: True}, tree)
+
+    def test_live_paths_templated_first_key(self):
+        tree = live_paths({"images": {"a": {"path": "{_conf|src}|temp"}}}, {})
+
+        self.assertEqual({None: True}, tree)
+
+    def test_collect_paths_templated_first_key(self):
+        tree = {}
+        collect_paths(tree, "{_conf|src}|temp")
+
+        self.assertEqual({None: True}, tree)
+
+        # Text with format fields is not a key path
+        tree = {}
+        collect_paths(tree, "Heute {_req|temp} Grad")
+
+        self.assertEqual({"_req": {"temp": {None: True}}}, tree)
+
+    @mock.patch("visuanalytics.analytics.control.procedures.data_liveness.get_config")
+    def test_live_paths_audio_config(self, get_config):
+        get_config.return_value = {"audio": {"sub_pairs": {"{_req|unit}": "Grad"}}}
+
+        tree = live_paths(self.config, {})
+        self.assertIn("unit", tree["_req"])
+
+        # Without an audio step the audio config is not used
+        tree = live_paths({"images": self.config["images"]}, {})
+        self.assertNotIn("unit", tree["_req"])
+
+    def test_prune_data(self):
+        removed = prune_data(self.config, self.data)
+
+        self.assertEqual(["_req|city|min", "_req|copy", "_req|unused", "result"], removed)
+        self.assertEqual({"city": {"temp": 20}, "days": self.days, "icons": {"sun": "sun.png"}}, self.data.get_data("_req"))
+        self.assertIs(self.days, self.data.get_data("_req|days"))
+        self.assertEqual({}, self.data.get_data("_audio"))
+
+        # Shared values are not changed
+        self.assertEqual({"temp": 20, "min": 10}, self.shared)
+
+    def test_prune_data_keeps_prefixed_data(self):
+        config = {"images": {"a": {"path": "$_req|unused|a"}, "b": {"pattern": "{_req|days|0|text:>{_conf|city}}"}}}
+
+        self.assertEqual(["_req|city", "_req|copy", "_req|icons", "result"], prune_data(config, self.data))
+        self.assertEqual({"days": self.days, "unused": {"a": 1}}, self.data.get_data("_req"))
+
+    def test_prune_data_disabled(self):
+        self.data.insert_data("_conf|prune_data", False, {})
+
+        self.assertEqual([], prune_data(self.config, self.data))
+        self.assertIn("unused", self.data.get_data("_req"))
@@ -0,0 +1,58 @@
+import unittest
+
+from visuanalytics.analytics.control.procedures.step_data import StepData, _constant_cache
+
+
+class TestDeepFormat(unittest.TestCase):
+    def setUp(self):
+        self.data = StepData({"city": "Gießen"}, "0", 0)
+        self.data.insert_data("_req", {"temp": 12}, {})
+
+        self.config = {
+            "q": "{_conf|city}",
+            "temp": "$_req|temp",
+            "escaped": "~$_req|temp",
+            "units": {"temp": "metric", "list": [1, 2, "a"]},
+            "mixed": ["const", "{_req|temp} °C"]
+        }
+
+    def test_deep_format(self):
+        out = self.data.deep_format(self.config)
+
+        self.assertEqual({
+            "q": "Gießen",
+            "temp": 12,
+            "escaped": "$_req|temp",
+            "units": {"temp": "metric", "list": [1, 2, "a"]},
+            "mixed": ["const", "12 °C"]
+        }, out)
+        self.assertEqual("{_conf|city}", self.config["q"])
+        self.assertEqual(["const", "{_req|temp} °C"], self.config["mixed"])
+
+    def test_constants_are_not_copied(self):
+        out = self.data.deep_format(self.config)
+
+        self.assertIsNot(self.config, out)
+        self.assertIsNot(self.config["mixed"], out["mixed"])
+        self.assertIs(self.config["units"], out["units"])
+
+    def test_copy_constants(self):
+        out = self.data.deep_format(self.config, copy_constants=True)
+
+        self.assertEqual(self.config["units"], out["units"])
+        self.assertIsNot(self.config["units"], out["units"])
+        self.assertIsNot(self.config["units"]["list"], out["units"]["list"])
+
+    def test_constant_root(self):
+        config = [{"a": 1}, "b"]
+
+        self.assertIs(config, self.data.deep_format(config))
+        self.assertEqual("b", self.data.deep_format("b"))
+        self.assertIsNone(self.data.deep_format(None))
+
+    def test_empty_config_is_not_cached(self):
+        _constant_cache.clear()
+        config = {}
+
+        self.assertIs(config, self.data.deep_format(config))
+        self.assertEqual({}, _constant_cache)
@@ -0,0 +1,50 @@
+import unittest
+
+from visuanalytics.analytics.control.procedures.steps_plan import compile_steps, StepsPlan
+
+
+class TestStepsPlan(unittest.TestCase):
+    def setUp(self):
+        self.config = {
+            "presets": {
+                "white": {"color": "white", "font": {"size": 20}}
+            },
+            "images": {
+                "test": {
+                    "type": "pillow",
+                    "overlay": [
+                        {"type": "text", "pattern": "{_req|temp}", "preset": "white", "font": {"name": "a"}},
+                        {"type": "text", "pattern": "Test", "preset": "missing"}
+                    ]
+                }
+            },
+            "audio": {"audios": {"a": {"parts": []}}}
+        }
+        self.global_presets = {"presets": {"white": {"color": "black"}, "global": {"color": "red"}}}
+
+    def test_presets_are_merged(self):
+        config = compile_steps(self.config, self.global_presets)
+
+        self.assertEqual({"white", "global"}, set(config["presets"]))
+        self.assertEqual("white", config["presets"]["white"]["color"])
+
+    def test_presets_are_resolved(self):
+        overlay = compile_steps(self.config, self.global_presets)["images"]["test"]["overlay"]
+
+        self.assertEqual({"type": "text", "pattern": "{_req|temp}", "color": "white", "font": {"name": "a", "size": 20}},
+                         overlay[0])
+        self.assertNotIn("color", overlay[1])
+        self.assertEqual("missing", overlay[1]["preset"])
+
+    def test_frames_are_independent(self):
+        plan = StepsPlan(compile_steps(self.config, self.global_presets), (0, 0))
+
+        frame = plan.new_frame()
+        frame["images"]["test"] = "test.png"
+        frame["audio"]["audios"]["a"] = "a.mp3"
+        frame["out_time"] = "now"
+
+        self.assertIsInstance(plan.config["images"]["test"], dict)
+        self.assertIsInstance(plan.config["audio"]["audios"]["a"], dict)
+        self.assertNotIn("out_time", plan.config)
+        self.assertIs(plan.config["presets"], frame["presets"])
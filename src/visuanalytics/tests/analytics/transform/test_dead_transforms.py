@@ -0,0 +1,80 @@
+import unittest
+
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.transform.transform import transform_all
+from visuanalytics.analytics.transform.util.dead_transforms import find_dead_transforms
+
+
+class TestDeadTransforms(unittest.TestCase):
+    def setUp(self):
+        self.config = {
+            "transform": [
+                {"type": "copy", "keys": ["_req|a"], "new_keys": ["_req|b"]},
+                {"type": "upper_case", "keys": ["_req|text"], "new_keys": ["_req|unused"]},
+                {"type": "lower_case", "keys": ["_req|text"], "new_keys": ["_req|lower"]},
+                {"type": "calculate", "action": "round", "keys": ["_req|a|value"]},
+                {"type": "date_now", "new_key": "_req|date", "format": "%Y"},
+                {"type": "delete", "keys": ["_req|text"]},
+                {"type": "capitalize", "keys": ["_req|lower"], "new_keys": ["_req|capital"]}
+            ],
+            "images": {
+                "test": {"type": "pillow", "overlay": [{"type": "text", "pattern": "{_req|b|value} {_req|capital}"}]}
+            }
+        }
+
+    def test_find_dead_transforms(self):
+        dead = find_dead_transforms(self.config, {})
+
+        # round writes below _req|a, which is shared with _req|b by copy
+        self.assertEqual([
+            {"index": 1, "type": "upper_case", "keys": ["_req|unused"]},
+            {"index": 4, "type": "date_now", "keys": ["_req|date"]}
+        ], dead)
+
+    def test_run_config_is_read(self):
+        dead = find_dead_transforms(self.config, {"on_completion": {"body": "{_req|date}"}})
+
+        self.assertEqual([1], [d["index"] for d in dead])
+
+    def test_prefixed_and_nested_reads(self):
+        for text in ["$_req|x", "{_req|x:>{_conf|w}}"]:
+            config = {
+                "transform": [{"type": "add_data", "new_keys": ["_req|x"], "data": "a"}],
+                "images": {"test": {"type": "pillow", "overlay": [{"type": "text", "pattern": text}]}}
+            }
+
+            self.assertEqual([], find_dead_transforms(config, {}), text)
+
+    def test_templated_first_key_read(self):
+        config = {
+            "transform": [{"type": "add_data", "new_keys": ["_req|x"], "data": "a"}],
+            "images": {"test": {"type": "pillow", "path": "{_conf|src}|x"}}
+        }
+
+        # The first key is only known at runtime, so it may be _req
+        self.assertEqual([], find_dead_transforms(config, {}))
+
+    def test_cached_per_transformations(self):
+        dead = find_dead_transforms(self.config, {})
+
+        # Each run uses a new top-level config, but shares the transformations with the plan
+        self.assertIs(dead, find_dead_transforms(dict(self.config), {}))
+        self.assertIsNot(dead, find_dead_transforms(dict(self.config), {"a": 1}))
+        self.assertIsNot(dead, find_dead_transforms({**self.config, "transform": list(self.config["transform"])}, {}))
+
+    def test_transform_all(self):
+        data = StepData({}, "0", 0)
+        data.insert_data("_req", {"a": {"value": 1.4}, "text": ["hallo", "Welt"]}, {})
+
+        dead = transform_all(self.config, data)
+
+        self.assertEqual([1, 4], [d["index"] for d in dead])
+        self.assertEqual({"a": {"value": 1}, "b": {"value": 1}, "lower": ["hallo", "welt"], "capital": ["Hallo", "Welt"]},
+                         data.get_data("_req"))
+
+    def test_transform_all_disabled(self):
+        data = StepData({"skip_unused_transforms": False}, "0", 0)
+        data.insert_data("_req", {"a": {"value": 1.4}, "text": ["hallo", "Welt"]}, {})
+
+        self.assertEqual([], transform_all(self.config, data))
+        self.assertEqual(["HALLO", "WELT"], data.get_data("_req|unused"))
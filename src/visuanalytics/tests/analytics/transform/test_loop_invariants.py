@@ -0,0 +1,110 @@
+import unittest
+from unittest import mock
+
+from visuanalytics.analytics.control.procedures.step_data import StepData
+from visuanalytics.analytics.transform.transform import transform
+from visuanalytics.analytics.transform.util.loop_invariants import loop_invariants
+from visuanalytics.analytics.util.step_pattern import StepPatternFormatter
+
+
+class TestLoopInvariants(unittest.TestCase):
+    def test_top_level_writes(self):
+        values = {
+            "type": "loop",
+            "range_stop": 3,
+            "transform": [
+                {"type": "add_symbol", "keys": ["_req|temp"], "new_keys": ["text"], "pattern": "{_key} {_conf|unit}"},
+                {"type": "add_symbol", "keys": ["_loop"], "new_keys": ["name"], "pattern": "{_req|name}"},
+                {"type": "copy", "keys": ["text"], "new_keys": ["copy"]}
+            ]
+        }
+
+        invariants = loop_invariants(values)
+
+        self.assertIn("_req|temp", invariants.keys)
+        self.assertIn("{_req|name}", invariants.formats)
+        self.assertNotIn("{_key} {_conf|unit}", invariants.formats)
+        self.assertNotIn("_loop", invariants.keys)
+        self.assertNotIn("text", invariants.keys)
+
+    def test_nested_writes(self):
+        values = {
+            "type": "transform_array",
+            "array_key": "_req|data",
+            "transform": [
+                {"type": "add_symbol", "keys": ["_req|data|0|temp"], "new_keys": ["_loop|text"], "pattern": "{_key}"},
+                {"type": "add_symbol", "keys": ["_req|other|temp"], "new_keys": ["_loop|unit"],
+                 "pattern": "{_conf|unit}"}
+            ]
+        }
+
+        invariants = loop_invariants(values)
+
+        # _req|data is written in the loop, _req|other may reference the same data
+        self.assertNotIn("_req|data|0|temp", invariants.keys)
+        self.assertNotIn("_req|other|temp", invariants.keys)
+        self.assertIn("{_conf|unit}", invariants.formats)
+
+    def test_nested_fields(self):
+        values = {
+            "type": "loop",
+            "range_stop": 3,
+            "transform": [
+                {"type": "add_symbol", "keys": ["_req|temp"], "new_keys": ["a"], "pattern": "{_loop:>{_conf|width}}"},
+                {"type": "add_symbol", "keys": ["_req|temp"], "new_keys": ["b"], "pattern": "{_req|name:>{_idx}}"},
+                {"type": "add_symbol", "keys": ["_req|temp"], "new_keys": ["c"], "pattern": "{_req|name:>{_conf|w}}"}
+            ]
+        }
+
+        invariants = loop_invariants(values)
+
+        self.assertNotIn("{_loop:>{_conf|width}}", invariants.formats)
+        self.assertNotIn("{_req|name:>{_idx}}", invariants.formats)
+        self.assertIn("{_req|name:>{_conf|w}}", invariants.formats)
+
+    def test_unknown_writes(self):
+        values = {
+            "type": "transform_array",
+            "array_key": "_req|data",
+            "transform": [
+                {"type": "copy", "keys": ["_req|a"], "new_keys": ["{_req|key}"]}
+            ]
+        }
+
+        self.assertEqual((frozenset(), frozenset()), loop_invariants(values))
+
+    def test_format_is_hoisted(self):
+        data = StepData({"unit": "°C"}, "0", 0)
+        data.insert_data("_req", {"data": [{"temp": 1}, {"temp": 2}, {"temp": 3}]}, {})
+
+        values = [{
+            "type": "transform_array",
+            "array_key": "_req|data",
+            "transform": [
+                {"type": "add_symbol", "keys": ["_loop|temp"], "new_keys": ["_loop|unit"], "pattern": "{_conf|unit}"}
+            ]
+        }]
+
+        with mock.patch.object(StepPatternFormatter, "format", autospec=True,
+                               side_effect=StepPatternFormatter.format) as format_mock:
+            transform({"transform": values}, data)
+
+        calls = [call for call in format_mock.call_args_list if call[0][1] == "{_conf|unit}"]
+        self.assertEqual(1, len(calls))
+        self.assertEqual(["°C", "°C", "°C"], data.get_data("_req|data|*|unit"))
+
+    def test_loop_writes_are_read(self):
+        data = StepData({}, "0", 0)
+        data.insert_data("_req", {"count": 0}, {})
+
+        values = [{
+            "type": "loop",
+            "range_stop": 3,
+            "transform": [
+                {"type": "calculate", "action": "add", "keys": ["_req|count"], "value_right": 1}
+            ]
+        }]
+
+        transform({"transform": values}, data)
+
+        self.assertEqual(3, data.get_data("_req|count"))
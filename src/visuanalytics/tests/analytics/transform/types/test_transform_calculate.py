@@ -1,5 +1,6 @@
 import unittest
 
+from visuanalytics.analytics.util.step_errors import TransformError
 from visuanalytics.tests.analytics.transform.transform_test_helper import prepare_test
 
 
@@ -149,3 +150,139 @@ class TestTransformCalculate(unittest.TestCase):
 
         exp, out = prepare_test(values, self.data, expected_data)
         self.assertDictEqual(exp, out, "calculate mode Failed")
+
+    def test_transform_calculate_wildcard(self):
+        values = [
+            {
+                "type": "calculate",
+                "action": "add",
+                "keys": ["_req|array|*|left"],
+                "keys_right": ["_req|array|*|right"],
+                "new_keys": ["_req|array|*|sum"],
+                "decimal": 1
+            },
+            {
+                "type": "calculate",
+                "action": "max",
+                "keys": ["_req|array|*|sum"],
+                "new_keys": ["_req|max_sum"],
+                "save_idx_to": ["_req|max_sum_idx"]
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                "testvalue1": 5,
+                "testvalue2": 3.7,
+                "testarray1": [5, 4, 7, 1, 3, 6],
+                "testarray2": [9, 4, 12, 7.6, 1.75, 500],
+                "icon": ["und", "und", "wie", "viel", "wie", "wie", "wir"],
+                "array": [{"left": 4.5, "right": 2.7, "sum": 7.2}, {"left": 2.7, "right": 8.5, "sum": 11.2},
+                          {"left": 1.8, "right": 3, "sum": 4.8}, {"left": 3.3, "right": 3, "sum": 6.3}],
+                "max_sum": 11.2,
+                "max_sum_idx": 1
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data)
+        self.assertDictEqual(exp, out, "calculate wildcard Failed")
+
+    def test_transform_calculate_wildcard_without_new_keys(self):
+        for action in ["mean", "max", "min", "mode"]:
+            values = [{"type": "calculate", "action": action, "keys": ["_req|array|*|left"]}]
+
+            with self.assertRaisesRegex(TransformError, "new_keys without wildcards"):
+                prepare_test(values, self.data, {})
+
+    def test_transform_calculate_multiply_array(self):
+        values = [
+            {
+                "type": "calculate",
+                "action": "multiply",
+                "keys": ["_req|testarray1"],
+                "value_right": 0.5,
+                "new_keys": ["_req|half"],
+                "decimal": 1
+            },
+            {
+                "type": "calculate",
+                "action": "round",
+                "keys": ["_req|testarray2"]
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                "testvalue1": 5,
+                "testvalue2": 3.7,
+                "testarray1": [5, 4, 7, 1, 3, 6],
+                "testarray2": [9, 4, 12, 8, 2, 500],
+                "half": [2.5, 2.0, 3.5, 0.5, 1.5, 3.0],
+                "icon": ["und", "und", "wie", "viel", "wie", "wie", "wir"],
+                "array": [{"left": 4.5, "right": 2.7}, {"left": 2.7, "right": 8.5}, {"left": 1.8, "right": 3},
+                          {"left": 3.3, "right": 3}]
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data)
+        self.assertDictEqual(exp, out, "calculate multiply array Failed")
+
+    def test_transform_calculate_expression(self):
+        values = [
+            {
+                "type": "calculate",
+                "action": "expression",
+                "expr": "{_req|testvalue1} * 100 / {_req|testvalue2}",
+                "new_key": "_req|result",
+                "decimal": 2
+            },
+            {
+                "type": "calculate",
+                "action": "expression",
+                "expr": "max({_req|array|*|left} - {_req|array|*|right}, 0)",
+                "new_key": "_req|array|*|diff",
+                "decimal": 1
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                "testvalue1": 5,
+                "testvalue2": 3.7,
+                "testarray1": [5, 4, 7, 1, 3, 6],
+                "testarray2": [9, 4, 12, 7.6, 1.75, 500],
+                "icon": ["und", "und", "wie", "viel", "wie", "wie", "wir"],
+                "array": [{"left": 4.5, "right": 2.7, "diff": 1.8}, {"left": 2.7, "right": 8.5, "diff": 0.0},
+                          {"left": 1.8, "right": 3, "diff": 0.0}, {"left": 3.3, "right": 3, "diff": 0.3}],
+                "result": 135.14
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data)
+        self.assertDictEqual(exp, out, "calculate expression Failed")
+
+    def test_transform_calculate_expression_invalid(self):
+        values = [
+            {
+                "type": "calculate",
+                "action": "expression",
+                "expr": "__import__('os')",
+                "new_key": "_req|result"
+            }
+        ]
+
+        with self.assertRaises(TransformError):
+            prepare_test(values, self.data, {})
+
+    def test_transform_calculate_expression_power_too_large(self):
+        values = [
+            {
+                "type": "calculate",
+                "action": "expression",
+                "expr": "9 ** 9 ** 9",
+                "new_key": "_req|result"
+            }
+        ]
+
+        with self.assertRaisesRegex(TransformError, "too large"):
+            prepare_test(values, self.data, {})
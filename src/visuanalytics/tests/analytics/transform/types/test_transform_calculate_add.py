@@ -253,3 +253,60 @@ class TestTransformCalculate(unittest.TestCase):
 
         exp, out = prepare_test(values, self.data, expected_data)
         self.assertDictEqual(exp, out, "calculate add array keys right Failed")
+
+    def test_transform_calculate_add_array_not_numbers(self):
+        values = [
+            {
+                "type": "calculate",
+                "keys": [
+                    "_req|icon"
+                ],
+                "action": "add",
+                "keys_right": ["_req|icon"],
+                "new_keys": [
+                    "_req|result"
+                ]
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                "testvalue1": 5,
+                "testvalue2": 3.7,
+                "testarray1": [5, 4, 7, 1, 3, 6],
+                "testarray2": [9, 4, 12, 7.6, 1.75, 500],
+                "icon": ["und", "und", "wie", "viel", "wie", "wie", "wir"],
+                "array": [{"left": 4.5, "right": 2.7}, {"left": 2.7, "right": 8.5}, {"left": 1.8, "right": 3},
+                          {"left": 3.3, "right": 3}],
+                "result": ["und", "und", "wie", "viel", "wie", "wie", "wir",
+                           "und", "und", "wie", "viel", "wie", "wie", "wir"]
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data)
+        self.assertDictEqual(exp, out, "calculate add array not numbers Failed")
+
+    def test_transform_calculate_add_array_large_int(self):
+        values = [
+            {
+                "type": "calculate",
+                "keys": [
+                    "_req|large"
+                ],
+                "action": "add",
+                "value_right": 2 ** 62,
+                "new_keys": [
+                    "_req|result"
+                ]
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                "large": [2 ** 62, 1],
+                "result": [2 ** 63, 2 ** 62 + 1]
+            }
+        }
+
+        exp, out = prepare_test(values, {"large": [2 ** 62, 1]}, expected_data)
+        self.assertDictEqual(exp, out, "calculate add array large int Failed")
@@ -0,0 +1,77 @@
+import unittest
+
+from visuanalytics.analytics.util.columnar import ColumnarRecords
+from visuanalytics.tests.analytics.transform.transform_test_helper import prepare_test
+
+
+class TestTransformColumnar(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "data": [
+                {"name": "a", "cases": 10, "population": 1000},
+                {"name": "b", "cases": 50, "population": 2000},
+                {"name": "c", "cases": 30, "population": 500}
+            ]
+        }
+
+    def test_columnar(self):
+        values = [
+            {
+                "type": "columnar",
+                "keys": ["_req|data"]
+            },
+            {
+                "type": "transform_array",
+                "array_key": "_req|data",
+                "transform": [
+                    {
+                        "type": "calculate",
+                        "action": "expression",
+                        "expr": "{_loop|cases} * 1000 / {_loop|population}",
+                        "new_key": "_loop|rate"
+                    }
+                ]
+            },
+            {
+                "type": "filter",
+                "array_key": "_req|data",
+                "condition": "{_loop|rate} > 10"
+            },
+            {
+                "type": "sort",
+                "keys": ["_req|data"],
+                "sort_key": "rate",
+                "reverse": True
+            },
+            {
+                "type": "calculate",
+                "action": "max",
+                "keys": ["_req|data|*|cases"],
+                "new_keys": ["_req|max_cases"]
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                "data": [
+                    {"name": "c", "cases": 30, "population": 500, "rate": 60.0},
+                    {"name": "b", "cases": 50, "population": 2000, "rate": 25.0}
+                ],
+                "max_cases": 50
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data)
+        self.assertIsInstance(exp["_req"]["data"], ColumnarRecords)
+        self.assertDictEqual(exp, out, "columnar Failed")
+
+    def test_columnar_no_records(self):
+        values = [
+            {
+                "type": "columnar",
+                "keys": ["_req|data|0|name"],
+            }
+        ]
+
+        exp, out = prepare_test(values, self.data, {"_req": self.data})
+        self.assertDictEqual(exp, out, "columnar no records Failed")
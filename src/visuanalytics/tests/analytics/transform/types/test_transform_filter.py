@@ -0,0 +1,87 @@
+import unittest
+
+from visuanalytics.tests.analytics.transform.transform_test_helper import prepare_test
+
+
+class TestTransformFilter(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "min_cases": 4,
+            "data": [
+                {"state": "NRW", "name": "Köln", "cases": 10},
+                {"state": "BY", "name": "München", "cases": 4},
+                {"state": "NRW", "name": "Essen", "cases": 5},
+                {"state": "BY", "name": "Augsburg", "cases": 3}
+            ]
+        }
+
+    def test_filter(self):
+        values = [
+            {
+                "type": "filter",
+                "array_key": "_req|data",
+                "condition": "{_loop|cases} > {_req|min_cases} and {_loop|state} == 'NRW'",
+                "new_key": "_req|filtered"
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                **self.data,
+                "filtered": [{"state": "NRW", "name": "Köln", "cases": 10}, {"state": "NRW", "name": "Essen", "cases": 5}]
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data)
+        self.assertDictEqual(exp, out, "filter Failed")
+
+    def test_filter_indices(self):
+        values = [
+            {
+                "type": "filter",
+                "array_key": "_req|data",
+                "condition": "not {_loop|cases} >= 5 or {_loop|name} == 'Köln'",
+                "new_key": "_req|filtered",
+                "indices": True
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                **self.data,
+                "filtered": [0, 1, 3]
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data)
+        self.assertDictEqual(exp, out, "filter indices Failed")
+
+    def test_filter_mixed_values(self):
+        values = [
+            {
+                "type": "filter",
+                "array_key": "_req|values",
+                "condition": "{_loop} == 2"
+            }
+        ]
+
+        data = {"values": [[1, 2], 2, "2", 2.0]}
+        expected_data = {"_req": {"values": [2, 2.0]}}
+
+        exp, out = prepare_test(values, data, expected_data)
+        self.assertDictEqual(exp, out, "filter mixed values Failed")
+
+    def test_filter_mixed_types(self):
+        values = [
+            {
+                "type": "filter",
+                "array_key": "_req|values",
+                "condition": "{_loop} == 2"
+            }
+        ]
+
+        data = {"values": [2, "2", 3]}
+        expected_data = {"_req": {"values": [2]}}
+
+        exp, out = prepare_test(values, data, expected_data)
+        self.assertDictEqual(exp, out, "filter mixed types Failed")
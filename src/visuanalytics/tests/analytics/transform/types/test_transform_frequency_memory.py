@@ -0,0 +1,57 @@
+import shutil
+import unittest
+
+from visuanalytics.analytics.transform.util.frequency_memory import update_frequency_memory
+from visuanalytics.tests.analytics.transform.transform_test_helper import prepare_test
+from visuanalytics.util import resources
+
+
+class TestTransformFrequencyMemory(unittest.TestCase):
+    job_name = "test_frequency_memory"
+
+    def setUp(self):
+        self.data = {
+            "statuses": [
+                {"id_str": "1", "tags": [{"text": "Bundesliga"}, {"text": "Tor"}]},
+                {"id_str": "2", "tags": [{"text": "Bundesliga"}, {"text": "und"}]}
+            ]
+        }
+
+    def tearDown(self):
+        shutil.rmtree(resources.get_memory_path("", "", self.job_name), ignore_errors=True)
+
+    def test_frequency_memory(self):
+        values = [
+            {
+                "type": "frequency_memory",
+                "array_key": "_req|statuses",
+                "id_key": "id_str",
+                "words_key": "tags|*|text",
+                "name": "hashtags",
+                "to_remove": ["und"],
+                "to_dict": True,
+                "new_key": "_req|counts"
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                **self.data,
+                "counts": {"Bundesliga": 2, "Tor": 1}
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data, {"job_name": self.job_name})
+        self.assertDictEqual(exp, out, "frequency_memory Failed")
+
+        # Known items are not counted twice
+        exp, out = prepare_test(values, self.data, expected_data, {"job_name": self.job_name})
+        self.assertDictEqual(exp, out, "frequency_memory second run Failed")
+
+    def test_expire(self):
+        update_frequency_memory(self.job_name, "words", [("1", ["a", "b"]), ("2", ["a"])], 10, now=100)
+        counts = update_frequency_memory(self.job_name, "words", [("2", ["a"]), ("3", ["c"])], 10, now=105)
+        self.assertEqual({"a": 2, "b": 1, "c": 1}, dict(counts))
+
+        counts = update_frequency_memory(self.job_name, "words", [("3", ["c"])], 10, now=112)
+        self.assertEqual({"c": 1}, dict(counts))
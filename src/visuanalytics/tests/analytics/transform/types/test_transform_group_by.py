@@ -0,0 +1,73 @@
+import unittest
+
+from visuanalytics.tests.analytics.transform.transform_test_helper import prepare_test
+
+
+class TestTransformGroupBy(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "data": [
+                {"state": "NRW", "name": "Köln", "cases": 10},
+                {"state": "BY", "name": "München", "cases": 4},
+                {"state": "NRW", "name": "Essen", "cases": 5},
+                {"state": "BY", "name": "Augsburg", "cases": 3}
+            ]
+        }
+
+    def test_group_by(self):
+        values = [
+            {
+                "type": "group_by",
+                "array_key": "_req|data",
+                "group_key": "state",
+                "aggregations": {
+                    "cases": {"action": "sum", "key": "cases"},
+                    "mean": {"action": "mean", "key": "cases", "decimal": 1},
+                    "max": {"action": "max", "key": "cases"},
+                    "count": {"action": "count"},
+                    "first": {"action": "first", "key": "name"},
+                    "names": {"action": "list", "key": "name"}
+                },
+                "new_key": "_req|states"
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                **self.data,
+                "states": {
+                    "NRW": {"cases": 15, "mean": 7.5, "max": 10, "count": 2, "first": "Köln",
+                            "names": ["Köln", "Essen"]},
+                    "BY": {"cases": 7, "mean": 3.5, "max": 4, "count": 2, "first": "München",
+                           "names": ["München", "Augsburg"]}
+                }
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data)
+        self.assertDictEqual(exp, out, "group_by Failed")
+
+    def test_group_by_as_list(self):
+        values = [
+            {
+                "type": "group_by",
+                "array_key": "_req|data",
+                "group_key": "state",
+                "aggregations": {
+                    "cases": {"action": "sum", "key": "cases"}
+                },
+                "as_list": True,
+                "group_name": "state",
+                "new_key": "_req|states"
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                **self.data,
+                "states": [{"state": "NRW", "cases": 15}, {"state": "BY", "cases": 7}]
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data)
+        self.assertDictEqual(exp, out, "group_by as list Failed")
@@ -47,3 +47,43 @@ class TestTransformMostCommon(unittest.TestCase):
 
         exp, out = prepare_test(values, self.data, expected_data)
         self.assertDictEqual(exp, out, "most_common_include_count failed")
+
+    def test_most_common_limit(self):
+        values = [
+            {
+                "type": "most_common",
+                "keys": ["_req|test"],
+                "new_keys": ["_req|test1"],
+                "limit": 1
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                "test": ["Canada", "Schweden", "Canada", "Schweden", "Canada", "Canada", "Schweden", "Canada"],
+                "test1": ["Canada"]
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data)
+        self.assertDictEqual(exp, out, "most_common_limit failed")
+
+    def test_most_common_float_limit(self):
+        values = [
+            {
+                "type": "most_common",
+                "keys": ["_req|test"],
+                "new_keys": ["_req|test1"],
+                "limit": 1.0
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                "test": ["Canada", "Schweden", "Canada", "Schweden", "Canada", "Canada", "Schweden", "Canada"],
+                "test1": ["Canada"]
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data)
+        self.assertDictEqual(exp, out, "most_common with float limit failed")
@@ -50,3 +50,31 @@ class TestTransformReplace(unittest.TestCase):
 
         exp, out = prepare_test(values, self.data, expected_data)
         self.assertDictEqual(exp, out, "Replace one Failed")
+
+    def test_replace_wildcard_dict(self):
+        values = [
+            {
+                "type": "replace",
+                "keys": ["_req|teams|*|name"],
+                "new_keys": ["_req|teams|*|short"],
+                "old_value": "Borussia ",
+                "new_value": ""
+            },
+            {
+                "type": "replace",
+                "keys": ["_req|teams|*|name"],
+                "old_value": " ",
+                "new_value": "_"
+            }
+        ]
+        data = {"teams": {"1": {"name": "Borussia Dortmund"}, "2": {"name": "Borussia M"}}}
+
+        expected_data = {
+            "_req": {
+                "teams": {"1": {"name": "Borussia_Dortmund", "short": "Dortmund"},
+                          "2": {"name": "Borussia_M", "short": "M"}}
+            }
+        }
+
+        exp, out = prepare_test(values, data, expected_data)
+        self.assertDictEqual(exp, out, "Replace with wildcard Failed")
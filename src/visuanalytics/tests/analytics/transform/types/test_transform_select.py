@@ -68,3 +68,41 @@ class TestTransformSelect(unittest.TestCase):
         ]
         out, exp = prepare_test(values, self.data, {"_req": self.data})
         self.assertDictEqual(out, exp, "Invalid Selection")
+
+    def test_select_wildcard(self):
+        values = [
+            {
+                "type": "select",
+                "relevant_keys": [
+                    "_req|data|*|{a,c}",
+                    "_req|test"
+                ]
+            }
+        ]
+
+        data = {"test": 8, "data": [{"a": 1, "b": 2, "c": 3}, {"a": 4, "b": 5, "c": 6}]}
+        expected_data = {
+            "_req": {
+                "test": 8,
+                "data": [{"a": 1, "c": 3}, {"a": 4, "c": 6}]
+            }
+        }
+
+        out, exp = prepare_test(values, data, expected_data)
+        self.assertDictEqual(out, exp, "Invalid Selection")
+
+    def test_select_ignore_errors(self):
+        values = [
+            {
+                "type": "select",
+                "relevant_keys": [
+                    "_req|test2|hallo",
+                    "_req|test2|missing",
+                    "_req|missing|hallo"
+                ],
+                "ignore_errors": True
+            }
+        ]
+
+        out, exp = prepare_test(values, self.data, {"_req": {"test2": {"hallo": [1]}}})
+        self.assertDictEqual(out, exp, "Invalid Selection")
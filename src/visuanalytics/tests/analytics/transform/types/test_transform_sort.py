@@ -99,3 +99,49 @@ class TestTransformSort(unittest.TestCase):
 
         exp, out = prepare_test(values, self.data, expected_data)
         self.assertDictEqual(exp, out, "sort descending failed")
+
+    def test_sort_key_limit(self):
+        values = [
+            {
+                "type": "sort",
+                "keys": ["_req|records"],
+                "new_keys": ["_req|top"],
+                "sort_key": "cases",
+                "reverse": True,
+                "limit": 2
+            }
+        ]
+        data = {"records": [{"name": "a", "cases": 3}, {"name": "b", "cases": 7}, {"name": "c", "cases": 5}]}
+
+        expected_data = {
+            "_req": {
+                "records": [{"name": "a", "cases": 3}, {"name": "b", "cases": 7}, {"name": "c", "cases": 5}],
+                "top": [{"name": "b", "cases": 7}, {"name": "c", "cases": 5}]
+            }
+        }
+
+        exp, out = prepare_test(values, data, expected_data)
+        self.assertDictEqual(exp, out, "sort with sort_key and limit failed")
+
+    def test_sort_float_limit(self):
+        values = [
+            {
+                "type": "sort",
+                "keys": ["_req|numbers"],
+                "new_keys": ["_req|top"],
+                "reverse": True,
+                "limit": 3.0
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                "test": ["Canada", "Argentina", "Cyprus", "Schweden", "Norway", "USA", "Germany", "United Kingdom",
+                         "Z"],
+                "numbers": [10, 4, 2, 6, 7, 3, 1, 5, 9, 8, 0],
+                "top": [10, 9, 8]
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data)
+        self.assertDictEqual(exp, out, "sort with float limit failed")
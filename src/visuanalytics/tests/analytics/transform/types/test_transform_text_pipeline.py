@@ -0,0 +1,72 @@
+import unittest
+
+from visuanalytics.tests.analytics.transform.transform_test_helper import prepare_test
+
+
+class TestTransformTextPipeline(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "text": "Bundesliga Tor bundesliga Spiel und Tor Bundesliga",
+            "words": ["Bundesliga", "Tor", "bundesliga", "Spiel", "Und", "Tor"]
+        }
+
+    def test_text_pipeline(self):
+        values = [
+            {
+                "type": "text_pipeline",
+                "keys": ["_req|text"],
+                "new_keys": ["_req|counts"],
+                "to_remove": ["und"],
+                "ignore_case": True,
+                "normalize_words": True,
+                "include_count": True
+            }
+        ]
+
+        expected_data = {
+            "_req": {
+                **self.data,
+                "counts": [("Bundesliga", 3), ("Tor", 2), ("Spiel", 1)]
+            }
+        }
+
+        exp, out = prepare_test(values, self.data, expected_data)
+        self.assertDictEqual(exp, out, "text_pipeline Failed")
+
+    def test_text_pipeline_same_as_chain(self):
+        chain = [
+            {"type": "remove_from_list", "keys": ["_req|words"], "to_remove": ["und"], "ignore_case": True},
+            {"type": "normalize_words", "keys": ["_req|words"]},
+            {"type": "most_common", "keys": ["_req|words"], "include_count": True},
+            {"type": "to_dict", "keys": ["_req|words"]}
+        ]
+        pipeline = [
+            {
+                "type": "text_pipeline",
+                "keys": ["_req|words"],
+                "to_remove": ["und"],
+                "ignore_case": True,
+                "normalize_words": True,
+                "to_dict": True
+            }
+        ]
+
+        out_chain, _ = prepare_test(chain, dict(self.data), {})
+        out_pipeline, _ = prepare_test(pipeline, dict(self.data), {})
+        self.assertDictEqual(out_chain, out_pipeline, "text_pipeline differs from chain")
+        self.assertEqual({"Bundesliga": 2, "Tor": 2, "Spiel": 1}, out_pipeline["_req"]["words"])
+
+    def test_text_pipeline_keeps_empty_words(self):
+        data = {"words": ["Tor", "", "Spiel", "", "Tor"]}
+        chain = [
+            {"type": "remove_from_list", "keys": ["_req|words"], "to_remove": ["und"]},
+            {"type": "most_common", "keys": ["_req|words"], "include_count": True}
+        ]
+        pipeline = [
+            {"type": "text_pipeline", "keys": ["_req|words"], "to_remove": ["und"], "include_count": True}
+        ]
+
+        out_chain, _ = prepare_test(chain, dict(data), {})
+        out_pipeline, _ = prepare_test(pipeline, dict(data), {})
+        self.assertDictEqual(out_chain, out_pipeline, "text_pipeline differs from chain")
+        self.assertEqual([("Tor", 2), ("", 2), ("Spiel", 1)], out_pipeline["_req"]["words"])
@@ -87,3 +87,82 @@ class TestTransformTime(unittest.TestCase):
 
         exp, out = prepare_test(values, self.data, expected_data)
         self.assertDictEqual(exp, out, "Select Range One Failed")
+
+    def test_date_format_array(self):
+        values = [
+            {
+                "type": "date_format",
+                "keys": ["_req|days|*|date", "_req|days|*|date"],
+                "new_keys": ["_req|days|*|formatted", "_req|dates"],
+                "given_format": "%Y-%m-%d",
+                "format": "%d.%m",
+                "zeropaded_off": True
+            }
+        ]
+
+        data = {"days": [{"date": "2020-06-01"}, {"date": "2020-06-21"}]}
+        expected_data = {
+            "_req": {
+                "days": [{"date": "2020-06-01", "formatted": "1.06"}, {"date": "2020-06-21", "formatted": "21.06"}],
+                "dates": ["1.06", "21.06"]
+            }
+        }
+
+        exp, out = prepare_test(values, data, expected_data)
+        self.assertDictEqual(exp, out, "Date Format Array Failed")
+
+    def test_date_format_array_strptime(self):
+        values = [
+            {
+                "type": "date_format",
+                "keys": ["_req|other"],
+                "given_format": "%Y-%m-%d",
+                "format": "%d.%m.%Y"
+            }
+        ]
+
+        expected_data = {"_req": {"other": ["07.06.2020", "29.02.2020"]}}
+
+        exp, out = prepare_test(values, {"other": ["2020-6-7", "2020-02-29"]}, expected_data)
+        self.assertDictEqual(exp, out, "Date Format Array strptime Failed")
+
+    def test_weekday_array(self):
+        values = [
+            {
+                "type": "date_weekday",
+                "keys": ["_req|dates"],
+                "given_format": "%Y-%m-%d"
+            },
+            {
+                "type": "date_weekday",
+                "keys": ["_req|times"],
+                "given_format": "%Y-%m-%dT%H:%M:%S"
+            }
+        ]
+
+        data = {"dates": ["2020-06-21", "2020-06-22", "1969-12-31"], "times": ["2020-06-26T20:30:00"]}
+        expected_data = {"_req": {"dates": ["Sonntag", "Montag", "Mittwoch"], "times": ["Freitag"]}}
+
+        exp, out = prepare_test(values, data, expected_data)
+        self.assertDictEqual(exp, out, "Weekday Array Failed")
+
+    def test_timestamp_array(self):
+        values = [
+            {
+                "type": "timestamp",
+                "keys": ["_req|days|*|ts"],
+                "new_keys": ["_req|days|*|time"],
+                "format": "%H:%M"
+            }
+        ]
+
+        data = {"days": [{"ts": 1592758688}, {"ts": 1592800000}]}
+        expected_data = {
+            "_req": {
+                "days": [{"ts": ts, "time": datetime.fromtimestamp(ts).strftime("%H:%M")} for ts in
+                         (1592758688, 1592800000)]
+            }
+        }
+
+        exp, out = prepare_test(values, data, expected_data)
+        self.assertDictEqual(exp, out, "Timestamp Array Failed")
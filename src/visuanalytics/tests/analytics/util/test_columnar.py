@@ -0,0 +1,59 @@
+import json
+import unittest
+from copy import deepcopy
+
+import numpy as np
+
+from visuanalytics.analytics.util.columnar import to_columnar, to_json, sort_columnar, ColumnarRecords
+from visuanalytics.analytics.util.step_pattern import data_get_pattern, data_insert_pattern, data_exists_pattern
+
+
+class TestColumnarRecords(unittest.TestCase):
+    def setUp(self):
+        self.records = [
+            {"name": "a", "temp": 12.5, "rain": 1, "sun": True},
+            {"name": "b", "temp": 8.0, "rain": 3, "sun": False},
+            {"name": "c", "temp": 12.5, "rain": 2, "extra": [1]}
+        ]
+        self.data = {"data": to_columnar(deepcopy(self.records))}
+
+    def test_columns(self):
+        columns = self.data["data"].columns
+
+        self.assertIsInstance(columns["temp"], np.ndarray)
+        self.assertIsInstance(columns["rain"], np.ndarray)
+        self.assertIsInstance(columns["name"], list)
+        self.assertIsInstance(columns["sun"], list)
+        self.assertEqual(self.records, self.data["data"])
+        self.assertIsNone(to_columnar([{"a": 1}, 2]))
+
+    def test_get(self):
+        self.assertEqual(8.0, data_get_pattern("data|1|temp", self.data))
+        self.assertIs(int, type(data_get_pattern("data|2|rain", self.data)))
+        self.assertEqual([12.5, 8.0, 12.5], data_get_pattern("data|*|temp", self.data))
+        self.assertFalse(data_exists_pattern("data|0|extra", self.data))
+        self.assertFalse(data_exists_pattern("data|3", self.data))
+        self.assertRaises(KeyError, self.data["data"].column_values, "extra")
+
+    def test_insert(self):
+        data_insert_pattern("data|0|rain", self.data, 5)
+        data_insert_pattern("data|1|rain", self.data, "viel")
+        data_insert_pattern("data|*|new", self.data, [1, 2, 3])
+        del self.data["data"][0]["name"]
+
+        self.assertEqual([5, "viel", 2], data_get_pattern("data|*|rain", self.data))
+        self.assertIsInstance(self.data["data"].columns["new"], np.ndarray)
+        self.assertEqual({"temp": 12.5, "rain": 5, "sun": True, "new": 1}, dict(self.data["data"][0]))
+
+    def test_take_and_sort(self):
+        records = self.data["data"]
+
+        self.assertEqual([1, 0, 2], sort_columnar(records, "temp"))
+        self.assertEqual([0, 2, 1], sort_columnar(records, "temp", True))
+        self.assertEqual([2, 1, 0], sort_columnar(records, "name", True))
+        self.assertEqual([self.records[2], self.records[0]], records.take([2, 0]))
+        self.assertEqual(self.records[1:], records[1:])
+
+    def test_json(self):
+        self.assertEqual(self.records, json.loads(json.dumps(self.data["data"], default=to_json)))
+        self.assertIsInstance(deepcopy(self.data["data"]), ColumnarRecords)
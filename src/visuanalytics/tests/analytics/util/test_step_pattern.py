@@ -0,0 +1,148 @@
+import unittest
+
+from visuanalytics.analytics.util.step_errors import StepKeyError
+from visuanalytics.analytics.util.step_pattern import compile_key_path, data_get_pattern, data_insert_pattern, \
+    data_remove_pattern, data_exists_pattern, compile_template, StepPatternFormatter, compile_projection, BoundKey
+
+
+class TestKeyPath(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "_req": {
+                "data": [
+                    {"temp": 12},
+                    {"temp": 15}
+                ],
+                "5": "five"
+            }
+        }
+
+    def test_compile_is_cached(self):
+        self.assertIs(compile_key_path("_req|data|0|temp"), compile_key_path("_req|data|0|temp"))
+        self.assertEqual(("_req", "data", 0, "temp"), compile_key_path("_req|data|0|temp").segments)
+
+    def test_get(self):
+        self.assertEqual(15, data_get_pattern("_req|data|1|temp", self.data))
+
+    def test_get_invalid_key(self):
+        with self.assertRaises(StepKeyError):
+            data_get_pattern("_req|data|2|temp", self.data)
+
+    def test_exists(self):
+        self.assertTrue(data_exists_pattern("_req|data|0|temp", self.data))
+        self.assertFalse(data_exists_pattern("_req|data|2|temp", self.data))
+        self.assertFalse(data_exists_pattern("_req|data|0|temp|1", self.data))
+        self.assertFalse(data_exists_pattern("_req|missing", self.data))
+
+    def test_insert_creates_dicts(self):
+        data_insert_pattern("_req|new|value", self.data, 1)
+        self.assertEqual({"value": 1}, self.data["_req"]["new"])
+
+    def test_insert_single_key_is_not_converted(self):
+        data_insert_pattern("5", self.data, 1)
+        self.assertEqual(1, self.data["5"])
+
+    def test_remove(self):
+        data_remove_pattern("_req|data|0|temp", self.data)
+        self.assertEqual({}, self.data["_req"]["data"][0])
+
+    def test_get_wildcard(self):
+        self.assertEqual([12, 15], data_get_pattern("_req|data|*|temp", self.data))
+
+    def test_bind_wildcard(self):
+        self.assertEqual("_req|data|1|temp", compile_key_path("_req|data|*|temp").bind((1,)).raw)
+        self.assertEqual([(0,), (1,)], compile_key_path("_req|data|*|temp").expand(self.data))
+
+    def test_bind_is_not_cached(self):
+        bound = compile_key_path("_req|*").bind(("5",))
+
+        # Dictionary keys keep their type
+        self.assertEqual(("_req", "5"), bound.segments)
+        self.assertEqual("five", bound.get(self.data))
+        self.assertIsNot(bound, compile_key_path("_req|5"))
+        self.assertIs(bound, compile_key_path(BoundKey(bound)))
+
+    def test_insert_wildcard(self):
+        data_insert_pattern("_req|data|*|max", self.data, [1, 2])
+        self.assertEqual([{"temp": 12, "max": 1}, {"temp": 15, "max": 2}], self.data["_req"]["data"])
+
+    def test_insert_wildcard_invalid_length(self):
+        with self.assertRaises(StepKeyError):
+            data_insert_pattern("_req|data|*|max", self.data, [1])
+
+    def test_remove_wildcard(self):
+        data_remove_pattern("_req|data|*|temp", self.data)
+        self.assertEqual([{}, {}], self.data["_req"]["data"])
+
+
+class TestProjection(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "data": [
+                {"a": 1, "b": {"x": 1}, "c": 3},
+                {"a": 4, "c": 6}
+            ],
+            "other": {"x": 1, "y": 2},
+            "list": [{"v": 1}]
+        }
+
+    def test_values_are_shared(self):
+        out = compile_projection(("other", "data|0|b")).apply(self.data)
+
+        self.assertEqual({"other": {"x": 1, "y": 2}, "data": {0: {"b": {"x": 1}}}}, out)
+        self.assertIs(self.data["other"], out["other"])
+        self.assertIs(self.data["data"][0]["b"], out["data"][0]["b"])
+
+    def test_wildcard_alternatives(self):
+        out = compile_projection(("data|*|{a,c}",)).apply(self.data)
+        self.assertEqual({"data": [{"a": 1, "c": 3}, {"a": 4, "c": 6}]}, out)
+
+    def test_prefix_selects_whole_value(self):
+        self.assertEqual({"other": {"x": 1, "y": 2}}, compile_projection(("other|x", "other")).apply(self.data))
+
+    def test_missing_keys(self):
+        projection = compile_projection(("data|*|b", "list|0|missing", "missing"))
+
+        self.assertEqual({"data": [{"b": {"x": 1}}, {}]}, projection.apply(self.data, True))
+        self.assertRaises(StepKeyError, projection.apply, self.data)
+
+    def test_wildcard_with_other_keys(self):
+        self.assertRaises(ValueError, compile_projection, ("data|*|a", "data|0|c"))
+
+class TestStepPatternFormatter(unittest.TestCase):
+    def setUp(self):
+        self.formatter = StepPatternFormatter()
+        self.data = {
+            "_req": {"data": [{"temp": 12.345, "name": "Köln"}]},
+            "text": "abc"
+        }
+
+    def test_no_fields_returns_string(self):
+        text = "Keine Felder"
+        self.assertIs(text, self.formatter.format(text, self.data))
+
+    def test_compile_is_cached(self):
+        self.assertIs(compile_template("{text} {_req|data|0|temp}"), compile_template("{text} {_req|data|0|temp}"))
+
+    def test_same_output_as_formatter(self):
+        values = {"text": "abc", "temp": 12.345, "name": "Köln"}
+        templates = [
+            ("{text}", "{text}"),
+            ("Temp: {_req|data|0|temp:.1f} Grad", "Temp: {temp:.1f} Grad"),
+            ("{_req|data|0|name!r} {_req|data|0|name!a}", "{name!r} {name!a}"),
+            ("{{escaped}} {text:>6}|", "{{escaped}} {text:>6}|"),
+            ("{text[1]}", "{text[1]}"),
+            ("{_req|data|0|temp.real:.1f} {text.upper}", "{temp.real:.1f} {text.upper}"),
+        ]
+
+        for template, expected in templates:
+            self.assertEqual(expected.format(**values), self.formatter.format(template, self.data))
+
+    def test_invalid_field_name(self):
+        for template in ["{text[}", "{text[]}", "{text.}", "{text[0]x}"]:
+            with self.assertRaises(ValueError, msg=template):
+                compile_template(template)
+
+    def test_invalid_key(self):
+        with self.assertRaises(StepKeyError):
+            self.formatter.format("{_req|missing}", self.data)
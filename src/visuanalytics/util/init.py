@@ -33,12 +33,14 @@ def init(config: dict):
     resources.TEMP_LOCATION = res_sub_paths["temp"]
     resources.IMAGES_LOCATION = res_sub_paths["images"]
     resources.MEMORY_LOCATION = res_sub_paths["memory"]
+    resources.CACHE_LOCATION = res_sub_paths.get("cache", "cache")
 
     # create resources folders
     os.makedirs(resources.path_from_root(res_paths["main_path"]), exist_ok=True)
     os.makedirs(resources.get_resource_path(res_sub_paths["temp"]), exist_ok=True)
     os.makedirs(resources.get_resource_path(res_sub_paths["images"]), exist_ok=True)
     os.makedirs(resources.get_resource_path(res_sub_paths["memory"]), exist_ok=True)
+    os.makedirs(resources.get_cache_path(""), exist_ok=True)
 
     # create out and instance folder
     out_dir = config.get("steps_base_config", {}).get("output_path", "out")
@@ -32,6 +32,12 @@ Name des Ordner für Memory-Dateien. Dient zum Abspeichern von vorherigen Berech
 Wird beim Starten mit dem Wert aus der Konfigurationsdatei initialisiert.
 """
 
+CACHE_LOCATION = "cache"
+"""
+Name des Ordners für zwischengespeicherte API-Antworten.
+Wird beim Starten mit dem Wert aus der Konfigurationsdatei initialisiert.
+"""
+
 DATE_FORMAT = '%Y-%m-%d_%H-%M.%S'
 """
 Datums- und Zeitformat in welchem die Dateien abgespeichert werden.
@@ -107,6 +113,14 @@ def get_memory_path(path: str, name: str, job_name: str):
     return get_resource_path(os.path.join(MEMORY_LOCATION, job_name, name, path))
 
 
+def get_cache_path(path: str):
+    """Erstellt einen absoluten Pfad zu der übergebenen Ressource im Cache-Ordner.
+
+    :param path: Pfad zur Ressource, relativ zum `resources/cache`-Ordner.
+    """
+    return get_resource_path(os.path.join(CACHE_LOCATION, path))
+
+
 def get_specific_memory_path(job_name: str, name: str, number: int, skip: bool):
     """Erstellt einen absoluten Pfad zu der Memory-Datei im übergebenen Ordner.
 